@@ -0,0 +1,197 @@
+"""Benchmark suite for fractal_display.
+
+Times the scalar escape_count() kernel, Plane.toMatrix(), Viewport.img_grey()/img_rgb()
+at each GUI preset resolution for representative views, tiled renders (whole image, and time
+until the tiles of the central third are done), the matplotlib redraw done by
+GUI.plotViewport() (on an Agg canvas, so no display is needed), and a Julia map rendered
+by julia_sweep against one Viewport per c, and Buddhabrot sampling.
+Results are written as JSON together with machine information, and can be compared with a
+baseline file: the script exits with status 1 if a benchmark got slower than the threshold.
+The reference results are benchmarks/baseline.json (BASELINE), a --quick run of the current
+tree: --baseline without a file compares with it. Timings depend on the machine, so record
+it again (--quick --output benchmarks/baseline.json) on the machine running the comparison,
+before the change to measure, and commit it when a change is accepted as the new reference.
+
+Usage
+    python benchmarks/bench_render.py --quick --baseline
+    python benchmarks/bench_render.py --quick --output benchmarks/baseline.json
+    python benchmarks/bench_render.py --output results.json
+    python benchmarks/bench_render.py --baseline results.json --threshold 0.15
+    python benchmarks/bench_render.py --quick --filter img_rgb
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fractal_display.viewport import Viewport
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+from fractal_display import julia_sweep
+from fractal_display.buddhabrot import Buddhabrot
+from fractal_display.display import ImageDisplay
+from fractal_display.tiles import TileScheduler, tile_grid
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json') # reference results
+RESOLUTIONS = [(640,480), (1024,768), (2048,1536)] # GUI presets
+VIEWS = {
+    'default': dict(fractal = lambda: cplxf.MandelbrotSet(max_iterations = 30)),
+    'deep_boundary': dict(fractal = lambda: cplxf.MandelbrotSet(max_iterations = 500),
+        offset = (-0.743643887037151, 0.131825904205330), zoom = 1000.0),
+    'all_interior': dict(fractal = lambda: cplxf.MandelbrotSet(max_iterations = 100),
+        offset = (-0.1, 0.0), zoom = 20.0),
+    'julia': dict(fractal = lambda: cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 100)),
+    'multibrot': dict(fractal = lambda: cplxf.MultibrotSet(degree = 5, max_iterations = 100)),
+    'newton': dict(fractal = lambda: cplxf.NewtonFractal(max_iterations = 100)),
+}
+
+
+def viewport(view: str, resolution: tuple[int,int]) -> Viewport:
+    settings = dict(VIEWS[view])
+    return Viewport(fractal = settings.pop('fractal')(), resolution = resolution, colormap = 'viridis', **settings)
+
+def measure(function, repeat: int) -> dict:
+    """Best and mean wall time (seconds) of 'repeat' calls, after one warm-up call."""
+    function()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {'best': min(times), 'mean': statistics.fmean(times), 'repeat': repeat}
+
+def benchmarks(quick: bool) -> dict:
+    """Benchmark name -> (function returning the function to time, number of points per call).
+    
+    Functions to time are built lazily, so that filtered out benchmarks cost nothing.
+    """
+    resolutions = RESOLUTIONS[:1] if quick else RESOLUTIONS
+    cases = {}
+    points = cplxp.Plane(-2, 1, -1.2, 1.2, 40, 30).toMatrix().ravel().tolist()
+    for name, fractal in (('mandelbrot', cplxf.MandelbrotSet(max_iterations = 30)), ('julia', cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 30))):
+        # timed over 1200 points, reported per point
+        cases[f'escape_count/{name}'] = (lambda fractal=fractal: lambda: [fractal.escape_count(point) for point in points], len(points))
+    for resolution in resolutions:
+        label = f'{resolution[0]}x{resolution[1]}'
+        cases[f'toMatrix/{label}'] = (lambda resolution=resolution: cplxp.Plane(-2, 2, -1.5, 1.5, *resolution).toMatrix, 1)
+        for view in VIEWS:
+            cases[f'img_grey/{view}/{label}'] = (lambda view=view, resolution=resolution: viewport(view, resolution).img_grey, 1)
+            cases[f'img_rgb/{view}/{label}'] = (lambda view=view, resolution=resolution: viewport(view, resolution).img_rgb, 1)
+        cases[f'img_rgb_tiled/deep_boundary/{label}'] = (lambda resolution=resolution: tiled(viewport('deep_boundary', resolution)), 1)
+        cases[f'center_tiles/deep_boundary/{label}'] = (lambda resolution=resolution: tiled(viewport('deep_boundary', resolution), center = True), 1)
+        cases[f'gui_redraw/{label}'] = (lambda resolution=resolution: redraw(viewport('default', resolution)), 1)
+    # Julia map of 20x16 thumbnails: batched sweep against one viewport per c
+    c_plane, thumbnail = cplxp.Plane(-1.6, 0.4, -1.0, 1.0, 20, 16), cplxp.Plane(-1.6, 1.6, -1.2, 1.2, 32, 24)
+    cases['julia_map/20x16x32x24'] = (lambda: lambda: julia_sweep.julia_map(c_plane, thumbnail, 100), 1)
+    cases['julia_viewports/20x16x32x24'] = (lambda: lambda: [Viewport(fractal = cplxf.JuliaSet(c = complex(c), max_iterations = 100),
+        size = (3.2, 2.4), resolution = (32, 24)).img_grey() for c in c_plane.toMatrix().ravel()], 1)
+    # 65536 Buddhabrot samples in this process (samples/s = 65536 / time)
+    cases['buddhabrot/65536'] = (lambda: lambda: Buddhabrot(fractal = cplxf.MandelbrotSet(max_iterations = 500)).run(2 ** 16, processes = 1), 1)
+    return cases
+
+def tiled(viewport: Viewport, center: bool = False):
+    """Function rendering viewport by tiles (center-out), stopped once the central third is done if center is True."""
+    width, height = viewport.resolution
+    def render():
+        cancel = threading.Event()
+        remaining = set()
+        def on_tile(tile, colors):
+            remaining.discard(tile)
+            if center and not remaining: cancel.set()
+        tiles = TileScheduler(on_tile = on_tile)
+        remaining.update(tile for tile in tile_grid(viewport.resolution, tiles.tile_size)
+            if tile.right > width / 3 and tile.left < 2 * width / 3 and tile.bottom > height / 3 and tile.top < 2 * height / 3)
+        try:
+            viewport.img_rgb(cancel, tiles)
+        except cplxf.RenderCancelled:
+            pass
+    return render
+
+def redraw(viewport: Viewport):
+    """Function doing what GUI.plotViewport() does after rendering: ImageDisplay.show() on the GUI axes.
+    
+    The same display is reused by every call, like along a GUI session: views alternate
+    between two offsets so that each call is a full redraw (same extent would only blit).
+    """
+    figure = Figure(figsize = (6, 6))
+    plot = figure.add_subplot(111)
+    display = ImageDisplay(plot, FigureCanvasAgg(figure))
+    image = viewport.img_rgb()
+    plane = viewport.plane()
+    extents = itertools.cycle(([plane.xmin, plane.xmax, plane.ymin, plane.ymax], [plane.xmin + 1, plane.xmax + 1, plane.ymin, plane.ymax]))
+    return lambda: display.show(image, next(extents))
+
+def machine_info() -> dict:
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of benchmarks whose best time grew by more than threshold (relative) over baseline."""
+    regressions = []
+    for name, result in results['benchmarks'].items():
+        reference = baseline['benchmarks'].get(name)
+        if reference is None: continue
+        ratio = result['best'] / reference['best']
+        status = 'REGRESSION' if ratio > 1 + threshold else ('faster' if ratio < 1 - threshold else 'ok')
+        print(f'{name:45s} {1000 * reference["best"]:10.3f} ms -> {1000 * result["best"]:10.3f} ms  x{ratio:5.2f}  {status}')
+        if status == 'REGRESSION':
+            regressions.append(name)
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark fractal_display rendering.')
+    parser.add_argument('--output', help='JSON file receiving results')
+    parser.add_argument('--baseline', nargs='?', const=BASELINE, help='JSON results to compare with (default benchmarks/baseline.json)')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative slowdown reported as regression (default 0.10)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per benchmark (best is kept)')
+    parser.add_argument('--quick', action='store_true', help='lowest resolution only')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this string')
+    args = parser.parse_args(argv)
+
+    results = {'machine': machine_info(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'benchmarks': {}}
+    for name, (factory, per) in benchmarks(args.quick).items():
+        if args.filter not in name: continue
+        result = measure(factory(), args.repeat)
+        if per > 1: # per point timings
+            result = {key: value / per if key != 'repeat' else value for key, value in result.items()}
+        results['benchmarks'][name] = result
+        print(f'{name:45s} {1000 * result["best"]:10.3f} ms', flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get('machine') != results['machine']:
+            print('warning: baseline was recorded on a different machine or software versions')
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if not set(results['benchmarks']) & set(baseline['benchmarks']):
+            print('warning: no benchmark of this run is in the baseline')
+        if regressions:
+            print(f'{len(regressions)} regression(s) above {100 * args.threshold:.0f}%')
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Load test for fractal_display.server.
+
+Sends concurrent GET requests to a running render server and reports
+throughput and p50/p99 latency. Requests cycle over a configurable number of
+distinct views, so that both request coalescing and the image cache are
+exercised. Only the standard library is used.
+
+Usage
+    python -m fractal_display.server --port 8000 &
+    python benchmarks/server_loadtest.py --url http://127.0.0.1:8000 --requests 500 --concurrency 16
+"""
+
+import argparse
+import concurrent.futures
+import http.client
+import json
+import statistics
+import time
+import urllib.parse
+
+
+def request_paths(count: int, distinct: int, width: int, height: int, max_iterations: int) -> list[str]:
+    """Request paths alternating renders and tiles over 'distinct' different views."""
+    paths = []
+    for index in range(count):
+        view = index % distinct
+        if view % 2 == 0:
+            query = urllib.parse.urlencode({
+                'width': width, 'height': height, 'max_iterations': max_iterations,
+                'x': -0.5 + 0.01 * view, 'zoom': 1 + view
+            })
+            paths.append('/render?' + query)
+        else:
+            level = 2
+            tile = view // 2 % 16
+            query = urllib.parse.urlencode({'tile_size': width // 2, 'max_iterations': max_iterations})
+            paths.append(f'/tile/{level}/{tile % 4}/{tile // 4}.png?' + query)
+    return paths
+
+def fetch(host: str, port: int, path: str) -> tuple[int, float, int]:
+    """Status, latency in seconds and body size of one request on a new connection."""
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection(host, port, timeout=300)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, time.perf_counter() - start, len(body)
+    finally:
+        connection.close()
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Load test a fractal render server.')
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=200, help='total number of requests')
+    parser.add_argument('--concurrency', type=int, default=8, help='number of simultaneous clients')
+    parser.add_argument('--distinct', type=int, default=20, help='number of distinct views requested')
+    parser.add_argument('--width', type=int, default=320)
+    parser.add_argument('--height', type=int, default=240)
+    parser.add_argument('--max-iterations', type=int, default=30)
+    args = parser.parse_args(argv)
+
+    url = urllib.parse.urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+    paths = request_paths(args.requests, args.distinct, args.width, args.height, args.max_iterations)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(lambda path: fetch(host, port, path), paths))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for status, latency, _ in results if status == 200]
+    failures = sum(1 for status, _, _ in results if status != 200)
+    transferred = sum(size for _, _, size in results)
+    print(f'requests:    {len(results)} ({failures} failed), concurrency {args.concurrency}, {args.distinct} distinct views')
+    print(f'elapsed:     {elapsed:.2f} s')
+    print(f'throughput:  {len(results) / elapsed:.1f} req/s, {transferred / elapsed / 2 ** 20:.2f} MiB/s')
+    if latencies:
+        print(f'latency:     p50 {1000 * percentile(latencies, 0.50):.1f} ms, '
+              f'p99 {1000 * percentile(latencies, 0.99):.1f} ms, '
+              f'mean {1000 * statistics.fmean(latencies):.1f} ms')
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        connection.request('GET', '/stats')
+        print(f'server:      {json.loads(connection.getresponse().read())}')
+    finally:
+        connection.close()
+
+if __name__ == '__main__':
+    main()
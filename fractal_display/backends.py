@@ -0,0 +1,315 @@
+"""backends module. Registry of compute backends used by Viewport.
+
+A backend computes escape counts and stabilities of an array of points for a fractal.
+Viewport looks backends up by name, or asks for 'auto': the fastest available backend
+on this machine, measured once by a calibration run and cached on disk.
+
+Backends
+    'python': scalar escape_count()/stability() loops (reference).
+    'numpy': vectorized NumPy kernels of the fractal.
+    'numba': JIT compiled parallel kernels (only when numba is installed,
+        MandelbrotSet and JuliaSet only, other fractals use NumPy kernels).
+    'multiprocess': NumPy kernels run on chunks of the image in a process pool.
+
+Classes
+    Backend
+    PythonBackend
+    NumpyBackend
+    NumbaBackend
+    MultiprocessBackend
+Functions
+    register_backend(Backend)
+    process_pool(int): concurrent.futures.ProcessPoolExecutor
+    get_backend(str): Backend
+    available_backends(): list[str]
+    calibrate(): dict[str,float]
+    auto_backend(): Backend
+    cache_directory(): str
+"""
+
+from abc import ABC, abstractmethod # package for abstract classes
+import concurrent.futures
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import threading
+import time
+import numpy as np # np arrays
+from . import complex_fractal as cplxf
+from . import complex_plane as cplxp
+
+
+class Backend(ABC):
+    """Backend abstract class.
+
+    Attributes
+        name: str
+            Name used to select the backend.
+    Virtual methods
+        escape_counts(complex_fractal.Fractal, np.ndarray, threading.Event): np.ndarray[np.int64]
+    Methods
+        available(): bool
+            True if the backend can run on this machine.
+        stabilities(complex_fractal.Fractal, np.ndarray, threading.Event): np.ndarray[np.float64]
+            Escape counts divided by fractal.max_iterations.
+        quadratic_escape_counts(np.ndarray, np.ndarray, int, threading.Event): np.ndarray[np.int64]
+            Escape counts of z_(n+1) = z_n^2 + c for arrays of z_0 and c (NumPy kernel by default).
+    """
+    name = None
+
+    def available(self) -> bool:
+        """True if the backend can run on this machine."""
+        return True
+
+    @abstractmethod
+    def escape_counts(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        pass
+
+    def stabilities(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        """Stability of each point (escape counts divided by fractal.max_iterations)."""
+        return self.escape_counts(fractal, candidates, cancel) / fractal.max_iterations
+
+    def quadratic_escape_counts(self, z_0: np.ndarray, c: np.ndarray, max_iterations: int, cancel = None) -> np.ndarray[np.int64]:
+        """Escape counts of z_(n+1) = z_n^2 + c with one z_0 and one c per point (arrays of the same shape).
+        Used when each point has its own c, as in julia_sweep."""
+        return cplxf._quadratic_escape_counts(z_0, c, max_iterations, cancel)
+
+class PythonBackend(Backend):
+    """Scalar reference backend: calls escape_count()/stability() point by point."""
+    name = 'python'
+
+    def escape_counts(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        return cplxf.Fractal.escape_counts(fractal, candidates, cancel)
+
+    def stabilities(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        return cplxf.Fractal.stabilities(fractal, candidates, cancel)
+
+class NumpyBackend(Backend):
+    """Vectorized backend: calls escape_counts()/stabilities() of the fractal."""
+    name = 'numpy'
+
+    def escape_counts(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        return fractal.escape_counts(candidates, cancel)
+
+    def stabilities(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        return fractal.stabilities(candidates, cancel)
+
+class NumbaBackend(NumpyBackend):
+    """JIT compiled backend, parallel over points.
+
+    Only MandelbrotSet and JuliaSet have compiled kernels, other fractals fall back to NumPy kernels.
+    Points are processed by chunks of CHUNK_SIZE so that cancellation is checked between chunks.
+    """
+    name = 'numba'
+    CHUNK_SIZE = 2 ** 16
+
+    def __init__(self):
+        self._kernel = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return importlib.util.find_spec('numba') is not None
+
+    def _compiled_kernel(self):
+        with self._lock:
+            if self._kernel is None:
+                import numba # optional dependency, imported on first use only
+                import math
+
+                @numba.njit(parallel=True, cache=True)
+                def kernel(z_0, c, max_iterations, counts):
+                    for index in numba.prange(z_0.size):
+                        z = z_0[index]
+                        count = max_iterations
+                        for iteration in range(max_iterations):
+                            z = z * z + c[index]
+                            if math.hypot(z.real, z.imag) > 2:
+                                count = iteration
+                                break
+                        counts[index] = count
+
+                self._kernel = kernel
+            return self._kernel
+
+    def escape_counts(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        if type(fractal) is cplxf.MandelbrotSet:
+            z_0, c = np.zeros(np.shape(candidates), dtype=np.complex128), candidates
+        elif type(fractal) is cplxf.JuliaSet:
+            z_0, c = candidates, np.full(np.shape(candidates), fractal.c, dtype=np.complex128)
+        else:
+            return fractal.escape_counts(candidates, cancel)
+        return self.quadratic_escape_counts(z_0, c, fractal.max_iterations, cancel)
+
+    def quadratic_escape_counts(self, z_0: np.ndarray, c: np.ndarray, max_iterations: int, cancel = None) -> np.ndarray[np.int64]:
+        kernel = self._compiled_kernel()
+        shape = np.shape(z_0)
+        z_0 = np.ascontiguousarray(z_0, dtype=np.complex128).ravel()
+        c = np.ascontiguousarray(np.broadcast_to(c, shape), dtype=np.complex128).ravel()
+        counts = np.empty(z_0.size, dtype=np.int64)
+        for start in range(0, z_0.size, self.CHUNK_SIZE):
+            cplxf._check_cancel(cancel)
+            stop = start + self.CHUNK_SIZE
+            kernel(z_0[start:stop], c[start:stop], max_iterations, counts[start:stop])
+        return counts.reshape(shape)
+
+    def stabilities(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        if type(fractal) not in (cplxf.MandelbrotSet, cplxf.JuliaSet): # stabilities may not be escape counts (Newton fractals)
+            return fractal.stabilities(candidates, cancel)
+        return self.escape_counts(fractal, candidates, cancel) / fractal.max_iterations
+
+def process_pool(max_workers: int | None = None) -> concurrent.futures.ProcessPoolExecutor:
+    """Process pool whose workers are not forked from this process.
+
+    Forking a process running threaded kernels (numba) hangs the workers, so workers
+    are started by a fork server (or spawned where fork servers are not available).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return concurrent.futures.ProcessPoolExecutor(max_workers, mp_context = context)
+
+def _chunk_escape_counts(fractal: cplxf.Fractal, chunk: np.ndarray) -> np.ndarray[np.int64]:
+    return fractal.escape_counts(chunk)
+
+def _chunk_stabilities(fractal: cplxf.Fractal, chunk: np.ndarray) -> np.ndarray[np.float64]:
+    return fractal.stabilities(chunk)
+
+def _chunk_quadratic_escape_counts(max_iterations: int, z_0: np.ndarray, c: np.ndarray) -> np.ndarray[np.int64]:
+    return cplxf._quadratic_escape_counts(z_0, c, max_iterations)
+
+class MultiprocessBackend(Backend):
+    """Process pool backend: NumPy kernels on chunks of points, one process per CPU.
+
+    Cancellation drops chunks not started yet; chunks already running finish first.
+    """
+    name = 'multiprocess'
+    CHUNKS_PER_WORKER = 4
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = process_pool(self.max_workers)
+            return self._executor
+
+    def _map(self, function, argument, arrays: tuple[np.ndarray, ...], dtype, cancel) -> np.ndarray:
+        """Concatenated results of function(argument, *chunks) over chunks of the flattened arrays."""
+        shape = np.shape(arrays[0])
+        flats = [np.broadcast_to(np.asarray(array, dtype=np.complex128), shape).ravel() for array in arrays]
+        sections = min(flats[0].size, self.max_workers * self.CHUNKS_PER_WORKER) or 1
+        chunks = zip(*(np.array_split(flat, sections) for flat in flats))
+        futures = [self.executor().submit(function, argument, *chunk) for chunk in chunks]
+        try:
+            while True:
+                _, pending = concurrent.futures.wait(futures, timeout=0.05)
+                cplxf._check_cancel(cancel)
+                if not pending: break
+        except BaseException:
+            for future in futures: future.cancel()
+            raise
+        return np.concatenate([future.result() for future in futures]).astype(dtype).reshape(shape)
+
+    def escape_counts(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        return self._map(_chunk_escape_counts, fractal, (candidates,), np.int64, cancel)
+
+    def stabilities(self, fractal: cplxf.Fractal, candidates: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        return self._map(_chunk_stabilities, fractal, (candidates,), np.float64, cancel)
+
+    def quadratic_escape_counts(self, z_0: np.ndarray, c: np.ndarray, max_iterations: int, cancel = None) -> np.ndarray[np.int64]:
+        return self._map(_chunk_quadratic_escape_counts, max_iterations, (z_0, c), np.int64, cancel)
+
+
+_registry = {}
+
+def register_backend(backend: Backend) -> None:
+    """Adds a backend to the registry (replacing any backend with the same name)."""
+    if not isinstance(backend, Backend): raise TypeError("Given backend must be a Backend.")
+    if not (isinstance(backend.name, str) and backend.name and backend.name != 'auto'): raise ValueError("Invalid backend name.")
+    _registry[backend.name] = backend
+
+def available_backends() -> list[str]:
+    """Names of registered backends able to run on this machine."""
+    return [name for name, backend in _registry.items() if backend.available()]
+
+def get_backend(name: str) -> Backend:
+    """Backend with given name ('auto': fastest backend of this machine, see auto_backend())."""
+    if name == 'auto': return auto_backend()
+    if name not in _registry: raise ValueError(f"Unknown backend '{name}'. Known backends: {list(_registry)}.")
+    backend = _registry[name]
+    if not backend.available(): raise ValueError(f"Backend '{name}' is not available on this machine.")
+    return backend
+
+for _backend in (PythonBackend(), NumpyBackend(), NumbaBackend(), MultiprocessBackend()):
+    register_backend(_backend)
+
+
+CALIBRATION_RESOLUTION = (320, 240)
+CALIBRATION_ITERATIONS = 100
+CALIBRATION_SKIPPED = ('python',) # orders of magnitude slower, not worth a calibration run
+
+def cache_directory() -> str:
+    """Directory of the package caches (FRACTAL_DISPLAY_CACHE_DIR, XDG_CACHE_HOME or ~/.cache)."""
+    return os.environ.get('FRACTAL_DISPLAY_CACHE_DIR') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'fractal_display')
+
+def cache_file() -> str:
+    """File caching calibration results, in cache_directory()."""
+    return os.path.join(cache_directory(), 'backends.json')
+
+def _machine_key() -> str:
+    return '|'.join((platform.node(), platform.machine(), str(os.cpu_count()), platform.python_version(),
+        np.__version__, ','.join(sorted(available_backends()))))
+
+def calibrate() -> dict[str, float]:
+    """Best wall time (seconds) of each available backend on a calibration render."""
+    fractal = cplxf.MandelbrotSet(max_iterations = CALIBRATION_ITERATIONS)
+    plane = cplxp.Plane(-2.5, 1.5, -1.5, 1.5, *CALIBRATION_RESOLUTION).toMatrix()
+    timings = {}
+    for name in available_backends():
+        if name in CALIBRATION_SKIPPED: continue
+        backend = _registry[name]
+        backend.escape_counts(fractal, plane[:8]) # warm-up: JIT compilation, process start
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            backend.escape_counts(fractal, plane)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    return timings
+
+_auto_choice = None
+
+def auto_backend() -> Backend:
+    """Fastest available backend of this machine.
+
+    The choice comes from calibrate(), run once per machine and software versions,
+    then read from cache_file() (once per process).
+    """
+    global _auto_choice
+    if _auto_choice is not None and _auto_choice in available_backends():
+        return _registry[_auto_choice]
+    path = cache_file()
+    key = _machine_key()
+    try:
+        with open(path) as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(key)
+    if entry is None or entry.get('backend') not in available_backends():
+        timings = calibrate()
+        entry = {'backend': min(timings, key=timings.get), 'timings': timings}
+        cache[key] = entry
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                json.dump(cache, file, indent=2)
+        except OSError:
+            pass # read-only home: calibrate again next time
+    _auto_choice = entry['backend']
+    return _registry[_auto_choice]
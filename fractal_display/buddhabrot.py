@@ -0,0 +1,312 @@
+"""buddhabrot module. Renders orbit densities of the Mandelbrot set (Buddhabrot).
+
+Instead of coloring each c by its escape count, a Buddhabrot counts how many times
+the orbits z_1, z_2, ... of escaping c values visit each pixel. c values are drawn at
+random in batches: the escape counts of a batch are computed by the vectorized kernel
+of MandelbrotSet, then only escaping orbits are iterated again to accumulate visits.
+Samples in the main cardioid or the period 2 bulb never escape, so they are rejected
+before iterating them.
+
+Batches can run in several processes, each one accumulating its own histogram which
+is merged into the Buddhabrot histogram. Progress can be saved to a checkpoint file
+so that long runs can be resumed.
+
+Classes
+    Buddhabrot
+"""
+
+import concurrent.futures
+import itertools
+import os
+import threading
+import time
+from collections.abc import Iterator
+import numpy as np # np arrays
+from . import complex_fractal as cplxf
+from . import complex_plane as cplxp
+from . import backends
+
+
+SAMPLE_REGION = (-2.0, 2.0, -2.0, 2.0) # c values are drawn in this rectangle (xmin, xmax, ymin, ymax), containing the set
+FLUSH_VISITS = 2 ** 22 # visits buffered before being added to the histogram
+
+
+def _interior(c: np.ndarray) -> np.ndarray[np.bool_]:
+    """True for c in the main cardioid or in the period 2 bulb of the Mandelbrot set."""
+    x, y = c.real, c.imag
+    q = (x - 0.25) ** 2 + y ** 2
+    return (q * (q + (x - 0.25)) <= 0.25 * y ** 2) | ((x + 1) ** 2 + y ** 2 <= 0.0625)
+
+def _batch_histogram(fractal: cplxf.MandelbrotSet, plane: cplxp.Plane, batch_size: int, seed: tuple[int, int],
+        cancel = None) -> np.ndarray[np.int64]:
+    """Visits of the plane pixels by the orbits of one batch of random c values.
+
+    Parameters
+        fractal: Mandelbrot set giving max_iterations.
+        plane: pixels of the histogram (same layout as plane.toMatrix()).
+        batch_size: number of c values drawn.
+        seed: seed of the random generator (Buddhabrot seed, batch index).
+        cancel: optional threading.Event checked at each iteration.
+    Return
+        Flat histogram of plane.ypoints * plane.xpoints ints.
+    """
+    xmin, xmax, ymin, ymax = SAMPLE_REGION
+    generator = np.random.default_rng(seed)
+    c = generator.uniform(xmin, xmax, batch_size) + 1j * generator.uniform(ymin, ymax, batch_size)
+    c = c[~_interior(c)]
+    counts = fractal.escape_counts(c, cancel)
+    escaped = counts < fractal.max_iterations
+    # orbits are iterated again from z_0 = 0 up to their first term greater than 2 (counts + 1 terms)
+    steps = counts[escaped] + 1
+    order = np.argsort(steps, kind='stable')
+    c, steps = c[escaped][order], steps[order]
+    z = np.zeros_like(c)
+    width, height = plane.xpoints, plane.ypoints
+    dx = (plane.xmax - plane.xmin) / max(width - 1, 1)
+    dy = (plane.ymax - plane.ymin) / max(height - 1, 1)
+    histogram = np.zeros(width * height, dtype=np.int64)
+    visits, buffered = [], 0
+    done = 0
+    for iteration in range(1, (int(steps[-1]) if steps.size else 0) + 1):
+        cplxf._check_cancel(cancel)
+        # points before 'done' already reached their last term
+        z[done:] = z[done:] * z[done:] + c[done:]
+        column = np.rint((z[done:].real - plane.xmin) / dx)
+        row = np.rint((plane.ymax - z[done:].imag) / dy) # row 0 is ymax, as in plane.toMatrix()
+        inside = (column >= 0) & (column < width) & (row >= 0) & (row < height)
+        visits.append((row[inside] * width + column[inside]).astype(np.int64))
+        buffered += visits[-1].size
+        if buffered > FLUSH_VISITS:
+            histogram += np.bincount(np.concatenate(visits), minlength=histogram.size)
+            visits, buffered = [], 0
+        done += int(np.searchsorted(steps[done:], iteration, side='right'))
+    if visits:
+        histogram += np.bincount(np.concatenate(visits), minlength=histogram.size)
+    return histogram
+
+class Buddhabrot:
+    """Buddhabrot class.
+
+    Histogram of the pixels visited by the orbits of escaping c values of the Mandelbrot set,
+    accumulated by batches of random samples.
+
+    Attributes
+        fractal: MandelbrotSet
+            Mandelbrot set giving max_iterations (orbits longer than that are not counted).
+        plane: Plane
+            Pixels of the histogram.
+        batch_size: int
+            Number of c values drawn by batch.
+        seed: int
+            Seed of the random samples. Batch n uses seed (seed, n), so runs are reproducible.
+        histogram: np.ndarray[np.int64]
+            Number of visits of each pixel (read-only).
+        samples: int
+            Number of c values drawn so far (read-only).
+        batches: int
+            Number of batches merged into the histogram so far (read-only).
+        samples_per_second: float | None
+            Throughput of the last run() (read-only).
+    Methods
+        run(int, int, threading.Event, str, float)
+            Draws more samples and accumulates their orbits.
+        img_grey(float): np.ndarray[np.float64]
+            Normalized grey scale image of the histogram.
+        save(str)
+            Writes a checkpoint file.
+        load(str): Buddhabrot
+            Buddhabrot saved in a checkpoint file (class method).
+    """
+    def __init__(self,
+            fractal: cplxf.MandelbrotSet | None = None,
+            plane: cplxp.Plane | None = None,
+            batch_size: int = 2 ** 16,
+            seed: int = 0
+            ):
+        self.fractal = fractal if fractal is not None else cplxf.MandelbrotSet(max_iterations = 200)
+        self.plane = plane if plane is not None else cplxp.Plane(-2.0, 1.0, -1.5, 1.5, 400, 400)
+        self.batch_size = batch_size
+        self.seed = seed
+        self._histogram = np.zeros((self.plane.ypoints, self.plane.xpoints), dtype=np.int64)
+        self._samples = 0
+        self._batches = 0 # batches below this index are merged
+        self._merged = set() # merged batches above it (parallel batches finish out of order)
+        self._samples_per_second = None
+
+    @property
+    def fractal(self) -> cplxf.MandelbrotSet:
+        """Mandelbrot set giving max_iterations."""
+        return self._fractal
+    @fractal.setter
+    def fractal(self, fractal: cplxf.MandelbrotSet) -> None:
+        if not isinstance(fractal, cplxf.MandelbrotSet): raise TypeError("Attribute 'fractal' must be a MandelbrotSet.")
+        self._fractal = fractal
+
+    @property
+    def plane(self) -> cplxp.Plane:
+        """Pixels of the histogram. Cannot change once samples were drawn."""
+        return self._plane
+    @plane.setter
+    def plane(self, plane: cplxp.Plane) -> None:
+        if not isinstance(plane, cplxp.Plane): raise TypeError("Attribute 'plane' must be a Plane.")
+        if getattr(self, '_samples', 0): raise ValueError("Attribute 'plane' cannot change once samples were drawn.")
+        self._plane = plane
+
+    @property
+    def batch_size(self) -> int:
+        """Number of c values drawn by batch. Must be positive non zero."""
+        return self._batch_size
+    @batch_size.setter
+    def batch_size(self, batch_size: int) -> None:
+        if not isinstance(batch_size, int): raise TypeError("Attribute 'batch_size' must be int.")
+        if not (batch_size > 0): raise ValueError("Attribute 'batch_size' must be positive non zero.")
+        self._batch_size = batch_size
+
+    @property
+    def seed(self) -> int:
+        """Seed of the random samples. Must be positive."""
+        return self._seed
+    @seed.setter
+    def seed(self, seed: int) -> None:
+        if not isinstance(seed, int): raise TypeError("Attribute 'seed' must be int.")
+        if not (seed >= 0): raise ValueError("Attribute 'seed' must be positive.")
+        self._seed = seed
+
+    @property
+    def histogram(self) -> np.ndarray[np.int64]:
+        """Number of visits of each pixel (plane.ypoints x plane.xpoints)."""
+        return self._histogram
+
+    @property
+    def samples(self) -> int:
+        """Number of c values drawn so far."""
+        return self._samples
+
+    @property
+    def batches(self) -> int:
+        """Number of batches merged into the histogram so far."""
+        return self._batches + len(self._merged)
+
+    @property
+    def samples_per_second(self) -> float | None:
+        """Samples drawn per second during the last run() (None before any run)."""
+        return self._samples_per_second
+
+    def run(self,
+            samples: int,
+            processes: int | None = None,
+            cancel: threading.Event | None = None,
+            checkpoint: str | None = None,
+            checkpoint_interval: float = 60.0
+            ) -> None:
+        """Draws more samples and accumulates the visits of their orbits.
+
+        Parameters
+            samples: number of c values to draw (rounded up to whole batches).
+            processes: number of worker processes, each one accumulating its own histogram
+                (None: one per CPU, 1: batches run in this process).
+            cancel: optional event, RenderCancelled is raised once it is set. Merged batches are kept;
+                batches in flight are discarded and drawn again by the next run, so a resumed run
+                gives the histogram of an uninterrupted one.
+            checkpoint: optional file written every checkpoint_interval seconds and at the end.
+            checkpoint_interval: seconds between checkpoint writes.
+        """
+        if not isinstance(samples, int): raise TypeError("Given samples must be int.")
+        if not (samples > 0): raise ValueError("Given samples must be positive non zero.")
+        processes = processes or os.cpu_count() or 1
+        if not (isinstance(processes, int) and processes > 0): raise ValueError("Given processes must be a positive int.")
+        batches = -(-samples // self.batch_size)
+        start = last_save = time.perf_counter()
+        drawn = 0
+        indices = self._unmerged_batches()
+
+        def merge(batch, histogram):
+            nonlocal drawn, last_save
+            self._histogram += histogram.reshape(self._histogram.shape)
+            self._merged.add(batch)
+            while self._batches in self._merged:
+                self._merged.remove(self._batches)
+                self._batches += 1
+            self._samples += self.batch_size
+            drawn += self.batch_size
+            if checkpoint is not None and time.perf_counter() - last_save >= checkpoint_interval:
+                self.save(checkpoint)
+                last_save = time.perf_counter()
+
+        try:
+            if processes == 1:
+                for _ in range(batches):
+                    batch = next(indices)
+                    merge(batch, _batch_histogram(self.fractal, self.plane, self.batch_size, (self.seed, batch), cancel))
+            else:
+                with backends.process_pool(processes) as pool:
+                    pending = {} # future -> batch index
+                    submitted = 0
+                    try:
+                        while submitted < batches or pending:
+                            # keep two batches per process in flight
+                            while submitted < batches and len(pending) < 2 * processes:
+                                batch = next(indices)
+                                pending[pool.submit(_batch_histogram, self.fractal, self.plane, self.batch_size, (self.seed, batch))] = batch
+                                submitted += 1
+                            finished, _ = concurrent.futures.wait(pending, timeout=0.05, return_when=concurrent.futures.FIRST_COMPLETED)
+                            for future in finished:
+                                merge(pending.pop(future), future.result())
+                            cplxf._check_cancel(cancel)
+                    except BaseException:
+                        for future in pending: future.cancel()
+                        raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self._samples_per_second = drawn / elapsed if elapsed > 0 else None
+            if checkpoint is not None: self.save(checkpoint)
+
+    def _unmerged_batches(self) -> Iterator[int]:
+        """Indices of the batches not merged yet, in increasing order."""
+        merged = set(self._merged)
+        return (batch for batch in itertools.count(self._batches) if batch not in merged)
+
+    def img_grey(self, gamma: float = 0.5) -> np.ndarray[np.float64]:
+        """Normalized grey scale image of the histogram.
+
+        Parameters
+            gamma: exponent applied to normalized visits (below 1 brightens rarely visited pixels).
+        Return
+            Numpy array of floats between 0 (no visit) and 1 (most visited pixel).
+        """
+        if not isinstance(gamma, float | int): raise TypeError("Given gamma must be float.")
+        if not (gamma > 0): raise ValueError("Given gamma must be positive non zero.")
+        peak = self._histogram.max()
+        if peak == 0: return np.zeros(self._histogram.shape)
+        return (self._histogram / peak) ** gamma
+
+    def save(self, path: str) -> None:
+        """Writes the histogram and the settings to a checkpoint file (NumPy .npz format)."""
+        plane = self.plane
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as file: # file object: np.savez() would append '.npz' to a path
+            np.savez(file,
+                histogram = self._histogram,
+                plane = np.array([plane.xmin, plane.xmax, plane.ymin, plane.ymax, plane.xpoints, plane.ypoints], dtype=np.float64),
+                counters = np.array([self.fractal.max_iterations, self.batch_size, self.seed, self._samples, self._batches], dtype=np.int64),
+                merged = np.array(sorted(self._merged), dtype=np.int64))
+        os.replace(temporary, path) # a run killed while saving keeps the previous checkpoint
+
+    @classmethod
+    def load(cls, path: str) -> 'Buddhabrot':
+        """Buddhabrot saved by save(), ready to resume with run()."""
+        with np.load(path) as data:
+            xmin, xmax, ymin, ymax, xpoints, ypoints = data['plane'].tolist()
+            max_iterations, batch_size, seed, samples, batches = (int(value) for value in data['counters'])
+            buddhabrot = cls(
+                fractal = cplxf.MandelbrotSet(max_iterations = max_iterations),
+                plane = cplxp.Plane(xmin, xmax, ymin, ymax, int(xpoints), int(ypoints)),
+                batch_size = batch_size,
+                seed = seed
+            )
+            buddhabrot._histogram = data['histogram'].astype(np.int64)
+            merged = set(data['merged'].tolist()) if 'merged' in data else set()
+        buddhabrot._samples = samples
+        buddhabrot._batches = batches
+        buddhabrot._merged = merged
+        return buddhabrot
@@ -0,0 +1,105 @@
+"""coloring module. Maps escape counts to the values given to colormaps.
+
+Linear coloring (Fractal.stability()) divides escape counts by max_iterations: with many
+iterations, most pixels escape within the first few percent of them and the image uses a
+small part of the colormap, so contrast depends on the chosen number of iterations.
+Histogram equalization maps each escape count to the fraction of escaping pixels that escaped
+earlier: colors are spread evenly over the pixels, whatever the number of iterations.
+
+Classes
+    CountHistogram
+"""
+
+import numpy as np # np arrays
+
+
+class CountHistogram:
+    """CountHistogram class.
+
+    Histogram of escape counts, built incrementally from chunks of an image (tiles, bands
+    of an out-of-core render) and mergeable, so that parallel workers count their own chunks.
+    Coloring takes two passes over the chunks: the first one adds their counts, the second one
+    looks their equalized values up in a table indexed by escape count. Besides the chunk being
+    processed, only the max_iterations + 1 bins are kept.
+
+    Attributes
+        max_iterations: int
+            Escape count of the points that did not escape (read-only).
+        bins: np.ndarray[np.int64]
+            Number of pixels of each escape count, from 0 to max_iterations (read-only).
+        total: int
+            Number of pixels counted (read-only).
+    Methods
+        add(np.ndarray): CountHistogram
+            Counts the escape counts of a chunk.
+        merge(CountHistogram): CountHistogram
+            Adds the bins of another histogram.
+        lookup_table(): np.ndarray[np.float64]
+            Equalized value of each escape count.
+        equalize(np.ndarray): np.ndarray[np.float64]
+            Equalized values of escape counts.
+    """
+    def __init__(self, max_iterations: int):
+        if not isinstance(max_iterations, int): raise TypeError("Given max_iterations must be int.")
+        if not (max_iterations > 0): raise ValueError("Given max_iterations must be positive non zero.")
+        self._max_iterations = max_iterations
+        self._bins = np.zeros(max_iterations + 1, dtype=np.int64)
+        self._table = None # lookup table of the current bins
+
+    @property
+    def max_iterations(self) -> int:
+        """Escape count of the points that did not escape."""
+        return self._max_iterations
+
+    @property
+    def bins(self) -> np.ndarray[np.int64]:
+        """Number of pixels of each escape count, from 0 to max_iterations."""
+        return self._bins.copy()
+
+    @property
+    def total(self) -> int:
+        """Number of pixels counted."""
+        return int(self._bins.sum())
+
+    def add(self, counts: np.ndarray) -> 'CountHistogram':
+        """Counts the escape counts of a chunk (clipped to [0, max_iterations]).
+
+        Return
+            The histogram itself.
+        """
+        counts = np.clip(np.asarray(counts, dtype=np.int64).ravel(), 0, self._max_iterations)
+        self._bins += np.bincount(counts, minlength = self._max_iterations + 1)
+        self._table = None
+        return self
+
+    def merge(self, other: 'CountHistogram') -> 'CountHistogram':
+        """Adds the bins of another histogram of the same max_iterations.
+
+        Return
+            The histogram itself.
+        """
+        if not isinstance(other, CountHistogram): raise TypeError("Given histogram must be a CountHistogram.")
+        if not (other.max_iterations == self._max_iterations): raise ValueError("Histograms must have the same max_iterations.")
+        self._bins += other._bins
+        self._table = None
+        return self
+
+    def lookup_table(self) -> np.ndarray[np.float64]:
+        """Equalized value of each escape count.
+
+        Escape count k maps to the fraction of escaping pixels with a count lower than k, so the
+        lowest count maps to 0 like in linear coloring, and points that did not escape map to 1.
+        """
+        if self._table is None:
+            escaped = self._bins[:-1]
+            below = np.concatenate(([0], np.cumsum(escaped)))
+            self._table = np.append(below[:-1] / max(int(below[-1]), 1), 1.0)
+        return self._table
+
+    def equalize(self, counts: np.ndarray) -> np.ndarray[np.float64]:
+        """Equalized values of escape counts (array of the same shape)."""
+        counts = np.clip(np.asarray(counts, dtype=np.int64), 0, self._max_iterations)
+        return self.lookup_table()[counts]
+
+    def __repr__(self) -> str:
+        return f'CountHistogram(max_iterations={self._max_iterations}, total={self.total})'
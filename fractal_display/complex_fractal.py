@@ -4,11 +4,158 @@ Classes
     Fractal
     JuliaSet
     MandelbrotSet
+    MultiJuliaSet
+    MultibrotSet
+    NewtonFractal
+    RenderCancelled
 """
 
 from abc import ABC, abstractmethod # package for abstract classes
+import numpy as np # vectorized kernels
 
 
+class RenderCancelled(Exception):
+    """Raised by vectorized kernels when their cancel event is set."""
+
+def _check_cancel(cancel) -> None:
+    """Raises RenderCancelled if given cancel event (threading.Event or None) is set."""
+    if cancel is not None and cancel.is_set(): raise RenderCancelled("Render cancelled.")
+
+def _power(z, degree: int):
+    """z^degree by exponentiation by squaring (about log2(degree) multiplications).
+
+    Works on complex numbers and on arrays, with the same rounding for both,
+    which generic complex ** does not guarantee.
+    """
+    result = None
+    while True:
+        if degree & 1: result = z if result is None else result * z
+        degree >>= 1
+        if not degree: return result
+        z = z * z
+
+def _polynomial_value(z, coefficients: tuple[complex, ...]):
+    """Value of the polynomial with given coefficients (highest degree first) at z, by Horner's method."""
+    result = coefficients[0]
+    for coefficient in coefficients[1:]:
+        result = result * z + coefficient
+    return result
+
+def _degree_radius(degree: int) -> float:
+    """Escape radius 2^(1/(degree-1)) of z^degree + c for |c| below it (2 for degree 2)."""
+    return 2 ** (1 / (degree - 1))
+
+def _square(z):
+    return z * z
+
+def _polynomial_escape_counts(z: np.ndarray, c: np.ndarray | complex, polynomial, radius: float,
+        max_iterations: int, cancel = None) -> np.ndarray:
+    """Vectorized escape counts of the sequence z_(n+1) = polynomial(z_n) + c.
+
+    Same result as the scalar escape_count() loops, computed on whole arrays.
+    Points are retired from the working arrays as soon as they escape, so the cost
+    of each iteration tracks the number of points still iterating.
+    
+    Parameters
+        z: initial terms z_0.
+        c: constant(s), scalar or array with the same shape as z.
+        polynomial: function computing polynomial(z) of an array.
+        radius: escape radius, points whose modulus is greater are considered as diverging.
+        max_iterations: escape count of points that never escape.
+        cancel: optional threading.Event checked at each iteration.
+    Return
+        Array of ints with the shape of z.
+    """
+    shape = np.shape(z)
+    z = np.array(z, dtype=np.complex128).ravel()
+    c = np.broadcast_to(np.asarray(c, dtype=np.complex128), shape).ravel().copy()
+    counts = np.full(z.size, max_iterations, dtype=np.int64)
+    index = np.arange(z.size)
+    for iteration in range(max_iterations):
+        _check_cancel(cancel)
+        z = polynomial(z) + c
+        # (hypot() rounds exactly like abs(complex) in the scalar loops, np.abs() does not)
+        escaped = np.hypot(z.real, z.imag) > radius
+        if escaped.any():
+            counts[index[escaped]] = iteration
+            remaining = ~escaped
+            z, c, index = z[remaining], c[remaining], index[remaining]
+            if index.size == 0: break
+    return counts.reshape(shape)
+
+def _quadratic_escape_counts(z: np.ndarray, c: np.ndarray | complex, max_iterations: int, cancel = None) -> np.ndarray:
+    """Vectorized escape counts of the sequence z_(n+1) = z_n^2 + c (escape radius 2)."""
+    # numbers whose modulus is greater than 2 are considered to big
+    return _polynomial_escape_counts(z, c, _square, 2, max_iterations, cancel)
+
+DISTANCE_ESCAPE_RADIUS = 1e10 # escaped points are iterated further up to this modulus for accurate distances
+DISTANCE_EXTRA_ITERATIONS = 64
+
+def _quadratic_distance_estimates(z: np.ndarray, c: np.ndarray | complex, max_iterations: int,
+        dz: complex, dc: complex, cancel = None) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized escape counts and exterior distance estimates of the sequence z_(n+1) = z_n^2 + c.
+    
+    The derivative of z_n (with respect to c for Mandelbrot set, to z_0 for Julia sets)
+    is iterated alongside z: dz_(n+1) = 2 z_n dz_n + dc.
+    Escape counts are computed first, then only escaped points are iterated again with their
+    derivative, so points that never escape cost no more than in escape_counts().
+    Once a point escapes, it keeps being iterated until |z| > DISTANCE_ESCAPE_RADIUS so that the
+    estimate is accurate. With G = ln|z_n| / 2^n the Green function, Koebe 1/4 theorem bounds the
+    distance to the set from below by (1 - e^(-2G)) / (4 |G'|), which is the returned distance.
+    
+    Parameters
+        z: initial terms z_0.
+        c: constant(s), scalar or array with the same shape as z.
+        max_iterations: escape count of points that never escape.
+        dz: initial derivative (0 for Mandelbrot set, 1 for Julia sets).
+        dc: derivative of c (1 for Mandelbrot set, 0 for Julia sets).
+        cancel: optional threading.Event checked at each iteration.
+    Return
+        Escape counts (ints) and lower bounds of the distance to the set (floats, 0 for
+        points that did not escape), both with the shape of z.
+    """
+    counts = _quadratic_escape_counts(z, c, max_iterations, cancel)
+    shape = counts.shape
+    counts = counts.ravel()
+    index = np.flatnonzero(counts < max_iterations)
+    # iterate escaped points again, from z_0 to the first term greater than 2 (counts + 1 terms)
+    z = np.array(z, dtype=np.complex128).ravel()[index]
+    c = np.broadcast_to(np.asarray(c, dtype=np.complex128), shape).ravel()[index]
+    dz = np.full(index.size, dz, dtype=np.complex128)
+    order = np.argsort(counts[index], kind='stable') # points leave the loop sorted by escape count
+    z, c, dz, index = z[order], c[order], dz[order], index[order]
+    steps = counts[index] + 1
+    done = 0
+    with np.errstate(over='ignore', invalid='ignore'):
+        for iteration in range(1, max_iterations + 1):
+            if done == index.size: break
+            _check_cancel(cancel)
+            # points before 'done' already reached their first term greater than 2: they are frozen
+            dz[done:] = 2 * z[done:] * dz[done:] + dc
+            z[done:] = z[done:] * z[done:] + c[done:]
+            done += int(np.searchsorted(steps[done:], iteration, side='right'))
+    distances = np.zeros(counts.size, dtype=np.float64)
+    distances[index] = _escaped_distances(z, dz, c, steps, dc)
+    return counts.reshape(shape), distances.reshape(shape)
+
+def _escaped_distances(z: np.ndarray, dz: np.ndarray, c: np.ndarray, n: np.ndarray, dc: complex) -> np.ndarray:
+    """Distance lower bounds of escaped points, given z_n and its derivative dz_n for each point."""
+    n = n.copy()
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for _ in range(DISTANCE_EXTRA_ITERATIONS):
+            iterating = np.hypot(z.real, z.imag) <= DISTANCE_ESCAPE_RADIUS
+            if not iterating.any(): break
+            dz = np.where(iterating, 2 * z * dz + dc, dz)
+            z = np.where(iterating, z * z + c, z)
+            n += iterating
+        modulus = np.hypot(z.real, z.imag)
+        log_modulus = np.log(modulus)
+        green = np.ldexp(log_modulus, -n) # ln|z_n| / 2^n
+        # (1 - e^(-2G)) / (2G) tends to 1 for small G, written so that it never overflows
+        factor = np.where(green > 0, -np.expm1(-2 * green) / (2 * green), 1.0)
+        estimate = factor * modulus * log_modulus / (2 * np.abs(dz))
+    return np.nan_to_num(estimate, nan=0.0, posinf=0.0) # null derivative (critical point): no information
+
 class Fractal(ABC):
     """Fractal abstract class.
     
@@ -18,6 +165,13 @@ class Fractal(ABC):
         stability(complex): float
         escape_count(complex): int
         __str__(): str
+    Methods
+        stabilities(np.ndarray, threading.Event): np.ndarray[np.float64]
+            Stability of each point of an array.
+        escape_counts(np.ndarray, threading.Event): np.ndarray[np.int64]
+            Escape count of each point of an array.
+        distance_estimates(np.ndarray, threading.Event): tuple[np.ndarray[np.int64], np.ndarray[np.float64]]
+            Escape counts and lower bounds of the distance to the set of each point of an array.
     """    
     @abstractmethod
     def stability(self, candidate: complex) -> float:
@@ -29,6 +183,38 @@ class Fractal(ABC):
     def __str__(self) -> str:
         pass
 
+    def stabilities(self, candidates: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        """Stability of each point of an array.
+        
+        Default implementation calls stability() point by point, checking cancel event between rows.
+        Subclasses override it with vectorized kernels.
+        """
+        return self._pointwise(self.stability, candidates, np.float64, cancel)
+
+    def escape_counts(self, candidates: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        """Escape count of each point of an array.
+        
+        Default implementation calls escape_count() point by point, checking cancel event between rows.
+        Subclasses override it with vectorized kernels.
+        """
+        return self._pointwise(self.escape_count, candidates, np.int64, cancel)
+
+    def distance_estimates(self, candidates: np.ndarray, cancel = None) -> tuple[np.ndarray[np.int64], np.ndarray[np.float64]]:
+        """Escape counts and lower bounds of the distance to the set of each point of an array.
+        
+        Not available by default: subclasses with a known derivative override it.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide distance estimation.")
+
+    @staticmethod
+    def _pointwise(method, candidates: np.ndarray, dtype, cancel) -> np.ndarray:
+        candidates = np.atleast_1d(candidates)
+        result = np.empty(shape = candidates.shape, dtype = dtype)
+        for idx, point in np.ndenumerate(candidates):
+            if idx[-1] == 0: _check_cancel(cancel)
+            result[idx] = method(complex(point))
+        return result
+
 class JuliaSet(Fractal):
     """Julia sets class.
     
@@ -43,6 +229,12 @@ class JuliaSet(Fractal):
             Stability of the sequence with given z_0.
         escape_count(complex): int
             Number of iterations before diverging.
+        stabilities(np.ndarray, threading.Event): np.ndarray[np.float64]
+            Vectorized stability().
+        escape_counts(np.ndarray, threading.Event): np.ndarray[np.int64]
+            Vectorized escape_count().
+        distance_estimates(np.ndarray, threading.Event): tuple[np.ndarray[np.int64], np.ndarray[np.float64]]
+            Vectorized escape_count() and lower bounds of the distance to the set.
         __str__(): str
     """
     def __init__(self, c: complex = -0.75, max_iterations: int = 20):
@@ -103,6 +295,32 @@ class JuliaSet(Fractal):
                 return iteration
         return self.max_iterations
     
+    def stabilities(self, z_0: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        """Vectorized stability(): stability of the sequence for each z_0 of an array."""
+        return self.escape_counts(z_0, cancel) / self.max_iterations
+
+    def escape_counts(self, z_0: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        """Vectorized escape_count(): number of iterations before diverging for each z_0 of an array.
+        
+        Parameters
+            z_0: array of numbers to evaluate divergence.
+            cancel: optional threading.Event, RenderCancelled is raised as soon as it is set.
+        Return
+            Array of ints between 0 and self.max_iterations, with the shape of z_0.
+        """
+        return _quadratic_escape_counts(z_0, self.c, self.max_iterations, cancel)
+    
+    def distance_estimates(self, z_0: np.ndarray, cancel = None) -> tuple[np.ndarray[np.int64], np.ndarray[np.float64]]:
+        """Escape counts and lower bounds of the distance to the set for each z_0 of an array.
+        
+        Parameters
+            z_0: array of numbers to evaluate.
+            cancel: optional threading.Event, RenderCancelled is raised as soon as it is set.
+        Return
+            Escape counts (same as escape_counts()) and distances to the set (0 for points that do not escape).
+        """
+        return _quadratic_distance_estimates(z_0, self.c, self.max_iterations, 1, 0, cancel)
+    
     def __str__(self) -> str:
         return f'Julia_c{self.c}_maxIt{self.max_iterations}'
 
@@ -119,6 +337,12 @@ class MandelbrotSet(Fractal):
             Stability of the sequence with given c.
         escape_count(complex): int
             Number of iterations before diverging.
+        stabilities(np.ndarray, threading.Event): np.ndarray[np.float64]
+            Vectorized stability().
+        escape_counts(np.ndarray, threading.Event): np.ndarray[np.int64]
+            Vectorized escape_count().
+        distance_estimates(np.ndarray, threading.Event): tuple[np.ndarray[np.int64], np.ndarray[np.float64]]
+            Vectorized escape_count() and lower bounds of the distance to the set.
         __str__(): str
     """
     def __init__(self, max_iterations: int = 20):
@@ -168,5 +392,485 @@ class MandelbrotSet(Fractal):
                 return iteration
         return self.max_iterations
     
+    def stabilities(self, c: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        """Vectorized stability(): stability of the sequence for each c of an array."""
+        return self.escape_counts(c, cancel) / self.max_iterations
+
+    def escape_counts(self, c: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        """Vectorized escape_count(): number of iterations before diverging for each c of an array.
+        
+        Parameters
+            c: array of numbers to evaluate divergence speed.
+            cancel: optional threading.Event, RenderCancelled is raised as soon as it is set.
+        Return
+            Array of ints between 0 and self.max_iterations, with the shape of c.
+        """
+        return _quadratic_escape_counts(np.zeros(np.shape(c), dtype=np.complex128), c, self.max_iterations, cancel)
+    
+    def distance_estimates(self, c: np.ndarray, cancel = None) -> tuple[np.ndarray[np.int64], np.ndarray[np.float64]]:
+        """Escape counts and lower bounds of the distance to the set for each c of an array.
+        
+        Parameters
+            c: array of numbers to evaluate.
+            cancel: optional threading.Event, RenderCancelled is raised as soon as it is set.
+        Return
+            Escape counts (same as escape_counts()) and distances to the set (0 for points that do not escape).
+        """
+        return _quadratic_distance_estimates(np.zeros(np.shape(c), dtype=np.complex128), c, self.max_iterations, 0, 1, cancel)
+    
+    def __str__(self) -> str:
+        return f'Mandelbrot_maxIt{self.max_iterations}'
+
+class MultibrotSet(Fractal):
+    """Multibrot sets class.
+    
+    Multibrot set of degree d is the set of c so that the sequence z_(n+1) = z_n^d + c with z_0 = 0 converges.
+    Degree 2 gives the Mandelbrot set. z^d is computed by exponentiation by squaring, and the escape radius
+    2^(1/(d-1)) shrinks towards 1 as the degree grows.
+    
+    Attributes
+        degree: int
+            Degree d of the sequence, at least 2.
+        max_iterations: int
+            Maximum number of iterations for considering sequence as convergent.
+    Methods
+        stability(complex): float
+            Stability of the sequence with given c.
+        escape_count(complex): int
+            Number of iterations before diverging.
+        stabilities(np.ndarray, threading.Event): np.ndarray[np.float64]
+            Vectorized stability().
+        escape_counts(np.ndarray, threading.Event): np.ndarray[np.int64]
+            Vectorized escape_count().
+        __str__(): str
+    """
+    def __init__(self, degree: int = 3, max_iterations: int = 20):
+        self.degree = degree
+        self.max_iterations = max_iterations
+
+    @property
+    def degree(self) -> int:
+        """Degree d of the sequence z_(n+1) = z_n^d + c. Must be at least 2."""
+        return self._degree
+    @degree.setter
+    def degree(self, degree: int) -> None:
+        if not isinstance(degree, int): raise TypeError("Attribute 'degree' must be int.")
+        if not (degree >= 2): raise ValueError("Attribute 'degree' must be at least 2.")
+        self._degree = degree
+
+    @property
+    def max_iterations(self) -> int:
+        """Maximum number of iterations for considering sequence as convergent."""
+        return self._max_iterations
+    @max_iterations.setter
+    def max_iterations(self, max_iterations: int) -> None:
+        if not isinstance(max_iterations, int): raise TypeError("Attribute 'max_iterations' must be int.")
+        if not (max_iterations > 0): raise ValueError("Attribute 'max_iterations' must be positive non zero.")
+        self._max_iterations = max_iterations
+
+    @property
+    def escape_radius(self) -> float:
+        """Modulus beyond which the sequence diverges: 2^(1/(d-1))."""
+        return _degree_radius(self.degree)
+
+    def stability(self, c: complex) -> float:
+        """Stability of the sequence with given c (escape count divided by self.max_iterations).
+        
+        Parameters
+            c: number to measure divergence speed.
+        Return
+            Normalized divergence measurement.
+            0: most divergent point.
+            1: most convergent point.
+        """
+        if not isinstance(c, complex | float | int): raise TypeError("Given c must be a complex number.")
+        return self.escape_count(c) / self.max_iterations
+
+    def escape_count(self, c: complex) -> int:
+        """Number of iterations before diverging.
+        
+        Parameters
+            c: number to evaluate divergence speed.
+        Return
+            Number of iterations before diverging between 0 and self.max_iterations.
+        """
+        if not isinstance(c, complex | float | int): raise TypeError("Given c must be a complex number.")
+        radius = self.escape_radius
+        z = 0
+        for iteration in range(self.max_iterations):
+            z = _power(z, self.degree) + c
+            if abs(z) > radius:
+                return iteration
+        return self.max_iterations
+
+    def stabilities(self, c: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        """Vectorized stability(): stability of the sequence for each c of an array."""
+        return self.escape_counts(c, cancel) / self.max_iterations
+
+    def escape_counts(self, c: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        """Vectorized escape_count(): number of iterations before diverging for each c of an array.
+        
+        Parameters
+            c: array of numbers to evaluate divergence speed.
+            cancel: optional threading.Event, RenderCancelled is raised as soon as it is set.
+        Return
+            Array of ints between 0 and self.max_iterations, with the shape of c.
+        """
+        degree = self.degree
+        return _polynomial_escape_counts(np.zeros(np.shape(c), dtype=np.complex128), c,
+            lambda z: _power(z, degree), self.escape_radius, self.max_iterations, cancel)
+
+    def __str__(self) -> str:
+        return f'Multibrot_d{self.degree}_maxIt{self.max_iterations}'
+
+class MultiJuliaSet(Fractal):
+    """Multi-Julia sets class.
+    
+    Multi-Julia sets are the sets of z_0 so that the sequence z_(n+1) = p(z_n) + c converges, where p is
+    either z^d (computed by exponentiation by squaring) or a general polynomial of degree d given by its
+    coefficients (computed by Horner's method). Degree 2 with p = z^2 gives the quadratic Julia sets: escape
+    counts are those of JuliaSet for |c| <= 2, beyond which the escape radius |c| exceeds JuliaSet's radius 2.
+    
+    Attributes
+        c: complex
+        degree: int
+            Degree d of p, at least 2. Setting it makes p = z^d.
+        coefficients: tuple[complex] | None
+            Coefficients of p, highest degree first (None for p = z^d). Setting them sets the degree.
+        max_iterations: int
+    Methods
+        stability(complex): float
+            Stability of the sequence with given z_0.
+        escape_count(complex): int
+            Number of iterations before diverging.
+        stabilities(np.ndarray, threading.Event): np.ndarray[np.float64]
+            Vectorized stability().
+        escape_counts(np.ndarray, threading.Event): np.ndarray[np.int64]
+            Vectorized escape_count().
+        __str__(): str
+    """
+    def __init__(self, c: complex = -0.75, degree: int = 3, max_iterations: int = 20, coefficients: tuple[complex, ...] | None = None):
+        self.c = c
+        self.degree = degree
+        if coefficients is not None: self.coefficients = coefficients
+        self.max_iterations = max_iterations
+
+    @property
+    def c(self) -> complex:
+        """Constant c caracterising Julia set."""
+        return self._c
+    @c.setter
+    def c(self, c: complex) -> None:
+        if not isinstance(c, complex | float | int): raise TypeError("Attribute 'c' must be a complex number.")
+        self._c = c
+
+    @property
+    def degree(self) -> int:
+        """Degree d of the polynomial p. Must be at least 2.
+        Setting it replaces p by z^d."""
+        return self._degree
+    @degree.setter
+    def degree(self, degree: int) -> None:
+        if not isinstance(degree, int): raise TypeError("Attribute 'degree' must be int.")
+        if not (degree >= 2): raise ValueError("Attribute 'degree' must be at least 2.")
+        self._degree = degree
+        self._coefficients = None
+
+    @property
+    def coefficients(self) -> tuple[complex, ...] | None:
+        """Coefficients of the polynomial p, highest degree first (None: p = z^degree).
+        Leading coefficient must be non zero and degree at least 2."""
+        return self._coefficients
+    @coefficients.setter
+    def coefficients(self, coefficients: tuple[complex, ...] | None) -> None:
+        if coefficients is None:
+            self._coefficients = None
+            return
+        if not (isinstance(coefficients, tuple | list) and all(isinstance(coefficient, complex | float | int) for coefficient in coefficients)):
+            raise TypeError("Attribute 'coefficients' must be a tuple of complex numbers.")
+        if not (len(coefficients) >= 3): raise ValueError("Attribute 'coefficients' must describe a polynomial of degree at least 2.")
+        if coefficients[0] == 0: raise ValueError("Leading coefficient must be non zero.")
+        self._coefficients = tuple(complex(coefficient) for coefficient in coefficients)
+        self._degree = len(coefficients) - 1
+
+    @property
+    def max_iterations(self) -> int:
+        """Maximum number of iterations for considering sequence as convergent.
+        Must be positive non zero."""
+        return self._max_iterations
+    @max_iterations.setter
+    def max_iterations(self, max_iterations: int) -> None:
+        if not isinstance(max_iterations, int): raise TypeError("Attribute 'max_iterations' must be int.")
+        if not (max_iterations > 0): raise ValueError("Attribute 'max_iterations' must be positive non zero.")
+        self._max_iterations = max_iterations
+
+    @property
+    def escape_radius(self) -> float:
+        """Modulus beyond which the sequence diverges.
+        
+        max(|c|, 2^(1/(d-1))) for p = z^d. For a general polynomial a_d z^d + ... + a_0,
+        max(1, (|a_(d-1)| + ... + |a_0| + |c| + 2) / |a_d|): beyond it |p(z) + c| >= 2 |z|.
+        """
+        if self.coefficients is None:
+            return max(abs(self.c), _degree_radius(self.degree))
+        lower = sum(abs(coefficient) for coefficient in self.coefficients[1:])
+        return max(1.0, (lower + abs(self.c) + 2) / abs(self.coefficients[0]))
+
+    def _polynomial(self):
+        """Function computing p(z), for complex numbers and arrays."""
+        degree, coefficients = self.degree, self.coefficients
+        if coefficients is None: return lambda z: _power(z, degree)
+        return lambda z: _polynomial_value(z, coefficients)
+
+    def stability(self, z_0: complex) -> float:
+        """Stability of the sequence with given z_0 (escape count divided by self.max_iterations).
+        
+        Parameters
+            z_0: number to measure divergence speed.
+        Return
+            Normalized divergence measurement.
+            0: most divergent point.
+            1: most convergent point.
+        """
+        if not isinstance(z_0, complex | float | int): raise TypeError("Given z_0 must be a complex number.")
+        return self.escape_count(z_0) / self.max_iterations
+
+    def escape_count(self, z_0: complex) -> int:
+        """Number of iterations before diverging.
+        
+        Parameters
+            z_0: number to evaluate divergence.
+        Return
+            Number of iterations before diverging between 0 and self.max_iterations.
+        """
+        if not isinstance(z_0, complex | float | int): raise TypeError("Given z_0 must be a complex number.")
+        polynomial, radius = self._polynomial(), self.escape_radius
+        z = complex(z_0)
+        for iteration in range(self.max_iterations):
+            z = polynomial(z) + self.c
+            if abs(z) > radius:
+                return iteration
+        return self.max_iterations
+
+    def stabilities(self, z_0: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        """Vectorized stability(): stability of the sequence for each z_0 of an array."""
+        return self.escape_counts(z_0, cancel) / self.max_iterations
+
+    def escape_counts(self, z_0: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        """Vectorized escape_count(): number of iterations before diverging for each z_0 of an array.
+        
+        Parameters
+            z_0: array of numbers to evaluate divergence.
+            cancel: optional threading.Event, RenderCancelled is raised as soon as it is set.
+        Return
+            Array of ints between 0 and self.max_iterations, with the shape of z_0.
+        """
+        with np.errstate(over='ignore', invalid='ignore'):
+            return _polynomial_escape_counts(z_0, self.c, self._polynomial(), self.escape_radius, self.max_iterations, cancel)
+
+    def __str__(self) -> str:
+        if self.coefficients is None:
+            return f'MultiJulia_d{self.degree}_c{self.c}_maxIt{self.max_iterations}'
+        return f'MultiJulia_p{list(self.coefficients)}_c{self.c}_maxIt{self.max_iterations}'
+
+def _newton_step(z, coefficients: tuple[complex, ...], derivative: tuple[complex, ...]):
+    """z - p(z) / p'(z), for complex numbers and arrays.
+
+    The division is written with real operations so that scalars and arrays round the
+    same way (Python and NumPy complex divisions use different algorithms).
+    """
+    value = _polynomial_value(z, coefficients)
+    slope = _polynomial_value(z, derivative)
+    numerator = value * slope.conjugate()
+    norm = slope.real * slope.real + slope.imag * slope.imag
+    return z - (numerator.real / norm + 1j * (numerator.imag / norm))
+
+def _newton_convergence(z: np.ndarray, coefficients: tuple[complex, ...], roots: np.ndarray, tolerance: float,
+        max_iterations: int, cancel = None) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized root indices and convergence counts of Newton's method z_(n+1) = z_n - p(z_n) / p'(z_n).
+
+    Points are retired from the working arrays as soon as they are closer than tolerance
+    to a root, or once they stop being finite (null derivative), so the cost of each
+    iteration tracks the number of points still converging.
+
+    Return
+        Root indices (-1 for points that did not converge) and counts (max_iterations for
+        points that did not converge), both with the shape of z.
+    """
+    shape = np.shape(z)
+    derivative = tuple(coefficient * (len(coefficients) - 1 - power) for power, coefficient in enumerate(coefficients[:-1]))
+    z = np.array(z, dtype=np.complex128).ravel()
+    indices = np.full(z.size, -1, dtype=np.int64)
+    counts = np.full(z.size, max_iterations, dtype=np.int64)
+    index = np.arange(z.size)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for iteration in range(max_iterations):
+            _check_cancel(cancel)
+            z = _newton_step(z, coefficients, derivative)
+            nearest = np.full(z.size, -1, dtype=np.int64)
+            for root_index, root in enumerate(roots):
+                difference = z - root
+                near = (np.hypot(difference.real, difference.imag) < tolerance) & (nearest < 0)
+                nearest[near] = root_index
+            converged = nearest >= 0
+            if converged.any():
+                indices[index[converged]] = nearest[converged]
+                counts[index[converged]] = iteration
+            retired = converged | ~np.isfinite(z)
+            if retired.any():
+                remaining = ~retired
+                z, index = z[remaining], index[remaining]
+                if index.size == 0: break
+    return indices.reshape(shape), counts.reshape(shape)
+
+class NewtonFractal(Fractal):
+    """Newton fractals class.
+    
+    Newton's method z_(n+1) = z_n - p(z_n) / p'(z_n) converges to one of the roots of the polynomial p
+    for almost every z_0. Newton fractal colors each z_0 by the root it converges to and by the number
+    of iterations it takes, the boundaries between basins of attraction being fractal.
+    Roots are computed once (np.roots() polished by Newton's method), then points are considered
+    converged as soon as they are closer than tolerance to one of them.
+    
+    Stability of a point converging to root k of N after n iterations is (k + 1 - n / max_iterations) / N,
+    0 for points that do not converge: each root gets its own band of a colormap (use cyclic or
+    qualitative colormaps such as 'hsv' or 'tab10'), shaded by convergence speed.
+    
+    Attributes
+        coefficients: tuple[complex]
+            Coefficients of p, highest degree first.
+        max_iterations: int
+        tolerance: float
+            Distance to a root under which a point is considered converged.
+        roots: np.ndarray[np.complex128]
+            Roots of p (read-only).
+    Methods
+        stability(complex): float
+            Root band and convergence speed of given z_0 (see above).
+        escape_count(complex): int
+            Number of iterations before converging (max_iterations if it does not).
+        root_index(complex): int
+            Index in roots of the root reached from given z_0 (-1 if none).
+        convergence(np.ndarray, threading.Event): tuple[np.ndarray[np.int64], np.ndarray[np.int64]]
+            Vectorized root_index() and escape_count().
+        stabilities(np.ndarray, threading.Event): np.ndarray[np.float64]
+            Vectorized stability().
+        escape_counts(np.ndarray, threading.Event): np.ndarray[np.int64]
+            Vectorized escape_count().
+        __str__(): str
+    """
+    def __init__(self, coefficients: tuple[complex, ...] = (1, 0, 0, -1), max_iterations: int = 20, tolerance: float = 1e-6):
+        self.coefficients = coefficients
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    @property
+    def coefficients(self) -> tuple[complex, ...]:
+        """Coefficients of the polynomial p, highest degree first (default z^3 - 1).
+        Leading coefficient must be non zero and degree at least 2."""
+        return self._coefficients
+    @coefficients.setter
+    def coefficients(self, coefficients: tuple[complex, ...]) -> None:
+        if not (isinstance(coefficients, tuple | list) and all(isinstance(coefficient, complex | float | int) for coefficient in coefficients)):
+            raise TypeError("Attribute 'coefficients' must be a tuple of complex numbers.")
+        if not (len(coefficients) >= 3): raise ValueError("Attribute 'coefficients' must describe a polynomial of degree at least 2.")
+        if coefficients[0] == 0: raise ValueError("Leading coefficient must be non zero.")
+        self._coefficients = tuple(complex(coefficient) for coefficient in coefficients)
+        self._derivative = tuple(coefficient * (len(coefficients) - 1 - power) for power, coefficient in enumerate(self._coefficients[:-1]))
+        roots = np.roots(self._coefficients).astype(np.complex128)
+        for _ in range(4): # polish eigenvalue roots, unless the derivative vanishes (multiple roots)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                polished = _newton_step(roots, self._coefficients, self._derivative)
+            roots = np.where(np.isfinite(polished), polished, roots)
+        self._roots = roots
+
+    @property
+    def roots(self) -> np.ndarray[np.complex128]:
+        """Roots of the polynomial p."""
+        return self._roots.copy()
+
+    @property
+    def max_iterations(self) -> int:
+        """Maximum number of iterations for considering sequence as not convergent.
+        Must be positive non zero."""
+        return self._max_iterations
+    @max_iterations.setter
+    def max_iterations(self, max_iterations: int) -> None:
+        if not isinstance(max_iterations, int): raise TypeError("Attribute 'max_iterations' must be int.")
+        if not (max_iterations > 0): raise ValueError("Attribute 'max_iterations' must be positive non zero.")
+        self._max_iterations = max_iterations
+
+    @property
+    def tolerance(self) -> float:
+        """Distance to a root under which a point is considered converged. Must be positive non zero."""
+        return self._tolerance
+    @tolerance.setter
+    def tolerance(self, tolerance: float) -> None:
+        if not isinstance(tolerance, float | int): raise TypeError("Attribute 'tolerance' must be float.")
+        if not (tolerance > 0): raise ValueError("Attribute 'tolerance' must be positive non zero.")
+        self._tolerance = tolerance
+
+    def _converge(self, z_0: complex) -> tuple[int, int]:
+        """Root index and convergence count of one z_0 (scalar loop)."""
+        if not isinstance(z_0, complex | float | int): raise TypeError("Given z_0 must be a complex number.")
+        z = complex(z_0)
+        for iteration in range(self.max_iterations):
+            try:
+                z = _newton_step(z, self._coefficients, self._derivative)
+            except ZeroDivisionError: # null derivative
+                return -1, self.max_iterations
+            for root_index, root in enumerate(self._roots.tolist()):
+                if abs(z - root) < self.tolerance:
+                    return root_index, iteration
+            if not (abs(z) < float('inf')): return -1, self.max_iterations # nan or infinite
+        return -1, self.max_iterations
+
+    def _band(self, indices, counts):
+        """Stabilities of given root indices and convergence counts."""
+        return np.where(indices >= 0, (indices + 1 - counts / self.max_iterations) / len(self._roots), 0.0)
+
+    def stability(self, z_0: complex) -> float:
+        """Root band and convergence speed of given z_0.
+        
+        Parameters
+            z_0: starting point of Newton's method.
+        Return
+            (k + 1 - n / max_iterations) / N for root k of N reached after n iterations, 0 if no root is reached.
+        """
+        return float(self._band(*self._converge(z_0)))
+
+    def escape_count(self, z_0: complex) -> int:
+        """Number of iterations before converging to a root.
+        
+        Parameters
+            z_0: starting point of Newton's method.
+        Return
+            Number of iterations before converging between 0 and self.max_iterations (no convergence).
+        """
+        return self._converge(z_0)[1]
+
+    def root_index(self, z_0: complex) -> int:
+        """Index in roots of the root reached from given z_0, -1 if no root is reached."""
+        return self._converge(z_0)[0]
+
+    def convergence(self, z_0: np.ndarray, cancel = None) -> tuple[np.ndarray[np.int64], np.ndarray[np.int64]]:
+        """Vectorized root_index() and escape_count() for each z_0 of an array.
+        
+        Parameters
+            z_0: array of starting points.
+            cancel: optional threading.Event, RenderCancelled is raised as soon as it is set.
+        Return
+            Root indices (-1: no root reached) and convergence counts, with the shape of z_0.
+        """
+        return _newton_convergence(z_0, self._coefficients, self._roots, self.tolerance, self.max_iterations, cancel)
+
+    def stabilities(self, z_0: np.ndarray, cancel = None) -> np.ndarray[np.float64]:
+        """Vectorized stability(): root band and convergence speed for each z_0 of an array."""
+        return self._band(*self.convergence(z_0, cancel))
+
+    def escape_counts(self, z_0: np.ndarray, cancel = None) -> np.ndarray[np.int64]:
+        """Vectorized escape_count(): number of iterations before converging for each z_0 of an array."""
+        return self.convergence(z_0, cancel)[1]
+
     def __str__(self) -> str:
-        return f'Mandelbrot_maxIt{self.max_iterations}'
\ No newline at end of file
+        return f'Newton_p{list(self.coefficients)}_maxIt{self.max_iterations}'
@@ -0,0 +1,158 @@
+"""display module. Shows rendered images on a matplotlib axes.
+
+matplotlib is imported by the first ImageDisplay, so that importing this module
+(fit_resolution() included) stays as light as the compute modules.
+
+Classes
+    ImageDisplay
+Functions
+    fit_resolution(tuple[float, float], float, int): tuple[int, int]
+"""
+
+import numpy as np # np arrays
+
+
+def fit_resolution(pixels: tuple[float, float], aspect: float, detail: int = 1) -> tuple[int, int]:
+    """Largest image resolution of given aspect ratio fitting in an area of the screen.
+
+    Parameters
+        pixels: width and height of the area in screen pixels (a matplotlib bbox already
+            includes the figure DPI and the device pixel ratio of HiDPI screens).
+        aspect: width / height of the image.
+        detail: level of detail, size in screen pixels of one image pixel (1: full detail).
+    Return
+        (width, height) of the image in pixels, at least 1 x 1.
+    """
+    if not isinstance(detail, int): raise TypeError("Given detail must be int.")
+    if not (detail > 0): raise ValueError("Given detail must be positive non zero.")
+    if not (aspect > 0): raise ValueError("Given aspect must be positive non zero.")
+    width = min(pixels[0], pixels[1] * aspect)
+    return (max(1, int(width / detail)), max(1, int(width / aspect / detail)))
+
+class ImageDisplay:
+    """ImageDisplay class.
+
+    Shows successive images on the same axes with a single image artist.
+    Calling imshow() for every image stacks artists on the axes: memory grows and every
+    draw of the canvas renders all previous images again, so redraws get slower along a session.
+    Here the artist is created by the first show() and then updated in place (set_data(),
+    set_extent()). When the extent and the shape of the image do not change (new colormap,
+    new number of iterations...), only the image is redrawn and blitted, without drawing
+    the axes, ticks and labels again.
+    The artist is animated: full draws of the canvas (including the ones triggered by window
+    resizes) save the axes without the image as background, then draw the image over it.
+    Overlays added to the axes (patches, lines, texts) are drawn again over the image.
+
+    Attributes
+        plot: matplotlib.axes.Axes
+            Axes showing the images (read-only).
+        canvas: matplotlib.backend_bases.FigureCanvasBase
+            Canvas of the figure of plot (read-only).
+        artist: matplotlib.image.AxesImage | None
+            Image artist, None before the first show() (read-only).
+        blits: int
+            Number of show() calls that only blitted the image (read-only).
+    Methods
+        show(np.ndarray, list[float]): None
+            Shows an image over given extent.
+        preview(list[float]): None
+            Moves the axes to a new view, the current image being transformed accordingly.
+        pixel_size(): tuple[float, float]
+            Size of the axes on screen in pixels.
+    """
+    def __init__(self, plot: 'matplotlib.axes.Axes', canvas: 'matplotlib.backend_bases.FigureCanvasBase'):
+        from matplotlib.axes import Axes
+        from matplotlib.backend_bases import FigureCanvasBase
+        if not isinstance(plot, Axes): raise TypeError("Given plot must be a matplotlib Axes.")
+        if not isinstance(canvas, FigureCanvasBase): raise TypeError("Given canvas must be a matplotlib canvas.")
+        self._plot = plot
+        self._canvas = canvas
+        self._artist = None
+        self._layout = None # extent and shape of the last full draw
+        self._background = None # axes without the image, saved by the last full draw
+        self._blits = 0
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    @property
+    def plot(self) -> 'matplotlib.axes.Axes':
+        """Axes showing the images."""
+        return self._plot
+
+    @property
+    def canvas(self) -> 'matplotlib.backend_bases.FigureCanvasBase':
+        """Canvas of the figure of plot."""
+        return self._canvas
+
+    @property
+    def artist(self):
+        """Image artist (matplotlib.image.AxesImage), None before the first show()."""
+        return self._artist
+
+    @property
+    def blits(self) -> int:
+        """Number of show() calls that only blitted the image."""
+        return self._blits
+
+    def show(self, image: np.ndarray, extent: list[float]) -> None:
+        """Shows an image over given extent, reusing the image artist.
+
+        Parameters
+            image: grey scale or RGB(A) image, first row on top.
+            extent: [xmin, xmax, ymin, ymax] of the image in data coordinates.
+        """
+        extent = [float(value) for value in extent]
+        if not (len(extent) == 4): raise ValueError("Given extent must be [xmin, xmax, ymin, ymax].")
+        layout = (tuple(extent), np.shape(image))
+        if self._artist is None:
+            self._artist = self._plot.imshow(image, extent = extent, animated = True)
+        else:
+            self._artist.set_data(image)
+        if layout != self._layout:
+            self._artist.set_extent(extent)
+            # fixed limits (no autoscale): overlays and previews must not move the axes
+            self._plot.set_xlim(extent[0], extent[1])
+            self._plot.set_ylim(extent[2], extent[3])
+        if layout == self._layout and self._background is not None:
+            # axes, ticks and labels did not change: draw the image only
+            self._canvas.restore_region(self._background)
+            self._draw_image()
+            self._canvas.blit(self._plot.bbox)
+            self._blits += 1
+        else:
+            self._canvas.draw()
+            self._layout = layout
+
+    def preview(self, extent: list[float]) -> None:
+        """Moves the axes to a new view, the current image being transformed accordingly.
+
+        The image keeps its extent, so it appears panned and scaled as the new view requires,
+        until show() brings the image rendered for that view. The draw is deferred to the
+        event loop (draw_idle()), so that a burst of previews costs one draw.
+
+        Parameters
+            extent: [xmin, xmax, ymin, ymax] of the new view in data coordinates.
+        """
+        extent = [float(value) for value in extent]
+        if not (len(extent) == 4): raise ValueError("Given extent must be [xmin, xmax, ymin, ymax].")
+        self._plot.set_xlim(extent[0], extent[1])
+        self._plot.set_ylim(extent[2], extent[3])
+        self._layout = None # axes moved: next show() draws everything
+        self._canvas.draw_idle()
+
+    def pixel_size(self) -> tuple[float, float]:
+        """Width and height of the axes on screen in pixels."""
+        bbox = self._plot.get_window_extent()
+        return (bbox.width, bbox.height)
+
+    def _on_draw(self, event) -> None:
+        """Saves the background drawn by a full draw of the canvas, then draws the image over it."""
+        if self._artist is None: return
+        self._background = self._canvas.copy_from_bbox(self._plot.bbox) if self._canvas.supports_blit else None
+        self._draw_image()
+
+    def _draw_image(self) -> None:
+        """Draws the image, then the overlays of the axes over it."""
+        self._plot.draw_artist(self._artist)
+        for overlay in (*self._plot.patches, *self._plot.lines, *self._plot.texts):
+            if overlay.get_visible() and not overlay.get_animated():
+                self._plot.draw_artist(overlay)
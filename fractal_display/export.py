@@ -0,0 +1,218 @@
+"""export module. Writes images of viewports to files without blocking the interface.
+
+Images are encoded from 8-bit RGB pixels (Viewport.img_rgb8()), by a background worker.
+PNG files embed the render parameters (fractal, view, resolution, colormap...) as a text
+chunk, so that read_parameters() and viewport_from_parameters() give back the exact view.
+
+Classes
+    ExportReport
+    Exporter
+Functions
+    viewport_parameters(viewport.Viewport): dict
+    viewport_from_parameters(dict): viewport.Viewport
+    encode_png(np.ndarray, dict): bytes
+    read_parameters(str): dict
+"""
+
+import concurrent.futures
+import copy
+import inspect
+import io
+import json
+import os
+import threading
+import time
+import numpy as np # np arrays
+from PIL import Image, PngImagePlugin # matplotlib dependency
+from . import complex_fractal as cplxf
+from .viewport import Viewport
+
+
+METADATA_KEY = 'fractal_display' # PNG text chunk holding the render parameters (JSON)
+COMPRESS_LEVEL = 3 # zlib level of PNG files: faster than the default (6) for nearly the same size
+
+def _encode(value):
+    """JSON compatible value: complex numbers become {'complex': [real, imag]}."""
+    if isinstance(value, complex): return {'complex': [value.real, value.imag]}
+    if isinstance(value, tuple | list): return [_encode(item) for item in value]
+    return value
+
+def _decode(value):
+    """Inverse of _encode(), lists becoming tuples."""
+    if isinstance(value, dict) and 'complex' in value: return complex(*value['complex'])
+    if isinstance(value, list): return tuple(_decode(item) for item in value)
+    return value
+
+def viewport_parameters(viewport: Viewport) -> dict:
+    """Parameters reproducing the images of a viewport (JSON compatible).
+
+    The fractal is described by its class and the arguments of its constructor.
+    With automatic iterations, max_iterations is the one chosen by the last render
+    (Viewport.resolved_max_iterations), so the parameters taken after a render reproduce
+    that render with auto_iterations 'off'.
+    """
+    fractal = viewport.fractal
+    if viewport.auto_iterations != 'off' and viewport.resolved_max_iterations is not None:
+        fractal = copy.copy(fractal)
+        fractal.max_iterations = viewport.resolved_max_iterations
+    arguments = [name for name in inspect.signature(type(fractal).__init__).parameters if name != 'self']
+    return {
+        'fractal': {'class': type(fractal).__name__, **{name: _encode(getattr(fractal, name)) for name in arguments}},
+        'size': list(viewport.size),
+        'resolution': list(viewport.resolution),
+        'offset': list(viewport.offset),
+        'zoom': viewport.zoom,
+        'colormap': viewport.colormap,
+        'antialiasing': viewport.antialiasing,
+        'exterior_distance': viewport.exterior_distance,
+        'coloring': viewport.coloring,
+    }
+
+def viewport_from_parameters(parameters: dict) -> Viewport:
+    """Viewport described by viewport_parameters() (or read_parameters())."""
+    arguments = dict(parameters['fractal'])
+    fractal_class = getattr(cplxf, arguments.pop('class'), None)
+    if not (isinstance(fractal_class, type) and issubclass(fractal_class, cplxf.Fractal)): raise ValueError("Unknown fractal class.")
+    return Viewport(
+        fractal = fractal_class(**{name: _decode(value) for name, value in arguments.items()}),
+        size = tuple(parameters['size']),
+        resolution = tuple(parameters['resolution']),
+        offset = tuple(parameters['offset']),
+        zoom = parameters['zoom'],
+        colormap = parameters['colormap'],
+        antialiasing = parameters['antialiasing'],
+        exterior_distance = parameters['exterior_distance'],
+        coloring = parameters.get('coloring', 'linear') # files written before histogram coloring
+    )
+
+def _rgb8(image: np.ndarray) -> np.ndarray[np.uint8]:
+    """8-bit image from an 8-bit or a normalized floating point image."""
+    image = np.asarray(image)
+    if image.dtype == np.uint8: return image
+    return np.rint(np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+
+def encode_png(image: np.ndarray, parameters: dict | None = None) -> bytes:
+    """PNG file of an image.
+
+    Parameters
+        image: 8-bit (or normalized floating point) grey scale or RGB image.
+        parameters: render parameters embedded in the file (see viewport_parameters()).
+    Return
+        Bytes of the PNG file.
+    """
+    info = PngImagePlugin.PngInfo()
+    info.add_text('Software', 'fractal_display')
+    if parameters is not None:
+        info.add_text(METADATA_KEY, json.dumps(parameters))
+    buffer = io.BytesIO()
+    Image.fromarray(_rgb8(image)).save(buffer, format='PNG', pnginfo=info, compress_level=COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+def read_parameters(path: str) -> dict:
+    """Render parameters embedded in a PNG file written by an Exporter (ValueError if there are none)."""
+    with Image.open(path) as image:
+        text = image.text.get(METADATA_KEY) if hasattr(image, 'text') else None
+    if text is None: raise ValueError("File has no fractal_display parameters.")
+    return json.loads(text)
+
+
+class ExportReport:
+    """ExportReport class.
+
+    Measurements of one export.
+
+    Attributes
+        path: str
+            Written file.
+        resolution: tuple[int,int]
+            Pixel resolution of the image.
+        bytes: int
+            Size of the file.
+        render_time: float
+            Seconds spent rendering the image (0 if an image was given).
+        encode_time: float
+            Seconds spent encoding and writing the file.
+    Methods
+        summary(): str
+            One line human readable summary.
+    """
+    def __init__(self, path: str, resolution: tuple[int, int], bytes: int, render_time: float, encode_time: float):
+        self.path = path
+        self.resolution = resolution
+        self.bytes = bytes
+        self.render_time = render_time
+        self.encode_time = encode_time
+
+    def summary(self) -> str:
+        """One line human readable summary."""
+        return (f'{os.path.basename(self.path)}: {self.resolution[0]}x{self.resolution[1]}, {self.bytes / 2 ** 20:.2f} MB, '
+            f'render {1000 * self.render_time:.0f} ms, encode {1000 * self.encode_time:.0f} ms')
+
+    def __repr__(self) -> str:
+        return f'ExportReport({self.summary()})'
+
+
+class Exporter:
+    """Exporter class.
+
+    Renders and writes PNG files of viewports in a background worker, so that the caller
+    (the GUI event loop) is never blocked. Exports run one at a time, in call order.
+
+    Methods
+        export(viewport.Viewport, str, tuple[int,int] | None, np.ndarray | None, threading.Event | None): concurrent.futures.Future[ExportReport]
+            Schedules the export of a viewport to a PNG file.
+        shutdown(bool): None
+            Stops the worker.
+    """
+    def __init__(self, executor: concurrent.futures.Executor | None = None):
+        self._executor = executor if executor is not None else concurrent.futures.ThreadPoolExecutor(max_workers = 1, thread_name_prefix = 'fractal_export')
+
+    def export(self,
+            viewport: Viewport,
+            path: str,
+            resolution: tuple[int, int] | None = None,
+            image: np.ndarray | None = None,
+            cancel: threading.Event | None = None
+            ) -> concurrent.futures.Future:
+        """Schedules the export of a viewport to a PNG file.
+
+        The viewport is copied when called, so it can be modified while the export runs.
+
+        Parameters
+            viewport: view to export.
+            path: file to write (replaced atomically once encoded).
+            resolution: resolution of the exported image, if it differs from viewport.resolution.
+            image: image of the viewport already rendered (8-bit or normalized RGB), encoded
+                instead of rendering the viewport again.
+            cancel: optional event, the render stops with complex_fractal.RenderCancelled once it is set.
+        Return
+            Future of the ExportReport.
+        """
+        if not isinstance(viewport, Viewport): raise TypeError("Given viewport must be a Viewport.")
+        if not isinstance(path, str): raise TypeError("Given path must be str.")
+        viewport = copy.deepcopy(viewport)
+        if resolution is not None:
+            if image is not None: raise ValueError("An image cannot be exported at another resolution.")
+            viewport.resolution = resolution
+        if image is not None and not (np.shape(image)[:2] == (viewport.resolution[1], viewport.resolution[0])):
+            raise ValueError("Given image must have the resolution of the viewport.")
+        return self._executor.submit(self._export, viewport, path, image, cancel)
+
+    @staticmethod
+    def _export(viewport: Viewport, path: str, image: np.ndarray | None, cancel: threading.Event | None) -> ExportReport:
+        render_time = 0.0
+        if image is None:
+            start = time.perf_counter()
+            image = viewport.img_rgb8(cancel)
+            render_time = time.perf_counter() - start
+        start = time.perf_counter()
+        data = encode_png(image, viewport_parameters(viewport)) # after rendering: automatic iterations are resolved
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+        return ExportReport(path, viewport.resolution, len(data), render_time, time.perf_counter() - start)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the worker, after the scheduled exports if wait is True."""
+        self._executor.shutdown(wait = wait)
@@ -4,12 +4,17 @@ Classes
     GUI
 """
 
+import copy
+import time
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure 
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from .viewport import Viewport
+import numpy as np # np arrays
+from .viewport import Viewport, cache_colormap_names
+from .display import ImageDisplay, fit_resolution
+from .scheduler import RenderScheduler
+from .tiles import TileScheduler
+from .store import RenderStore
+from . import export
 from . import complex_fractal as cplxf
 
 
@@ -20,7 +25,25 @@ class GUI(tk.Tk):
     
     Objects declared as attributes (name preceded by 'self.') are used as global variables:
     they are both declared in constructor and used inside methods.
+    
+    Mouse navigation on the image: left button drag pans, wheel zooms around the cursor and
+    right button drag zooms into the drawn box. The current image is moved at once as a preview,
+    while renders run in background through a RenderScheduler, which debounces bursts of
+    mouse events into one render of the final view.
+    
+    With 'fit' checked, the image is rendered at the size of the canvas on screen instead of
+    the chosen resolution, which is then only used by saved images. While the user interacts,
+    views are first rendered at a reduced level of detail, then refined once input stops.
+    
+    Images are rendered by tiles (TileScheduler), starting from the tile under the cursor (or
+    the center of the image) and following the cursor while it moves. Finished tiles of a view
+    already displayed are pasted over the current image as they arrive.
     """
+    ZOOM_STEP = 1.25 # zoom factor of one wheel step
+    MIN_ZOOM = 0.5
+    INTERACTION_DETAIL = 4 # screen pixels per image pixel side of renders during interaction
+    REFINE_DELAY = 300 # milliseconds without input before rendering at full detail
+
     def __init__(self):
         super().__init__()
         # Window grid configuration
@@ -32,21 +55,38 @@ class GUI(tk.Tk):
         self.rowconfigure(5, weight=1)
         self.rowconfigure(6, weight=1)
         self.rowconfigure(7, weight=1)
+        self.rowconfigure(8, weight=0)
         self.columnconfigure(0, weight=5)
         self.columnconfigure(1, weight=1)
         
         self.fractal = cplxf.MandelbrotSet()
-        self.viewport = Viewport()
+        self.viewport = Viewport(store = RenderStore()) # renders taking more than a second are kept across sessions
         self.image = [] # image of fractal
+        self.rendered = None # viewport of the displayed image
+        self.tiles = None # (viewport, tile scheduler) of the latest render, following the cursor
+        self.cursor = None # position of the cursor over the image in data coordinates
+        self.streaming = None # (viewport, image) of the render whose tiles are being pasted
+        self.exporter = export.Exporter() # saves images in background
         
         ### IMAGE [0-7,0] ######################################################################
         frame_image = tk.Frame(self, bg='white')
         frame_image.grid(row=0, column=0, rowspan=8, sticky=tk.NSEW)
         
-        # figure that will contain the plot 
+        # figure that will contain the plot (matplotlib is imported with the window, not with the module)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         figure = Figure(figsize = (6, 6))
         self.plot = figure.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(figure, master=frame_image) 
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.display = ImageDisplay(self.plot, self.canvas) # one image artist, updated in place by each redraw
+        self.scheduler = RenderScheduler(self.after, self.after_cancel) # background renders, debounced
+        self.drag = None # state of the mouse drag in progress
+        self.canvas.mpl_connect('button_press_event', self.mousePress)
+        self.canvas.mpl_connect('motion_notify_event', self.mouseMove)
+        self.canvas.mpl_connect('button_release_event', self.mouseRelease)
+        self.canvas.mpl_connect('scroll_event', self.mouseScroll)
+        self.canvas.mpl_connect('resize_event', self.canvasResize)
         
         ### FRACTAL [0,1] #######################################################################
         frame_fractal = tk.Frame(self)
@@ -54,6 +94,7 @@ class GUI(tk.Tk):
         frame_fractal.rowconfigure(0, weight=1)
         frame_fractal.rowconfigure(1, weight=1)
         frame_fractal.rowconfigure(2, weight=1)
+        frame_fractal.rowconfigure(3, weight=1)
         frame_fractal.columnconfigure(0, weight=1)
         frame_fractal.columnconfigure(1, weight=1)
         
@@ -65,6 +106,8 @@ class GUI(tk.Tk):
         frame_fractal_c.grid(row=1, column=0, columnspan=2, sticky=tk.NSEW)
         frame_fractal_maxIt = tk.Frame(frame_fractal)
         frame_fractal_maxIt.grid(row=2, column=0, columnspan=2, sticky=tk.NSEW)
+        frame_fractal_degree = tk.Frame(frame_fractal)
+        frame_fractal_degree.grid(row=3, column=0, columnspan=2, sticky=tk.NSEW)
         
         button_mandelbrot = tk.Button(frame_fractal_mandelbrot, text='Mandelbrot', command=self.mandelbrot)
         button_mandelbrot.pack(fill=tk.X, expand=True)
@@ -78,10 +121,21 @@ class GUI(tk.Tk):
         label_maxIt = tk.Label(frame_fractal_maxIt, text='Max iterations')
         label_maxIt.pack(side=tk.LEFT)
         
+        self.boolvar_autoIt = tk.BooleanVar(value=False)
+        checkbutton_autoIt = tk.Checkbutton(frame_fractal_maxIt, text='auto', variable=self.boolvar_autoIt)
+        checkbutton_autoIt.pack(side=tk.RIGHT)
+        
         self.entry_maxIt = tk.Entry(frame_fractal_maxIt)
         self.entry_maxIt.insert(0, '30') # max iterations default value
         self.entry_maxIt.pack(side=tk.RIGHT)
         
+        label_degree = tk.Label(frame_fractal_degree, text='Degree')
+        label_degree.pack(side=tk.LEFT)
+        
+        self.entry_degree = tk.Entry(frame_fractal_degree) # 2: Mandelbrot/Julia, more: Multibrot/Multi-Julia
+        self.entry_degree.insert(0, '2') # degree default value
+        self.entry_degree.pack(side=tk.RIGHT)
+        
         ### RESOLUTION [1,1] ##########################################################################
         frame_resolution = tk.Frame(self)
         frame_resolution.grid(row=1, column=1, sticky=tk.NSEW)
@@ -104,6 +158,10 @@ class GUI(tk.Tk):
         
         label_resolution = tk.Label(frame_resolution_left, text='Resolution')
         label_resolution.pack(side=tk.LEFT)
+        
+        self.boolvar_fit = tk.BooleanVar(value=True) # render at canvas size, resolution only for saved images
+        checkbutton_fit = tk.Checkbutton(frame_resolution_left, text='fit', variable=self.boolvar_fit)
+        checkbutton_fit.pack(side=tk.LEFT)
         label_resolution_value = tk.Label(frame_resolution_center, textvariable=self.strvar_resolution)
         label_resolution_value.pack(expand=True)
         
@@ -120,11 +178,15 @@ class GUI(tk.Tk):
         label_color = tk.Label(frame_color, text='Colormap')
         label_color.pack(side=tk.LEFT)
         
-        const_colormaps = plt.colormaps()
+        const_colormaps = cache_colormap_names() # matplotlib is loaded: names cached for headless processes
         self.combobox_color = ttk.Combobox(frame_color, text='Colormap', values=const_colormaps)
         self.combobox_color.current(0) # combobox default value
         self.combobox_color.pack(side=tk.RIGHT)     
 
+        self.boolvar_equalize = tk.BooleanVar(value=False) # histogram coloring: contrast independent of max iterations
+        checkbutton_equalize = tk.Checkbutton(frame_color, text='equalize', variable=self.boolvar_equalize)
+        checkbutton_equalize.pack(side=tk.RIGHT)
+
         ### ZOOM [3,1] ##########################################################################
         frame_zoom = tk.Frame(self)
         frame_zoom.grid(row=3, column=1, sticky=tk.NSEW)
@@ -214,6 +276,18 @@ class GUI(tk.Tk):
         
         button_quit = tk.Button(frame_quit, text='QUIT', width=12, command=self.destroy)
         button_quit.pack(expand=True)
+        
+        ### STATUS BAR [8,0-1] #####################################################################
+        frame_status = tk.Frame(self, relief=tk.SUNKEN, borderwidth=1)
+        frame_status.grid(row=8, column=0, columnspan=2, sticky=tk.EW)
+        
+        self.boolvar_profile = tk.BooleanVar(value=False)
+        checkbutton_profile = tk.Checkbutton(frame_status, text='Profile next render', variable=self.boolvar_profile)
+        checkbutton_profile.pack(side=tk.RIGHT)
+        
+        self.strvar_status = tk.StringVar()
+        label_status = tk.Label(frame_status, textvariable=self.strvar_status, anchor=tk.W)
+        label_status.pack(side=tk.LEFT, fill=tk.X, expand=True)
  
     def mandelbrot(self):
         self.label_c.pack_forget()
@@ -257,33 +331,160 @@ class GUI(tk.Tk):
     
     def apply(self):
         try:
-            self.viewport.fractal = self.fractal
-            if isinstance(self.fractal, cplxf.JuliaSet):
-                self.viewport.fractal.c = complex(self.entry_c.get())
-            self.viewport.fractal.max_iterations = int(self.entry_maxIt.get())
-            self.viewport.resolution = self.var_resolution
-            self.viewport.offset = (float(self.entry_offsetX.get()), float(self.entry_offsetY.get()))
-            self.viewport.zoom = max(float(self.entry_zoom.get()), 0.5)
-            self.viewport.colormap = self.combobox_color.get()
-            self.plotViewport()
+            self.updateViewport()
         except Exception as error:
             self.showError(error)
+            return
+        self.scheduleRender(delay = 0)
+
+    def updateViewport(self):
+        degree = int(self.entry_degree.get())
+        if isinstance(self.fractal, cplxf.JuliaSet | cplxf.MultiJuliaSet):
+            self.fractal = cplxf.JuliaSet() if degree == 2 else cplxf.MultiJuliaSet(degree = degree)
+            self.fractal.c = complex(self.entry_c.get())
+        else:
+            self.fractal = cplxf.MandelbrotSet() if degree == 2 else cplxf.MultibrotSet(degree = degree)
+        self.viewport.fractal = self.fractal
+        self.viewport.fractal.max_iterations = int(self.entry_maxIt.get())
+        self.viewport.resolution = self.var_resolution
+        self.viewport.offset = (float(self.entry_offsetX.get()), float(self.entry_offsetY.get()))
+        self.viewport.zoom = max(float(self.entry_zoom.get()), self.MIN_ZOOM)
+        self.viewport.colormap = self.combobox_color.get()
+        self.viewport.coloring = 'histogram' if self.boolvar_equalize.get() else 'linear'
+        self.viewport.auto_iterations = 'probe' if self.boolvar_autoIt.get() else 'off' # tiled renders do not refine
+        if self.boolvar_profile.get(): # cProfile statistics of this render only
+            self.viewport.profile = 'render_' + time.strftime('%Y%m%d_%H%M%S') + '.prof'
+            self.boolvar_profile.set(False)
+
+    def scheduleRender(self, delay = None, detail = 1):
+        """Schedules a render of the current view, at reduced level of detail if detail > 1."""
+        # the render works on copies: the view can change while it runs
+        viewport = copy.copy(self.viewport)
+        viewport.fractal = copy.copy(self.viewport.fractal)
+        self.viewport.profile = None # profile one render only
+        if self.boolvar_fit.get():
+            viewport.resolution = fit_resolution(self.display.pixel_size(), viewport.size[0] / viewport.size[1], detail)
+        elif detail > 1:
+            viewport.resolution = (max(1, viewport.resolution[0] // detail), max(1, viewport.resolution[1] // detail))
+        self.strvar_status.set('Rendering...')
+        tiles = TileScheduler(focus = self.tileFocus(viewport))
+        self.tiles = (viewport, tiles)
+        def job(cancel, report):
+            tiles.on_tile = lambda tile, colors: report((tile, colors)) # streamed to showTiles()
+            return viewport.img_rgb(cancel, tiles)
+        def done(image):
+            self.plotViewport(viewport, image)
+            if detail > 1: # refine once the user stops interacting (superseded by any new input)
+                self.scheduleRender(self.REFINE_DELAY)
+        self.scheduler.request(job, done, self.showError, delay, lambda reports: self.showTiles(viewport, reports))
+
+    def tileFocus(self, viewport):
+        """Pixel (x, y) of the image of viewport under the cursor, None (center) if the cursor is not over the image."""
+        if self.cursor is None: return None
+        xmin, xmax, ymin, ymax = self.viewExtent(viewport)
+        return ((self.cursor[0] - xmin) / (xmax - xmin) * viewport.resolution[0],
+            (ymax - self.cursor[1]) / (ymax - ymin) * viewport.resolution[1])
+
+    def showTiles(self, viewport, reports):
+        """Pastes finished tiles over the displayed image, if it shows the same view.
+        
+        The displayed image is first resampled to the resolution of the render (nearest pixel),
+        so that a refined render replaces the low detail one tile by tile. Tiles of another view
+        are not shown: the whole image is drawn once rendered.
+        """
+        extent = self.viewExtent(viewport)
+        if self.streaming is None or self.streaming[0] is not viewport:
+            if self.rendered is None or self.viewExtent(self.rendered) != extent: return
+            current = np.asarray(self.image)
+            rows = np.arange(viewport.resolution[1]) * current.shape[0] // viewport.resolution[1]
+            columns = np.arange(viewport.resolution[0]) * current.shape[1] // viewport.resolution[0]
+            self.streaming = (viewport, current[rows][:, columns])
+        image = self.streaming[1]
+        for tile, colors in reports:
+            image[tile.slices] = colors
+        self.display.show(image, extent)
+
+    def plotViewport(self, viewport, image):
+        self.streaming = None
+        profile = viewport.profile
+        self.image = image
+        self.rendered = viewport
+        stats = viewport.stats
+        with stats.stage('draw'):
+            self.drawImage(viewport)
+        status = stats.summary()
+        if profile is not None:
+            status += ' | profile saved to ' + profile
+        self.strvar_status.set(status)
+        if viewport.auto_iterations != 'off': # show the number of iterations chosen by the viewport
+            self.entry_maxIt.delete(0, tk.END)
+            self.entry_maxIt.insert(0, str(viewport.resolved_max_iterations))
+
+    def drawImage(self, viewport):
+        self.display.show(self.image, extent = self.viewExtent(viewport))
+
+    def viewExtent(self, viewport):
+        plane = viewport.plane()
+        return [plane.xmin, plane.xmax, plane.ymin, plane.ymax]
+
+    def setView(self, offset, zoom):
+        """Moves the viewport, previews the new view with the current image and schedules its render."""
+        zoom = max(zoom, self.MIN_ZOOM)
+        self.viewport.offset = offset
+        self.viewport.zoom = zoom
+        self.strvar_offsetX.set(str(offset[0]))
+        self.strvar_offsetY.set(str(offset[1]))
+        self.strvar_zoom.set(str(zoom))
+        self.display.preview(self.viewExtent(self.viewport))
+        self.scheduleRender(detail = self.INTERACTION_DETAIL)
+
+    def mousePress(self, event):
+        if self.display.artist is None or event.inaxes is not self.plot: return # nothing to navigate yet
+        if event.button == 1: # pan: data units per pixel are fixed at press, the axes moving along the drag
+            bbox = self.plot.bbox
+            scale = (self.viewport.size[0] / self.viewport.zoom / bbox.width, self.viewport.size[1] / self.viewport.zoom / bbox.height)
+            self.drag = ('pan', event.x, event.y, self.viewport.offset, scale)
+        elif event.button == 3: # box zoom
+            from matplotlib.patches import Rectangle # already loaded with the figure
+            box = Rectangle((event.xdata, event.ydata), 0, 0, fill=False, edgecolor='white', linestyle='--')
+            self.plot.add_patch(box)
+            self.drag = ('box', event.xdata, event.ydata, box)
+
+    def mouseMove(self, event):
+        self.cursor = (event.xdata, event.ydata) if event.inaxes is self.plot else None
+        if self.drag is None:
+            if self.tiles is not None and self.scheduler.busy: # queued tiles follow the cursor
+                self.tiles[1].focus = self.tileFocus(self.tiles[0])
+            return
+        if self.drag[0] == 'pan':
+            _, x, y, offset, scale = self.drag
+            self.setView((offset[0] - (event.x - x) * scale[0], offset[1] - (event.y - y) * scale[1]), self.viewport.zoom)
+        elif event.inaxes is self.plot:
+            _, x, y, box = self.drag
+            box.set_bounds(x, y, event.xdata - x, event.ydata - y)
+            self.canvas.draw_idle()
+
+    def mouseRelease(self, event):
+        if self.drag is None: return
+        drag, self.drag = self.drag, None
+        if drag[0] != 'box': return
+        _, x, y, box = drag
+        box.remove()
+        width, height = abs(box.get_width()), abs(box.get_height())
+        if width == 0 or height == 0: # simple click
+            self.canvas.draw_idle()
+            return
+        zoom = min(self.viewport.size[0] / width, self.viewport.size[1] / height) # whole box in view
+        self.setView((x + box.get_width() / 2, y + box.get_height() / 2), zoom)
+
+    def mouseScroll(self, event):
+        if self.display.artist is None or event.inaxes is not self.plot or self.drag is not None: return
+        # zoom around the cursor: the point under it stays in place
+        zoom = max(self.viewport.zoom * self.ZOOM_STEP ** event.step, self.MIN_ZOOM)
+        ratio = self.viewport.zoom / zoom
+        offset = self.viewport.offset
+        self.setView((event.xdata + (offset[0] - event.xdata) * ratio, event.ydata + (offset[1] - event.ydata) * ratio), zoom)
 
-    def plotViewport(self):
-        self.image = self.viewport.img_rgb()
-        self.plot.imshow(
-            self.image,
-            cmap = self.viewport.colormap,
-            extent = [
-                self.viewport.offset[0] - (self.viewport.size[0] / 2) / self.viewport.zoom,
-                self.viewport.offset[0] + (self.viewport.size[0] / 2) / self.viewport.zoom,
-                self.viewport.offset[1] - (self.viewport.size[1] / 2) / self.viewport.zoom,
-                self.viewport.offset[1] + (self.viewport.size[1] / 2) / self.viewport.zoom
-            ]
-        )
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    
     def saveImage(self):
         fileName = (
             str(self.viewport.fractal) + '_' 
@@ -292,10 +493,37 @@ class GUI(tk.Tk):
             + '.png'
         )
         try:
-            plt.imsave(fileName, self.image, cmap=self.viewport.colormap)
+            # the displayed image is encoded if it shows this view at this resolution, otherwise the view is rendered again
+            image = None
+            if self.rendered is not None and export.viewport_parameters(self.rendered) == export.viewport_parameters(self.viewport):
+                image = self.image
+            future = self.exporter.export(self.viewport, fileName, image = image)
+        except Exception as error:
+            self.showError(error)
+            return
+        self.strvar_status.set('Saving ' + fileName + '...')
+        self.after(50, self.checkExport, future)
+
+    def checkExport(self, future):
+        if not future.done():
+            self.after(50, self.checkExport, future)
+            return
+        try:
+            report = future.result()
         except Exception as error:
             self.showError(error)
+            return
+        self.strvar_status.set('Saved ' + report.summary())
     
+    def canvasResize(self, event):
+        if self.boolvar_fit.get() and self.display.artist is not None:
+            self.scheduleRender() # debounced: one render once resizing stops
+
+    def destroy(self):
+        self.scheduler.cancel()
+        self.exporter.shutdown(wait = False) # exports in progress still complete before exit
+        super().destroy()
+
     def showError(self, error):
         tk.messagebox.showerror(
             title = 'Error',
@@ -0,0 +1,94 @@
+"""instrumentation module. Measures where render time goes.
+
+Classes
+    RenderStats
+"""
+
+import contextlib
+import time
+
+
+class RenderStats:
+    """RenderStats class.
+
+    Measurements of one render: wall time of each stage, number of pixels and
+    points computed, and number of orbit iterations (z -> z^2 + c steps).
+
+    Attributes
+        stages: dict[str,float]
+            Wall time (seconds) of each stage, in execution order
+            ('plane', 'auto_iterations', 'iterations', 'antialiasing', 'colorize', and 'draw' in the GUI).
+        pixels: int
+            Number of pixels of the image.
+        computed_points: int
+            Number of points iterated (skipped pixels excluded, supersamples included).
+        iterations: int | None
+            Total number of orbit iterations (None if the fractal has no max_iterations).
+        refined_pixels: int
+            Number of pixels supersampled by antialiasing.
+        skipped_pixels: int
+            Number of pixels filled without being iterated.
+        stored_pixels: int
+            Number of pixels read from a render store.
+        first_tile: float | None
+            Seconds from the start of a tiled render to its first finished tile (None: not tiled).
+        profile: pstats.Stats | None
+            cProfile statistics, if the render was profiled.
+    Methods
+        stage(str): context manager
+            Adds the wall time of the enclosed block to given stage.
+        total_time: float
+            Sum of stage times.
+        iterations_per_second: float | None
+            Orbit iterations per second of 'iterations' stage.
+        summary(): str
+            One line human readable summary.
+    """
+    def __init__(self, pixels: int = 0):
+        self.stages = {}
+        self.pixels = pixels
+        self.computed_points = 0
+        self.iterations = 0
+        self.refined_pixels = 0
+        self.skipped_pixels = 0
+        self.stored_pixels = 0
+        self.first_tile = None
+        self.profile = None
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Adds the wall time of the enclosed block to given stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total_time(self) -> float:
+        """Sum of stage times (seconds)."""
+        return sum(self.stages.values())
+
+    @property
+    def iterations_per_second(self) -> float | None:
+        """Orbit iterations per second of the stages computing points."""
+        elapsed = sum(self.stages.get(name, 0.0) for name in ('iterations', 'antialiasing'))
+        if self.iterations is None or not (elapsed > 0): return None
+        return self.iterations / elapsed
+
+    def summary(self) -> str:
+        """One line human readable summary."""
+        stages = ', '.join(f'{name} {1000 * elapsed:.0f} ms' for name, elapsed in self.stages.items())
+        text = f'{1000 * self.total_time:.0f} ms ({stages}) | {self.computed_points:,} points'
+        if self.iterations is not None:
+            text += f', {self.iterations:,} iterations'
+            if self.iterations_per_second is not None:
+                text += f' ({self.iterations_per_second / 1e6:.1f} M/s)'
+        if self.refined_pixels: text += f' | {self.refined_pixels:,} refined'
+        if self.skipped_pixels: text += f' | {self.skipped_pixels:,} skipped'
+        if self.stored_pixels: text += f' | {self.stored_pixels:,} from store'
+        if self.first_tile is not None: text += f' | first tile {1000 * self.first_tile:.0f} ms'
+        return text
+
+    def __repr__(self) -> str:
+        return f'RenderStats({self.summary()})'
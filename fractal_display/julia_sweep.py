@@ -0,0 +1,135 @@
+"""julia_sweep module. Renders Julia sets of many constants c at once.
+
+Rendering one JuliaSet per c pays NumPy call overheads once per iteration and per c,
+which dominates for small thumbnails. Here all constants share the same plane and are
+iterated together as a single c x y x x array, cut into chunks of constants so that
+the working arrays stay within a memory budget. Chunks are computed by a compute backend
+(see backends module), so that JIT compiled or multiprocess kernels can be used.
+
+Functions
+    julia_escape_counts(np.ndarray, complex_plane.Plane, int, int, str, threading.Event): np.ndarray[np.int64]
+    julia_stabilities(np.ndarray, complex_plane.Plane, int, int, str, threading.Event): np.ndarray[np.float64]
+    atlas(np.ndarray, int, int, float): np.ndarray
+    julia_map(complex_plane.Plane, complex_plane.Plane, int, int, int, str, threading.Event): np.ndarray[np.float64]
+"""
+
+import threading
+import numpy as np # np arrays
+from . import complex_plane as cplxp
+from . import backends
+
+
+# bytes, small enough for the working arrays of NumPy kernels to stay in CPU caches
+# (larger budgets only pay off for backends with a cost per call, like 'multiprocess')
+DEFAULT_MEMORY_BUDGET = 8 * 2 ** 20
+BYTES_PER_POINT = 160 # peak memory of the escape count kernel per iterated point (copies, temporaries and result)
+
+
+def julia_escape_counts(c_values: np.ndarray,
+        plane: cplxp.Plane,
+        max_iterations: int = 20,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        backend: str = 'numpy',
+        cancel: threading.Event | None = None
+        ) -> np.ndarray[np.int64]:
+    """Escape counts of the Julia sets of each c over the same plane.
+
+    Same result as JuliaSet(c, max_iterations).escape_counts(plane.toMatrix()) for each c.
+
+    Parameters
+        c_values: constants c, array of any shape.
+        plane: plane of z_0 shared by all Julia sets.
+        max_iterations: maximum number of iterations.
+        memory_budget: approximate peak memory (bytes) of the computation. At least one c is iterated at a time.
+        backend: name of the compute backend (see backends module), or 'auto'.
+        cancel: optional event, computation stops with complex_fractal.RenderCancelled once it is set.
+    Return
+        Array of ints of shape c_values.shape + (plane.ypoints, plane.xpoints).
+    """
+    if not isinstance(plane, cplxp.Plane): raise TypeError("Given plane must be a Plane.")
+    if not isinstance(max_iterations, int): raise TypeError("Given max_iterations must be int.")
+    if not (max_iterations > 0): raise ValueError("Given max_iterations must be positive non zero.")
+    if not isinstance(memory_budget, int): raise TypeError("Given memory_budget must be int.")
+    if not (memory_budget > 0): raise ValueError("Given memory_budget must be positive non zero.")
+    kernel = backends.get_backend(backend).quadratic_escape_counts
+    c_values = np.asarray(c_values, dtype=np.complex128)
+    z_0 = plane.toMatrix()
+    counts = np.empty(c_values.shape + z_0.shape, dtype=np.int64)
+    flat_c = c_values.ravel()
+    flat_counts = counts.reshape((flat_c.size,) + z_0.shape)
+    chunk = max(1, memory_budget // (z_0.size * BYTES_PER_POINT)) # number of c per chunk
+    for start in range(0, flat_c.size, chunk):
+        c = flat_c[start:start + chunk, np.newaxis, np.newaxis]
+        z = np.broadcast_to(z_0, (c.shape[0],) + z_0.shape)
+        flat_counts[start:start + chunk] = kernel(z, np.broadcast_to(c, z.shape), max_iterations, cancel)
+    return counts
+
+def julia_stabilities(c_values: np.ndarray,
+        plane: cplxp.Plane,
+        max_iterations: int = 20,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        backend: str = 'numpy',
+        cancel: threading.Event | None = None
+        ) -> np.ndarray[np.float64]:
+    """Stabilities (escape counts divided by max_iterations) of the Julia sets of each c, see julia_escape_counts()."""
+    return julia_escape_counts(c_values, plane, max_iterations, memory_budget, backend, cancel) / max_iterations
+
+def atlas(images: np.ndarray, columns: int | None = None, padding: int = 0, fill: float = 0.0) -> np.ndarray:
+    """Composites a grid of images into one image.
+
+    Parameters
+        images: either a grid of shape (rows, columns, height, width, ...) or, when columns is given,
+            a stack of shape (count, height, width, ...) laid out row by row. Trailing axes (color channels)
+            are kept.
+        columns: number of columns of a stack of images (None: images is already a grid).
+        padding: number of pixels between neighbouring images.
+        fill: value of padding pixels and of missing images at the end of the last row.
+    Return
+        Array of shape (rows * (height + padding) - padding, columns * (width + padding) - padding, ...).
+    """
+    if not isinstance(padding, int): raise TypeError("Given padding must be int.")
+    if not (padding >= 0): raise ValueError("Given padding must be positive.")
+    images = np.asarray(images)
+    if columns is not None:
+        if not isinstance(columns, int): raise TypeError("Given columns must be int.")
+        if not (columns > 0): raise ValueError("Given columns must be positive non zero.")
+        if not (images.ndim >= 3): raise ValueError("A stack of images must have at least 3 dimensions.")
+        rows = -(-images.shape[0] // columns)
+        missing = rows * columns - images.shape[0]
+        if missing:
+            images = np.concatenate((images, np.full((missing,) + images.shape[1:], fill, dtype=images.dtype)))
+        images = images.reshape((rows, columns) + images.shape[1:])
+    if not (images.ndim >= 4): raise ValueError("A grid of images must have at least 4 dimensions.")
+    rows, columns, height, width = images.shape[:4]
+    channels = images.shape[4:]
+    result = np.full((rows * (height + padding) - padding, columns * (width + padding) - padding) + channels, fill, dtype=images.dtype)
+    for row in range(rows):
+        for column in range(columns):
+            top, left = row * (height + padding), column * (width + padding)
+            result[top:top + height, left:left + width] = images[row, column]
+    return result
+
+def julia_map(c_plane: cplxp.Plane,
+        plane: cplxp.Plane,
+        max_iterations: int = 20,
+        padding: int = 1,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        backend: str = 'numpy',
+        cancel: threading.Event | None = None
+        ) -> np.ndarray[np.float64]:
+    """Atlas of Julia set thumbnails laid out over a grid of c values (Julia map of the Mandelbrot set).
+
+    Parameters
+        c_plane: plane of constants c, one thumbnail per point (top-left thumbnail: xmin + ymax*j).
+        plane: plane of z_0 of each thumbnail.
+        max_iterations: maximum number of iterations.
+        padding: number of pixels between thumbnails (filled with 0).
+        memory_budget: approximate peak memory (bytes) of the computation.
+        backend: name of the compute backend (see backends module), or 'auto'.
+        cancel: optional event, computation stops with complex_fractal.RenderCancelled once it is set.
+    Return
+        Grey scale image of stabilities (same convention as Viewport.img_grey()).
+    """
+    if not isinstance(c_plane, cplxp.Plane): raise TypeError("Given c_plane must be a Plane.")
+    stabilities = julia_stabilities(c_plane.toMatrix(), plane, max_iterations, memory_budget, backend, cancel)
+    return atlas(stabilities, padding = padding)
@@ -0,0 +1,170 @@
+"""scheduler module. Coalesces bursts of render requests from an event loop.
+
+Classes
+    RenderScheduler
+"""
+
+import concurrent.futures
+import queue
+import threading
+from collections.abc import Callable
+from . import complex_fractal as cplxf
+from . import viewport as vp
+
+
+class RenderScheduler:
+    """RenderScheduler class.
+
+    Runs render jobs in a background executor on behalf of an event loop (Tk), so that
+    the interface keeps responding while rendering, without ever piling up stale renders:
+    - each request restarts a debounce timer: a burst of requests (mouse drag, wheel)
+      starts one render only, delay milliseconds after the last one;
+    - only the latest request is kept: a request replaces the one waiting for the timer;
+    - at most one job runs at a time: a request cancels the running job (through its
+      cancel event) and waits for it to stop before starting;
+    - results of superseded jobs are dropped.
+    Jobs can stream partial results (finished tiles) to the event loop while they run.
+    All methods and callbacks run in the event loop thread; only jobs run in the executor.
+
+    Attributes
+        delay: int
+            Debounce delay in milliseconds.
+        poll_interval: int
+            Period in milliseconds at which the event loop checks for the end of the running job.
+        busy: bool
+            True while a request is waiting or running (read-only).
+    Methods
+        request(Callable[[threading.Event], object], Callable[[object], None], Callable[[Exception], None], int, Callable[[list], None]): None
+            Schedules a job, replacing any job not finished yet.
+        cancel(): None
+            Drops the waiting job and cancels the running one.
+    """
+    def __init__(self,
+            after: Callable[[int, Callable[[], None]], object],
+            after_cancel: Callable[[object], None],
+            delay: int = 150,
+            poll_interval: int = 15,
+            executor: concurrent.futures.Executor | None = None
+            ):
+        """Parameters
+            after: function calling a callback after a delay in milliseconds in the event loop,
+                returning a timer identifier (tkinter's widget.after).
+            after_cancel: function cancelling a timer from its identifier (tkinter's widget.after_cancel).
+            delay: debounce delay in milliseconds.
+            poll_interval: period in milliseconds of the checks for the end of the running job.
+            executor: executor running jobs (default: viewport.shared_executor()).
+        """
+        self._after = after
+        self._after_cancel = after_cancel
+        self.delay = delay
+        self.poll_interval = poll_interval
+        self._executor = executor
+        self._timer = None # debounce timer of the waiting request
+        self._waiting = None # (job, on_done, on_error, on_progress) of the latest request not started yet
+        self._running = None # (future, cancel event, on_done, on_error, on_progress, progress queue) of the running job
+        self._superseded = False # True once the running job has been replaced by a newer request
+
+    @property
+    def delay(self) -> int:
+        """Debounce delay in milliseconds. Must be positive."""
+        return self._delay
+    @delay.setter
+    def delay(self, delay: int) -> None:
+        if not isinstance(delay, int): raise TypeError("Attribute 'delay' must be int.")
+        if not (delay >= 0): raise ValueError("Attribute 'delay' must be positive.")
+        self._delay = delay
+
+    @property
+    def poll_interval(self) -> int:
+        """Period in milliseconds at which the end of the running job is checked. Must be positive non zero."""
+        return self._poll_interval
+    @poll_interval.setter
+    def poll_interval(self, poll_interval: int) -> None:
+        if not isinstance(poll_interval, int): raise TypeError("Attribute 'poll_interval' must be int.")
+        if not (poll_interval > 0): raise ValueError("Attribute 'poll_interval' must be positive non zero.")
+        self._poll_interval = poll_interval
+
+    @property
+    def busy(self) -> bool:
+        """True while a request is waiting or running."""
+        return self._waiting is not None or self._running is not None
+
+    def request(self,
+            job: Callable[[threading.Event], object],
+            on_done: Callable[[object], None],
+            on_error: Callable[[Exception], None] | None = None,
+            delay: int | None = None,
+            on_progress: Callable[[list], None] | None = None
+            ) -> None:
+        """Schedules a job, replacing any job not finished yet.
+
+        Parameters
+            job: function computing a result (called in the executor with a cancel event,
+                it should stop with complex_fractal.RenderCancelled once the event is set).
+            on_done: function called in the event loop with the result, unless the job was superseded.
+            on_error: function called in the event loop with exceptions raised by the job
+                (RenderCancelled excepted), unless the job was superseded.
+            delay: debounce delay of this request in milliseconds (default: self.delay).
+            on_progress: if given, the job is called with a second argument, a function reporting
+                partial results from the executor; on_progress is then called in the event loop
+                with the list of results reported since the last check, unless the job was superseded.
+        """
+        if not callable(job): raise TypeError("Given job must be callable.")
+        self._waiting = (job, on_done, on_error, on_progress)
+        if self._running is not None:
+            self._superseded = True
+            self._running[1].set()
+        if self._timer is not None:
+            self._after_cancel(self._timer)
+        self._timer = self._after(self.delay if delay is None else delay, self._start)
+
+    def cancel(self) -> None:
+        """Drops the waiting job and cancels the running one (its result will be dropped)."""
+        self._waiting = None
+        if self._timer is not None:
+            self._after_cancel(self._timer)
+            self._timer = None
+        if self._running is not None:
+            self._superseded = True
+            self._running[1].set()
+
+    def _start(self) -> None:
+        """Debounce timer callback: starts the waiting job, unless a job is still stopping."""
+        self._timer = None
+        if self._running is not None or self._waiting is None: return # _poll() starts it once the running job stopped
+        job, on_done, on_error, on_progress = self._waiting
+        self._waiting = None
+        cancel = threading.Event()
+        progress = queue.SimpleQueue()
+        executor = self._executor if self._executor is not None else vp.shared_executor()
+        future = executor.submit(job, cancel, progress.put) if on_progress is not None else executor.submit(job, cancel)
+        self._running = (future, cancel, on_done, on_error, on_progress, progress)
+        self._superseded = False
+        self._after(self.poll_interval, self._poll)
+
+    def _poll(self) -> None:
+        """Checks for the end of the running job, delivers its result and starts the waiting job."""
+        future, cancel, on_done, on_error, on_progress, progress = self._running
+        done = future.done() # before draining: partial results all come before the end of the job
+        if on_progress is not None and not self._superseded:
+            reports = []
+            while not progress.empty():
+                reports.append(progress.get())
+            if reports: on_progress(reports)
+        if not done:
+            self._after(self.poll_interval, self._poll)
+            return
+        self._running = None
+        superseded = self._superseded
+        if self._waiting is not None and self._timer is None: # debounce delay elapsed while the job was stopping
+            self._start()
+        if superseded: return
+        try:
+            result = future.result()
+        except cplxf.RenderCancelled:
+            return
+        except Exception as error:
+            if on_error is None: raise
+            on_error(error)
+            return
+        on_done(result)
@@ -0,0 +1,326 @@
+"""server module. Serves fractal renders and tiles over HTTP.
+
+The server is built on asyncio streams only (no third party web framework).
+Images are computed in a process pool so that the event loop keeps serving
+requests while renders are in progress. Identical requests that arrive while
+a render is in flight share that single computation, and finished images are
+kept in a LRU cache bounded in bytes.
+
+Endpoints
+    GET /render?fractal=&c=&max_iterations=&width=&height=&x=&y=&zoom=&colormap=
+        PNG image of the given view.
+    GET /tile/<level>/<x>/<y>.png?fractal=&c=&max_iterations=&tile_size=&colormap=
+        PNG tile of the square [-2,2]x[-2,2] world split into 2^level x 2^level tiles.
+    GET /stats
+        JSON counters (requests, renders, cache hits, coalesced requests).
+
+Classes
+    RenderServer
+Functions
+    spec_from_request(str, dict): tuple
+    render_png(tuple): bytes
+    main()
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import http
+import json
+import urllib.parse
+from .viewport import Viewport
+from . import complex_fractal as cplxf
+from . import export
+
+
+TILE_WORLD_SIZE = 4.0 # tiles cover the square [-2,2]x[-2,2]
+DEFAULT_TILE_SIZE = 256
+MAX_TILE_LEVEL = 48 # beyond that, float64 cannot tell neighbouring pixels apart
+MAX_PIXELS = 4096 * 4096 # refuse absurd requests instead of exhausting workers
+
+
+def _first(query: dict, name: str, default: str) -> str:
+    """First value of a parsed query string parameter, or default."""
+    return query.get(name, [default])[0]
+
+def _fractal_from_query(query: dict) -> cplxf.Fractal:
+    """Builds the fractal described by 'fractal', 'c' and 'max_iterations' parameters."""
+    name = _first(query, 'fractal', 'mandelbrot').lower()
+    max_iterations = int(_first(query, 'max_iterations', '20'))
+    if name == 'mandelbrot':
+        return cplxf.MandelbrotSet(max_iterations = max_iterations)
+    if name == 'julia':
+        return cplxf.JuliaSet(c = complex(_first(query, 'c', '-0.75')), max_iterations = max_iterations)
+    raise ValueError(f"Unknown fractal '{name}'.")
+
+def viewport_spec(viewport: Viewport) -> tuple:
+    """Hashable and picklable description of a viewport.
+
+    Two viewports with the same spec produce the same image, so the spec is used
+    both as cache key and as the message sent to worker processes.
+    """
+    fractal = viewport.fractal
+    if isinstance(fractal, cplxf.JuliaSet):
+        fractal_spec = ('julia', complex(fractal.c), fractal.max_iterations)
+    elif isinstance(fractal, cplxf.MandelbrotSet):
+        fractal_spec = ('mandelbrot', 0j, fractal.max_iterations)
+    else:
+        raise TypeError(f"Fractal '{fractal}' cannot be served.")
+    return (
+        fractal_spec,
+        tuple(float(value) for value in viewport.size),
+        tuple(viewport.resolution),
+        tuple(float(value) for value in viewport.offset),
+        float(viewport.zoom),
+        viewport.colormap
+    )
+
+def viewport_from_spec(spec: tuple) -> Viewport:
+    """Rebuilds the viewport described by viewport_spec()."""
+    (name, c, max_iterations), size, resolution, offset, zoom, colormap = spec
+    if name == 'julia':
+        fractal = cplxf.JuliaSet(c = c, max_iterations = max_iterations)
+    else:
+        fractal = cplxf.MandelbrotSet(max_iterations = max_iterations)
+    return Viewport(
+        fractal = fractal,
+        size = size,
+        resolution = resolution,
+        offset = offset,
+        zoom = zoom,
+        colormap = colormap
+    )
+
+def tile_viewport(fractal: cplxf.Fractal, level: int, x: int, y: int,
+        tile_size: int = DEFAULT_TILE_SIZE, colormap: str = 'binary') -> Viewport:
+    """Viewport of tile (x,y) at given level.
+
+    At level L the world square is split into 2^L x 2^L tiles.
+    Tile (0,0) is the top-left one, as in usual map tile schemes.
+    """
+    if not (0 <= level <= MAX_TILE_LEVEL): raise ValueError(f"Tile level must be between 0 and {MAX_TILE_LEVEL}.")
+    if not (0 <= x < 2 ** level and 0 <= y < 2 ** level): raise ValueError("Tile coordinates out of range.")
+    tile_width = TILE_WORLD_SIZE / 2 ** level
+    return Viewport(
+        fractal = fractal,
+        size = (TILE_WORLD_SIZE, TILE_WORLD_SIZE),
+        resolution = (tile_size, tile_size),
+        offset = (
+            -TILE_WORLD_SIZE / 2 + (x + 0.5) * tile_width,
+            TILE_WORLD_SIZE / 2 - (y + 0.5) * tile_width
+        ),
+        zoom = float(2 ** level),
+        colormap = colormap
+    )
+
+def spec_from_request(path: str, query: dict) -> tuple:
+    """Validates a request and returns the spec of the image to render.
+
+    Parameters
+        path: URL path ('/render' or '/tile/<level>/<x>/<y>.png').
+        query: parsed query string (urllib.parse.parse_qs()).
+    Return
+        Viewport spec (see viewport_spec()).
+    Raise
+        LookupError for unknown paths, TypeError/ValueError for invalid parameters.
+    """
+    fractal = _fractal_from_query(query)
+    colormap = _first(query, 'colormap', 'binary')
+    if path == '/render':
+        width = int(_first(query, 'width', '720'))
+        height = int(_first(query, 'height', '540'))
+        viewport = Viewport(
+            fractal = fractal,
+            size = (4.0, 4.0 * height / width) if width > 0 else (4.0, 3.0),
+            resolution = (width, height),
+            offset = (float(_first(query, 'x', '0')), float(_first(query, 'y', '0'))),
+            zoom = float(_first(query, 'zoom', '1')),
+            colormap = colormap
+        )
+    elif path.startswith('/tile/') and path.endswith('.png'):
+        parts = path[len('/tile/'):-len('.png')].split('/')
+        if not (len(parts) == 3): raise LookupError(path)
+        level, x, y = (int(part) for part in parts)
+        tile_size = int(_first(query, 'tile_size', str(DEFAULT_TILE_SIZE)))
+        viewport = tile_viewport(fractal, level, x, y, tile_size, colormap)
+    else:
+        raise LookupError(path)
+    if not (viewport.resolution[0] * viewport.resolution[1] <= MAX_PIXELS): raise ValueError("Requested image is too large.")
+    return viewport_spec(viewport)
+
+def render_png(spec: tuple) -> bytes:
+    """Renders given viewport spec as PNG bytes. Runs inside worker processes."""
+    viewport = viewport_from_spec(spec)
+    return export.encode_png(viewport.img_rgb8(), export.viewport_parameters(viewport))
+
+
+class RenderServer:
+    """RenderServer class.
+
+    Asyncio HTTP server rendering viewports in an executor, with coalescing of
+    identical in-flight requests and a LRU cache of encoded images.
+
+    Attributes
+        executor: concurrent.futures.Executor
+            Executor running render_png() (process pool by default).
+        cache_bytes: int
+            Maximum total size of cached images.
+        stats: dict[str,int]
+            Counters: requests, renders, cache_hits, coalesced, errors.
+    Methods
+        render(tuple): bytes
+            Encoded image of given spec, computed at most once while in flight.
+        start(str, int): asyncio.Server
+            Starts listening for HTTP connections.
+        close()
+            Stops the server and shuts the executor down.
+    """
+    def __init__(self, executor: concurrent.futures.Executor | None = None, cache_bytes: int = 64 * 2 ** 20):
+        self.executor = executor if executor is not None else concurrent.futures.ProcessPoolExecutor()
+        self.cache_bytes = cache_bytes
+        self.stats = collections.Counter(requests=0, renders=0, cache_hits=0, coalesced=0, errors=0)
+        self._cache = collections.OrderedDict() # spec -> bytes, least recently used first
+        self._cached_bytes = 0
+        self._inflight = {} # spec -> asyncio.Future
+        self._server = None
+
+    def _cache_get(self, spec: tuple) -> bytes | None:
+        data = self._cache.get(spec)
+        if data is not None:
+            self._cache.move_to_end(spec)
+        return data
+
+    def _cache_put(self, spec: tuple, data: bytes) -> None:
+        if len(data) > self.cache_bytes: return
+        self._cache[spec] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    async def render(self, spec: tuple) -> bytes:
+        """Encoded image of given spec.
+
+        Served from cache when possible. Otherwise, concurrent calls with the same
+        spec await one shared computation submitted to the executor.
+        """
+        data = self._cache_get(spec)
+        if data is not None:
+            self.stats['cache_hits'] += 1
+            return data
+        future = self._inflight.get(spec)
+        if future is not None:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['renders'] += 1
+            future = asyncio.get_running_loop().run_in_executor(self.executor, render_png, spec)
+            self._inflight[spec] = future
+            future.add_done_callback(lambda done: self._render_done(spec, done))
+        # shield: a client disconnecting must not cancel a render other clients wait for
+        return await asyncio.shield(future)
+
+    def _render_done(self, spec: tuple, future: asyncio.Future) -> None:
+        self._inflight.pop(spec, None)
+        if not future.cancelled() and future.exception() is None:
+            self._cache_put(spec, future.result())
+
+    async def _respond(self, path: str, query: dict) -> tuple[int, str, bytes]:
+        """Status, content type and body answering given request."""
+        if path == '/stats':
+            body = dict(self.stats, cached_images=len(self._cache), cached_bytes=self._cached_bytes, inflight=len(self._inflight))
+            return 200, 'application/json', json.dumps(body).encode()
+        try:
+            spec = spec_from_request(path, query)
+        except LookupError:
+            return 404, 'text/plain', b'Not found'
+        except (TypeError, ValueError) as error:
+            return 400, 'text/plain', str(error).encode()
+        return 200, 'image/png', await self.render(spec)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves HTTP/1.1 requests of one connection (keep-alive supported)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''): break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                self.stats['requests'] += 1
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    status, content_type, body = 400, 'text/plain', b'Malformed request line'
+                    method, target, version = 'GET', '/', 'HTTP/1.0'
+                else:
+                    if method not in ('GET', 'HEAD'):
+                        status, content_type, body = 405, 'text/plain', b'Method not allowed'
+                    else:
+                        url = urllib.parse.urlsplit(target)
+                        try:
+                            status, content_type, body = await self._respond(url.path, urllib.parse.parse_qs(url.query))
+                        except Exception as error:
+                            status, content_type, body = 500, 'text/plain', str(error).encode()
+                if status >= 400: self.stats['errors'] += 1
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close') \
+                    or headers.get('connection', '').lower() == 'keep-alive'
+                writer.write((
+                    f'HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n'
+                    f'Content-Type: {content_type}\r\n'
+                    f'Content-Length: {len(body)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+                ).encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8000) -> asyncio.Server:
+        """Starts listening for HTTP connections. Port 0 picks a free port."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        """Stops the server and shuts the executor down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(cancel_futures=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line entry point: python -m fractal_display.server"""
+    parser = argparse.ArgumentParser(description='Serve fractal renders and tiles over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None, help='number of render processes (default: number of CPUs)')
+    parser.add_argument('--cache-mb', type=float, default=64, help='size of the image cache in megabytes')
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = RenderServer(
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=args.workers),
+            cache_bytes = int(args.cache_mb * 2 ** 20)
+        )
+        listener = await server.start(args.host, args.port)
+        print(f'Serving fractals on http://{args.host}:{listener.sockets[0].getsockname()[1]}')
+        try:
+            await listener.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
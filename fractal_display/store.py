@@ -0,0 +1,311 @@
+"""store module. Persistent on-disk store of escape count renders.
+
+Escape counts are kept rather than colors, so that a stored render can be colorized
+again with any colormap, and can serve any number of iterations up to the stored one
+(counts lower than max_iterations do not depend on max_iterations).
+Each render is one file of zlib compressed bands of CHUNK_ROWS rows, described in a JSON
+index (fractal, bounds, resolution, max_iterations, offset and length of each band).
+Files are memory mapped when read, and only the bands covering the requested rows are
+decompressed: a view inside a stored render, or a downsample of it, reads a part of the file.
+
+Classes
+    RenderStore
+Functions
+    fractal_key(complex_fractal.Fractal): str
+    counts_dtype(int): np.dtype
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+import numpy as np # np arrays
+from . import complex_fractal as cplxf
+from . import complex_plane as cplxp
+from . import backends
+
+
+CHUNK_ROWS = 64 # rows per compressed band
+COMPRESSION_LEVEL = 1 # zlib level: escape counts compress well even at the fastest level
+GRID_TOLERANCE = 0.01 # pixels, distance between requested and stored pixel grids considered as a match
+INDEX_NAME = 'index.json'
+INDEX_WRITE_INTERVAL = 30.0 # seconds, minimum time between index writes only recording access times
+
+def fractal_key(fractal: cplxf.Fractal) -> str:
+    """Identity of a fractal regardless of its max_iterations (str(fractal) without its '_maxIt' suffix)."""
+    text = str(fractal)
+    suffix = f'_maxIt{fractal.max_iterations}'
+    return text[:-len(suffix)] if text.endswith(suffix) else text
+
+def counts_dtype(max_iterations: int) -> np.dtype:
+    """Smallest integer type holding escape counts up to max_iterations (uint16 below 65536 iterations)."""
+    return np.dtype(np.uint16 if max_iterations < 2 ** 16 else np.uint32 if max_iterations < 2 ** 32 else np.int64)
+
+
+class RenderStore:
+    """RenderStore class.
+
+    Stores escape count renders in a directory, and serves requests of the same fractal
+    over a plane whose pixels are pixels of a stored render: same view, sub-region, or
+    downsample by an integer factor.
+    When the store is full (max_bytes), least recently used renders are removed.
+    The index is reloaded when another process changed it, so several windows can share a store.
+    Access times of lookups are kept in memory, and written with the next save or removal,
+    or by a lookup once INDEX_WRITE_INTERVAL seconds passed since the index was last written.
+
+    Attributes
+        directory: str
+            Directory of the store (read-only).
+        max_bytes: int
+            Maximum size of stored files, in bytes.
+        min_seconds: float
+            Minimum computation time of the renders a Viewport saves in the store.
+    Methods
+        save(complex_fractal.Fractal, complex_plane.Plane, np.ndarray): str
+            Stores the escape counts of a render, returns its entry name.
+        lookup(complex_fractal.Fractal, complex_plane.Plane): np.ndarray[np.int64] | None
+            Escape counts of a request served from a stored render, None if none matches.
+        entries(): list[dict]
+            Index entries of stored renders.
+        clear(): None
+            Removes all stored renders.
+        __len__(): int
+            Number of stored renders.
+    """
+    def __init__(self, directory: str | None = None, max_bytes: int = 2 ** 30, min_seconds: float = 1.0):
+        if directory is None: directory = os.path.join(backends.cache_directory(), 'renders')
+        if not isinstance(directory, str): raise TypeError("Attribute 'directory' must be str.")
+        self._directory = directory
+        self.max_bytes = max_bytes
+        self.min_seconds = min_seconds
+        self._lock = threading.Lock()
+        self._index = {}
+        self._index_mtime = None
+        self._index_written = None # time.monotonic() of the last index write
+        self._accessed = {} # access times not written to the index yet, by entry name
+
+    @property
+    def directory(self) -> str:
+        """Directory of the store."""
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        """Maximum size of stored files in bytes. Must be positive non zero."""
+        return self._max_bytes
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int) -> None:
+        if not isinstance(max_bytes, int): raise TypeError("Attribute 'max_bytes' must be int.")
+        if not (max_bytes > 0): raise ValueError("Attribute 'max_bytes' must be positive non zero.")
+        self._max_bytes = max_bytes
+
+    @property
+    def min_seconds(self) -> float:
+        """Minimum computation time (seconds) of the renders a Viewport saves in the store. Must be positive."""
+        return self._min_seconds
+    @min_seconds.setter
+    def min_seconds(self, min_seconds: float) -> None:
+        if not isinstance(min_seconds, float | int): raise TypeError("Attribute 'min_seconds' must be float.")
+        if not (min_seconds >= 0): raise ValueError("Attribute 'min_seconds' must be positive.")
+        self._min_seconds = min_seconds
+
+    def save(self, fractal: cplxf.Fractal, plane: cplxp.Plane, counts: np.ndarray) -> str:
+        """Stores the escape counts of a render.
+
+        Stored renders of the same fractal and plane with fewer iterations are replaced.
+
+        Parameters
+            fractal: rendered fractal (its max_iterations included).
+            plane: rendered plane.
+            counts: escape counts, array of shape (plane.ypoints, plane.xpoints) as computed from plane.toMatrix().
+        Return
+            Name of the entry in the index.
+        """
+        if not isinstance(plane, cplxp.Plane): raise TypeError("Given plane must be a Plane.")
+        counts = np.asarray(counts)
+        if not (counts.shape == (plane.ypoints, plane.xpoints)): raise ValueError("Given counts must have the shape of the plane.")
+        max_iterations = fractal.max_iterations
+        dtype = counts_dtype(max_iterations)
+        entry = {
+            'fractal': fractal_key(fractal),
+            'max_iterations': max_iterations,
+            'bounds': [plane.xmin, plane.xmax, plane.ymin, plane.ymax],
+            'resolution': [plane.xpoints, plane.ypoints],
+            'complete': bool(np.all(counts < max_iterations)), # every point escaped: counts are exact for any max_iterations
+            'dtype': dtype.str,
+            'chunk_rows': CHUNK_ROWS,
+            'chunks': [],
+        }
+        name = hashlib.sha1(json.dumps(entry, sort_keys = True).encode()).hexdigest()[:20]
+        entry['file'] = name + '.bin'
+        os.makedirs(self.directory, exist_ok = True)
+        path = os.path.join(self.directory, entry['file'])
+        temporary = path + f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as file:
+            offset = 0
+            for row in range(0, plane.ypoints, CHUNK_ROWS):
+                data = zlib.compress(np.ascontiguousarray(counts[row:row + CHUNK_ROWS], dtype=dtype).tobytes(), COMPRESSION_LEVEL)
+                file.write(data)
+                entry['chunks'].append([offset, len(data)])
+                offset += len(data)
+        os.replace(temporary, path)
+        entry['bytes'] = offset
+        entry['accessed'] = time.time()
+        with self._lock:
+            self._read_index()
+            for other, stored in list(self._index.items()):
+                if (other != name and stored['fractal'] == entry['fractal'] and stored['bounds'] == entry['bounds']
+                        and stored['resolution'] == entry['resolution'] and stored['max_iterations'] <= max_iterations):
+                    self._remove(other)
+            self._index[name] = entry
+            self._evict(keep = name)
+            self._write_index()
+        return name
+
+    def lookup(self, fractal: cplxf.Fractal, plane: cplxp.Plane) -> np.ndarray[np.int64] | None:
+        """Escape counts of a request served from a stored render.
+
+        A stored render matches if it has the same fractal, enough iterations (or no point
+        that did not escape), and if every pixel of the requested plane is one of its pixels
+        (within GRID_TOLERANCE): same plane, sub-region, or downsample by integer factors.
+
+        Parameters
+            fractal: requested fractal.
+            plane: requested plane.
+        Return
+            Escape counts of shape (plane.ypoints, plane.xpoints), None if no stored render matches.
+        """
+        if not isinstance(plane, cplxp.Plane): raise TypeError("Given plane must be a Plane.")
+        key, max_iterations = fractal_key(fractal), fractal.max_iterations
+        with self._lock:
+            self._read_index()
+            for name, entry in self._index.items():
+                if entry['fractal'] != key: continue
+                if not (max_iterations <= entry['max_iterations'] or entry['complete']): continue
+                grid = self._grid(entry, plane)
+                if grid is None: continue
+                try:
+                    counts = self._read(entry, *grid)
+                except (OSError, ValueError, zlib.error): # file removed or damaged: forget it
+                    self._remove(name)
+                    self._write_index()
+                    return None
+                self._accessed[name] = entry['accessed'] = time.time()
+                if self._index_written is None or time.monotonic() - self._index_written >= INDEX_WRITE_INTERVAL:
+                    self._write_index()
+                return np.minimum(counts, max_iterations)
+        return None
+
+    def entries(self) -> list[dict]:
+        """Index entries of stored renders (fractal, max_iterations, bounds, resolution, bytes...)."""
+        with self._lock:
+            self._read_index()
+            return [dict(entry) for entry in self._index.values()]
+
+    def clear(self) -> None:
+        """Removes all stored renders."""
+        with self._lock:
+            self._read_index()
+            for name in list(self._index):
+                self._remove(name)
+            self._write_index()
+
+    def __deepcopy__(self, memo: dict) -> 'RenderStore':
+        return self # a store is a shared resource: copies of a viewport (img_rgb_async()) use the same store
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._read_index()
+            return len(self._index)
+
+    @staticmethod
+    def _axis(start: float, stop: float, points: int, request_start: float, request_stop: float, request_points: int) -> tuple[int, int] | None:
+        """First index and stride of a requested linspace() axis inside a stored one, None if not included."""
+        if points == 1:
+            return (0, 1) if request_points == 1 and request_start == start else None
+        step = (stop - start) / (points - 1)
+        first = (request_start - start) / step
+        stride = (request_stop - request_start) / (request_points - 1) / step if request_points > 1 else 1.0
+        if not (abs(first - round(first)) <= GRID_TOLERANCE and abs(stride - round(stride)) * max(request_points - 1, 1) <= GRID_TOLERANCE):
+            return None
+        first, stride = round(first), round(stride)
+        if not (stride >= 1 and first >= 0 and first + stride * (request_points - 1) <= points - 1): return None
+        return first, stride
+
+    def _grid(self, entry: dict, plane: cplxp.Plane) -> tuple[int, int, int, int, int, int] | None:
+        """(first row, row stride, rows, first column, column stride, columns) of plane in a stored render."""
+        xmin, xmax, ymin, ymax = entry['bounds']
+        xpoints, ypoints = entry['resolution']
+        columns = self._axis(xmin, xmax, xpoints, plane.xmin, plane.xmax, plane.xpoints)
+        rows = self._axis(-ymax, -ymin, ypoints, -plane.ymax, -plane.ymin, plane.ypoints) # first row is ymax
+        if columns is None or rows is None: return None
+        return rows[0], rows[1], plane.ypoints, columns[0], columns[1], plane.xpoints
+
+    def _read(self, entry: dict, row: int, row_stride: int, rows: int, column: int, column_stride: int, columns: int) -> np.ndarray[np.int64]:
+        """Stored counts of a grid of pixels, decompressing only the bands that contain its rows."""
+        dtype, chunk_rows, xpoints = np.dtype(entry['dtype']), entry['chunk_rows'], entry['resolution'][0]
+        wanted = row + row_stride * np.arange(rows)
+        counts = np.empty((rows, columns), dtype=np.int64)
+        with open(os.path.join(self.directory, entry['file']), 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                for chunk in np.unique(wanted // chunk_rows).tolist():
+                    offset, length = entry['chunks'][chunk]
+                    band = np.frombuffer(zlib.decompress(view[offset:offset + length]), dtype=dtype).reshape(-1, xpoints)
+                    selected = wanted // chunk_rows == chunk
+                    counts[selected] = band[wanted[selected] - chunk * chunk_rows, column:column + column_stride * (columns - 1) + 1:column_stride]
+        return counts
+
+    def _read_index(self) -> None:
+        """Reloads the index if the file changed since it was last read or written, keeping access times not written yet (lock held)."""
+        path = os.path.join(self.directory, INDEX_NAME)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._index, self._index_mtime = {}, None
+            self._accessed.clear()
+            return
+        if mtime == self._index_mtime: return
+        try:
+            with open(path) as file:
+                self._index = json.load(file)
+        except (OSError, ValueError): # damaged index: start over
+            self._index = {}
+        self._index_mtime = mtime
+        for name, accessed in list(self._accessed.items()):
+            if name in self._index:
+                self._index[name]['accessed'] = max(self._index[name]['accessed'], accessed)
+            else: # removed by another process
+                del self._accessed[name]
+
+    def _write_index(self) -> None:
+        """Atomically writes the index (lock held)."""
+        os.makedirs(self.directory, exist_ok = True)
+        path = os.path.join(self.directory, INDEX_NAME)
+        temporary = path + f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(self._index, file)
+        os.replace(temporary, path)
+        self._index_mtime = os.stat(path).st_mtime_ns
+        self._index_written = time.monotonic()
+        self._accessed.clear()
+
+    def _remove(self, name: str) -> None:
+        """Removes an entry and its file (lock held)."""
+        entry = self._index.pop(name)
+        self._accessed.pop(name, None)
+        try:
+            os.remove(os.path.join(self.directory, entry['file']))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, keep: str) -> None:
+        """Removes least recently used entries until stored files fit in max_bytes (lock held)."""
+        total = sum(entry['bytes'] for entry in self._index.values())
+        for name in sorted(self._index, key = lambda name: self._index[name]['accessed']):
+            if total <= self.max_bytes: break
+            if name == keep: continue
+            total -= self._index[name]['bytes']
+            self._remove(name)
@@ -0,0 +1,30 @@
+""" Tests of fractal_display.
+
+Classes
+    IsolatedCache
+"""
+
+import os
+import tempfile
+from unittest import mock
+from .. import backends
+from .. import viewport
+
+
+class IsolatedCache:
+    """Test case mixin keeping the package caches out of the user's home directory.
+
+    Each test gets an empty FRACTAL_DISPLAY_CACHE_DIR (colormap names, backend calibration,
+    renders of default stores), and starts without the names and backend choice cached in memory.
+    Used before unittest.TestCase (or IsolatedAsyncioTestCase) in the bases of test classes.
+    """
+    def setUp(self):
+        super().setUp()
+        self.cache = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache.cleanup)
+        for patch in (mock.patch.dict(os.environ, {'FRACTAL_DISPLAY_CACHE_DIR': self.cache.name}),
+                mock.patch.object(viewport, '_colormap_names', None),
+                mock.patch.object(viewport, '_colormap_misses', set()),
+                mock.patch.object(backends, '_auto_choice', None)):
+            patch.start()
+            self.addCleanup(patch.stop)
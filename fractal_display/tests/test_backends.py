@@ -0,0 +1,88 @@
+""" Test module for compute backends registry.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+import numpy as np
+import sys
+sys.path.append('../..')
+from fractal_display.tests import IsolatedCache
+from fractal_display import backends
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+
+
+class TestBackends(IsolatedCache, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.points = cplxp.Plane(-2, 1, -1.2, 1.2, 24, 18).toMatrix()
+        self.fractals = (cplxf.MandelbrotSet(max_iterations = 40), cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 40),
+            cplxf.MultibrotSet(degree = 3, max_iterations = 40), cplxf.NewtonFractal(max_iterations = 40))
+
+    def test_conformance(self):
+        # every available backend gives the scalar results
+        for fractal in self.fractals:
+            counts = np.array([[fractal.escape_count(point) for point in row] for row in self.points])
+            stabilities = np.array([[fractal.stability(point) for point in row] for row in self.points])
+            for name in backends.available_backends():
+                with self.subTest(backend = name, fractal = type(fractal).__name__):
+                    backend = backends.get_backend(name)
+                    np.testing.assert_array_equal(backend.escape_counts(fractal, self.points), counts)
+                    np.testing.assert_array_equal(backend.stabilities(fractal, self.points), stabilities)
+
+    @unittest.skipUnless(backends.NumbaBackend().available(), 'numba is not installed')
+    def test_numba_chunks(self):
+        backend = backends.NumbaBackend()
+        backend.CHUNK_SIZE = 7
+        fractal = self.fractals[0]
+        np.testing.assert_array_equal(backend.escape_counts(fractal, self.points), fractal.escape_counts(self.points))
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        for name in backends.available_backends():
+            with self.subTest(backend = name):
+                with self.assertRaises(cplxf.RenderCancelled):
+                    backends.get_backend(name).escape_counts(self.fractals[0], self.points, cancel)
+
+    def test_registry(self):
+        self.assertIn('python', backends.available_backends())
+        self.assertIn('numpy', backends.available_backends())
+        with self.assertRaises(ValueError):
+            backends.get_backend('backend_that_does_not_exist')
+        with self.assertRaises(TypeError):
+            backends.register_backend('numpy')
+
+        class Unavailable(backends.NumpyBackend):
+            name = 'unavailable'
+            def available(self): return False
+        with mock.patch.dict(backends._registry):
+            backends.register_backend(Unavailable())
+            self.assertNotIn('unavailable', backends.available_backends())
+            with self.assertRaises(ValueError):
+                backends.get_backend('unavailable')
+        self.assertNotIn('unavailable', backends._registry)
+
+    def test_auto(self):
+        timings = {'numpy': 0.2, 'multiprocess': 0.1}
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.dict(os.environ, {'FRACTAL_DISPLAY_CACHE_DIR': directory}), \
+                mock.patch.object(backends, '_auto_choice', None), \
+                mock.patch.object(backends, 'calibrate', return_value = timings) as calibrate:
+            self.assertIs(backends.get_backend('auto'), backends.get_backend('multiprocess'))
+            self.assertEqual(calibrate.call_count, 1)
+            with open(os.path.join(directory, 'backends.json')) as file:
+                cache = json.load(file)
+            self.assertEqual(list(cache.values()), [{'backend': 'multiprocess', 'timings': timings}])
+            # next process reads the cache instead of calibrating
+            backends._auto_choice = None
+            self.assertIs(backends.auto_backend(), backends.get_backend('multiprocess'))
+            self.assertEqual(calibrate.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+""" Test module for Buddhabrot class.
+"""
+
+import unittest
+import os
+import tempfile
+import threading
+import numpy as np # array_equal()
+import sys
+sys.path.append('../..')
+from fractal_display import buddhabrot
+from fractal_display.buddhabrot import Buddhabrot
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+
+
+def small_buddhabrot() -> Buddhabrot:
+    return Buddhabrot(fractal = cplxf.MandelbrotSet(max_iterations = 50), plane = cplxp.Plane(-2, 1, -1.5, 1.5, 30, 30), batch_size = 500)
+
+
+class TestBuddhabrot(unittest.TestCase):
+
+    def test_default(self):
+        fractal = Buddhabrot()
+        self.assertEqual(fractal.histogram.shape, (400, 400))
+        self.assertEqual(fractal.samples, 0)
+        self.assertIsNone(fractal.samples_per_second)
+        self.assertTrue(np.all(fractal.img_grey() == 0))
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            Buddhabrot(fractal = cplxf.JuliaSet())
+        with self.assertRaises(TypeError):
+            Buddhabrot(plane = (-2, 1, -1.5, 1.5))
+        with self.assertRaises(ValueError):
+            Buddhabrot(batch_size = 0)
+        with self.assertRaises(ValueError):
+            Buddhabrot(seed = -1)
+        with self.assertRaises(ValueError):
+            small_buddhabrot().run(0)
+
+    def test_interior(self):
+        # rejected samples never escape
+        generator = np.random.default_rng(0)
+        c = generator.uniform(-2, 2, 5000) + 1j * generator.uniform(-2, 2, 5000)
+        interior = buddhabrot._interior(c)
+        self.assertTrue(interior.any())
+        self.assertTrue(np.all(cplxf.MandelbrotSet(max_iterations = 500).escape_counts(c[interior]) == 500))
+
+    def test_batch_histogram(self):
+        # same visits as scalar orbits of the same samples
+        fractal, plane = cplxf.MandelbrotSet(max_iterations = 50), cplxp.Plane(-2, 1, -1.5, 1.5, 30, 30)
+        histogram = buddhabrot._batch_histogram(fractal, plane, 500, (0, 0))
+        generator = np.random.default_rng((0, 0))
+        samples = generator.uniform(-2, 2, 500) + 1j * generator.uniform(-2, 2, 500)
+        expected = np.zeros(30 * 30, dtype=np.int64)
+        for c in samples.tolist():
+            count = fractal.escape_count(c)
+            if count == fractal.max_iterations: continue
+            z = 0
+            for _ in range(count + 1):
+                z = z * z + c
+                column, row = round((z.real + 2) / (3 / 29)), round((1.5 - z.imag) / (3 / 29))
+                if 0 <= column < 30 and 0 <= row < 30: expected[row * 30 + column] += 1
+        self.assertGreater(expected.sum(), 0)
+        self.assertTrue(np.array_equal(histogram, expected))
+
+    def test_run(self):
+        fractal = small_buddhabrot()
+        fractal.run(1200, processes = 1)
+        self.assertEqual(fractal.samples, 1500) # whole batches
+        self.assertEqual(fractal.batches, 3)
+        self.assertGreater(fractal.samples_per_second, 0)
+        image = fractal.img_grey()
+        self.assertEqual(image.max(), 1)
+        self.assertTrue(np.all(image >= 0))
+        with self.assertRaises(ValueError):
+            fractal.plane = cplxp.Plane()
+
+    def test_processes(self):
+        # histograms of worker processes merge into the same result
+        serial, parallel = small_buddhabrot(), small_buddhabrot()
+        serial.run(2000, processes = 1)
+        parallel.run(2000, processes = 2)
+        self.assertTrue(np.array_equal(serial.histogram, parallel.histogram))
+
+    def test_checkpoint(self):
+        whole, resumed = small_buddhabrot(), small_buddhabrot()
+        whole.run(2000, processes = 1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'buddhabrot.npz')
+            resumed.run(1000, processes = 1, checkpoint = path)
+            self.assertTrue(os.path.exists(path))
+            resumed = Buddhabrot.load(path)
+        self.assertEqual(resumed.samples, 1000)
+        self.assertEqual(resumed.fractal.max_iterations, 50)
+        resumed.run(1000, processes = 1)
+        self.assertTrue(np.array_equal(resumed.histogram, whole.histogram))
+
+    def test_checkpoint_cancelled(self):
+        # parallel run cancelled with batches in flight: only merged batches are saved
+        whole, parallel = small_buddhabrot(), small_buddhabrot()
+        whole.run(4000, processes = 1)
+        class Cancel: # set once a batch is merged, while others are still running
+            def is_set(self): return parallel.batches >= 1
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'buddhabrot.npz')
+            with self.assertRaises(cplxf.RenderCancelled):
+                parallel.run(4000, processes = 2, cancel = Cancel(), checkpoint = path)
+            resumed = Buddhabrot.load(path)
+        self.assertEqual(resumed.batches, parallel.batches)
+        self.assertEqual(resumed.samples, resumed.batches * resumed.batch_size)
+        self.assertLess(resumed.samples, 4000)
+        resumed.run(4000 - resumed.samples, processes = 1)
+        self.assertEqual(resumed.batches, whole.batches)
+        self.assertTrue(np.array_equal(resumed.histogram, whole.histogram))
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        fractal = small_buddhabrot()
+        with self.assertRaises(cplxf.RenderCancelled):
+            fractal.run(1000, processes = 1, cancel = cancel)
+        self.assertEqual(fractal.samples, 0)
+
+if __name__ == '__main__':
+    unittest.main()
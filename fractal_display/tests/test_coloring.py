@@ -0,0 +1,132 @@
+""" Test module for coloring module (CountHistogram class) and histogram coloring of viewports.
+"""
+
+import unittest
+import tempfile
+import matplotlib
+import numpy as np # array_equal()
+import sys
+sys.path.append('../..')
+from fractal_display.tests import IsolatedCache
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+from fractal_display.coloring import CountHistogram
+from fractal_display.store import RenderStore
+from fractal_display.tiles import TileScheduler
+from fractal_display.viewport import Viewport
+
+
+class TestCountHistogram(IsolatedCache, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(0)
+        self.counts = np.minimum(rng.geometric(0.05, size = (120, 90)) - 1, 200) # most pixels escape early
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            CountHistogram(20.0)
+        with self.assertRaises(ValueError):
+            CountHistogram(0)
+        with self.assertRaises(ValueError):
+            CountHistogram(20).merge(CountHistogram(30))
+
+    def test_add(self):
+        histogram = CountHistogram(200).add(self.counts)
+        self.assertEqual(histogram.total, self.counts.size)
+        self.assertEqual(histogram.bins[0], np.count_nonzero(self.counts == 0))
+        self.assertEqual(histogram.bins[200], np.count_nonzero(self.counts == 200))
+
+    def test_merge(self):
+        # histograms of chunks (tiles, bands) merge into the histogram of the whole image
+        whole = CountHistogram(200).add(self.counts)
+        merged = CountHistogram(200)
+        for band in np.array_split(self.counts, 7):
+            merged.merge(CountHistogram(200).add(band))
+        self.assertTrue(np.array_equal(merged.bins, whole.bins))
+
+    def test_lookup_table(self):
+        table = CountHistogram(200).add(self.counts).lookup_table()
+        self.assertEqual(table.shape, (201,))
+        self.assertEqual(table[0], 0.0) # lowest count: first color, like linear coloring
+        self.assertEqual(table[200], 1.0) # points that did not escape
+        self.assertTrue(np.all(np.diff(table) >= 0))
+        self.assertLess(table[self.counts[self.counts < 200].max()], 1.0) # escaped pixels stay below interior
+        self.assertEqual(CountHistogram(10).lookup_table()[5], 0.0) # empty histogram
+
+    def test_equalize(self):
+        histogram = CountHistogram(200).add(self.counts)
+        values = histogram.equalize(self.counts)
+        escaped = values[self.counts < 200]
+        # colors spread evenly: quantiles of escaped values follow a uniform distribution
+        self.assertAlmostEqual(float(np.median(escaped)), 0.5, delta = 0.1)
+        # two passes over chunks give the values of the whole image
+        chunks = np.concatenate([histogram.equalize(band) for band in np.array_split(self.counts, 5)])
+        self.assertTrue(np.array_equal(chunks, values))
+
+
+class TestHistogramColoring(IsolatedCache, unittest.TestCase):
+
+    def viewport(self, **settings) -> Viewport:
+        return Viewport(fractal = cplxf.MandelbrotSet(max_iterations = 500), resolution = (90, 60),
+            offset = (-0.75, 0.1), zoom = 4.0, colormap = 'viridis', **settings)
+
+    def test_coloring(self):
+        viewport = self.viewport()
+        self.assertEqual(viewport.coloring, 'linear')
+        viewport.coloring = 'histogram'
+        self.assertEqual(viewport.coloring, 'histogram')
+        with self.assertRaises(TypeError):
+            viewport.coloring = 1
+        with self.assertRaises(ValueError):
+            viewport.coloring = 'log'
+
+    def test_contrast(self):
+        linear = self.viewport().img_grey()
+        equalized = self.viewport(coloring = 'histogram').img_grey()
+        interior = linear == 1.0
+        self.assertTrue(np.array_equal(interior, equalized == 1.0))
+        self.assertLess(np.median(linear[~interior]), 0.1) # high max_iterations: dark image
+        self.assertAlmostEqual(float(np.median(equalized[~interior])), 0.5, delta = 0.15)
+
+    def test_tiled(self):
+        for antialiasing in (1, 2):
+            with self.subTest(antialiasing = antialiasing):
+                viewport = self.viewport(coloring = 'histogram', antialiasing = antialiasing)
+                whole = viewport.img_rgb8()
+                delivered = {}
+                def on_tile(tile, colors):
+                    delivered[tile] = colors
+                tiled = viewport.img_rgb8(tiles = TileScheduler(tile_size = 16, on_tile = on_tile))
+                self.assertTrue(np.array_equal(whole, tiled))
+                self.assertIn('colorize', viewport.stats.stages)
+                for tile, colors in delivered.items(): # last delivery of each tile is final
+                    self.assertTrue(np.array_equal(colors, tiled[tile.slices]))
+
+    def test_out_of_core(self):
+        # bands of escape counts read from a render store, twice: one band in memory at a time
+        with tempfile.TemporaryDirectory() as directory:
+            store = RenderStore(directory, min_seconds = 0.0)
+            viewport = self.viewport(coloring = 'histogram', store = store)
+            whole = viewport.img_rgb8() # computed and saved
+            plane = viewport.plane()
+            step = (plane.ymax - plane.ymin) / (plane.ypoints - 1)
+            bands = [cplxp.Plane(xmin = plane.xmin, xmax = plane.xmax, ymin = plane.ymax - (bottom - 1) * step,
+                ymax = plane.ymax - top * step, xpoints = plane.xpoints, ypoints = bottom - top) for top, bottom in ((0, 25), (25, 50), (50, 60))]
+            histogram = CountHistogram(viewport.fractal.max_iterations)
+            for band in bands: # first pass: counting
+                histogram.add(store.lookup(viewport.fractal, band))
+            colormap = matplotlib.colormaps[viewport.colormap]
+            banded = np.concatenate([colormap(histogram.equalize(store.lookup(viewport.fractal, band)), bytes = True)[..., :3]
+                for band in bands]) # second pass: coloring
+            self.assertEqual(histogram.total, 90 * 60)
+            self.assertTrue(np.array_equal(whole, banded))
+
+    def test_newton(self):
+        # roots are encoded in stabilities: Newton fractals keep linear coloring
+        linear = Viewport(fractal = cplxf.NewtonFractal(), resolution = (40, 30)).img_grey()
+        equalized = Viewport(fractal = cplxf.NewtonFractal(), resolution = (40, 30), coloring = 'histogram').img_grey()
+        self.assertTrue(np.array_equal(linear, equalized))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,8 @@
 import unittest
 import numpy as np # array(), array_equal()
 import sys
-sys.path.append('..')
-import complex_plane as cplxp
+sys.path.append('../..')
+from fractal_display import complex_plane as cplxp
 
 class TestPlane(unittest.TestCase):
 
@@ -0,0 +1,104 @@
+""" Test module for ImageDisplay class.
+"""
+
+import unittest
+import numpy as np # array()
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import sys
+sys.path.append('../..')
+from fractal_display.display import ImageDisplay, fit_resolution
+
+
+class TestImageDisplay(unittest.TestCase):
+
+    def setUp(self):
+        figure = Figure(figsize = (3, 3))
+        self.plot = figure.add_subplot(111)
+        self.canvas = FigureCanvasAgg(figure)
+        self.display = ImageDisplay(self.plot, self.canvas)
+        self.image = np.random.default_rng(0).random((24, 32, 3))
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            display = ImageDisplay('plot', self.canvas)
+        with self.assertRaises(TypeError):
+            display = ImageDisplay(self.plot, 'canvas')
+        with self.assertRaises(ValueError):
+            self.display.show(self.image, [0, 1, 0])
+
+    def test_single_artist(self):
+        self.assertIsNone(self.display.artist)
+        for shift in range(10):
+            self.display.show(self.image + 0 * shift, [shift, shift + 4, -1.5, 1.5])
+        # one artist, updated in place
+        self.assertEqual(len(self.plot.images), 1)
+        self.assertIs(self.plot.images[0], self.display.artist)
+        self.assertEqual(list(self.display.artist.get_extent()), [9, 13, -1.5, 1.5])
+        self.assertEqual(self.plot.get_xlim(), (9, 13))
+        self.assertEqual(self.plot.get_ylim(), (-1.5, 1.5))
+
+    def test_new_resolution(self):
+        self.display.show(self.image, [-2, 2, -1.5, 1.5])
+        larger = np.zeros((48, 64, 3))
+        self.display.show(larger, [-2, 2, -1.5, 1.5])
+        self.assertEqual(self.display.artist.get_array().shape, (48, 64, 3))
+        self.assertEqual(self.display.blits, 0)
+
+    def test_blit(self):
+        extent = [-2, 2, -1.5, 1.5]
+        self.display.show(self.image, extent)
+        self.assertEqual(self.display.blits, 0)
+        # same layout: only the image is drawn again, and the canvas shows the new image
+        self.display.show(1 - self.image, extent)
+        self.assertEqual(self.display.blits, 1)
+        blitted = np.asarray(self.canvas.buffer_rgba()).copy()
+        self.canvas.draw()
+        np.testing.assert_array_equal(blitted, np.asarray(self.canvas.buffer_rgba()))
+
+    def test_preview(self):
+        self.display.show(self.image, [-2, 2, -1.5, 1.5])
+        self.display.preview([-1, 3, -1.5, 1.5])
+        # axes follow the new view, the image keeps its extent until the next show()
+        self.assertEqual(self.plot.get_xlim(), (-1, 3))
+        self.assertEqual(list(self.display.artist.get_extent()), [-2, 2, -1.5, 1.5])
+        self.display.show(self.image, [-2, 2, -1.5, 1.5])
+        self.assertEqual(self.plot.get_xlim(), (-2, 2))
+        self.assertEqual(self.display.blits, 0)
+        with self.assertRaises(ValueError):
+            self.display.preview([0, 1])
+
+    def test_overlay(self):
+        # patches added to the axes stay visible over the image, blits included
+        self.display.show(np.zeros((24, 32, 3)), [-2, 2, -1.5, 1.5])
+        self.plot.axhline(0, color = 'white', linewidth = 4)
+        self.display.show(np.zeros((24, 32, 3)), [-2, 2, -1.5, 1.5])
+        self.assertEqual(self.display.blits, 1)
+        pixels = np.asarray(self.canvas.buffer_rgba())
+        x0, y0, x1, y1 = self.plot.bbox.extents
+        center = pixels[pixels.shape[0] - int((y0 + y1) / 2) - 1, int((x0 + x1) / 2)]
+        self.assertEqual(list(center[:3]), [255, 255, 255])
+
+    def test_pixel_size(self):
+        width, height = self.display.pixel_size()
+        self.assertAlmostEqual(width, self.plot.bbox.width)
+        self.assertAlmostEqual(height, self.plot.bbox.height)
+        # figure DPI is included
+        self.plot.figure.set_dpi(2 * self.plot.figure.get_dpi())
+        self.assertAlmostEqual(self.display.pixel_size()[0], 2 * width)
+
+    def test_fit_resolution(self):
+        self.assertEqual(fit_resolution((800, 600), 4 / 3), (800, 600))
+        self.assertEqual(fit_resolution((800.7, 900), 4 / 3), (800, 600))
+        self.assertEqual(fit_resolution((1000, 300), 4 / 3), (400, 300))
+        self.assertEqual(fit_resolution((800, 600), 4 / 3, detail = 4), (200, 150))
+        self.assertEqual(fit_resolution((0, 0), 4 / 3), (1, 1))
+        with self.assertRaises(TypeError):
+            fit_resolution((800, 600), 4 / 3, detail = 1.5)
+        with self.assertRaises(ValueError):
+            fit_resolution((800, 600), 4 / 3, detail = 0)
+        with self.assertRaises(ValueError):
+            fit_resolution((800, 600), 0)
+
+if __name__ == '__main__':
+    unittest.main()
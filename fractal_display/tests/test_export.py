@@ -0,0 +1,116 @@
+""" Test module for export module (Exporter class and PNG metadata).
+"""
+
+import unittest
+import os
+import tempfile
+import threading
+import numpy as np # array()
+from PIL import Image
+import sys
+sys.path.append('../..')
+from fractal_display.tests import IsolatedCache
+from fractal_display import complex_fractal as cplxf
+from fractal_display import export
+from fractal_display.viewport import Viewport
+
+
+class TestExport(IsolatedCache, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'image.png')
+        self.viewport = Viewport(fractal = cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 40), resolution = (40,30),
+            offset = (0.1, -0.2), zoom = 1.5, colormap = 'viridis')
+        self.exporter = export.Exporter()
+
+    def tearDown(self):
+        self.exporter.shutdown()
+        self.directory.cleanup()
+
+    def test_img_rgb8(self):
+        image = self.viewport.img_rgb8()
+        self.assertEqual(image.dtype, np.uint8)
+        self.assertEqual(image.shape, (30, 40, 3))
+        self.assertLessEqual(np.abs(image - 255 * self.viewport.img_rgb()).max(), 1)
+
+    def test_parameters(self):
+        for fractal in (cplxf.MandelbrotSet(max_iterations = 7), cplxf.JuliaSet(c = 0.1+0.3j), cplxf.MultibrotSet(degree = 4),
+                cplxf.MultiJuliaSet(c = 0.2j, coefficients = (1, 0.5j, 0, 0)), cplxf.NewtonFractal((1, 0, -2, 2), tolerance = 1e-3)):
+            with self.subTest(fractal = str(fractal)):
+                self.viewport.fractal = fractal
+                parameters = export.viewport_parameters(self.viewport)
+                viewport = export.viewport_from_parameters(parameters)
+                self.assertEqual(export.viewport_parameters(viewport), parameters)
+                self.assertEqual(str(viewport.fractal), str(fractal))
+                np.testing.assert_array_equal(viewport.img_grey(), self.viewport.img_grey())
+        with self.assertRaises(ValueError):
+            export.viewport_from_parameters(dict(parameters, fractal = {'class': 'Viewport'}))
+
+    def test_coloring_parameter(self):
+        self.viewport.coloring = 'histogram'
+        parameters = export.viewport_parameters(self.viewport)
+        self.assertEqual(export.viewport_from_parameters(parameters).coloring, 'histogram')
+        del parameters['coloring'] # files written before histogram coloring
+        self.assertEqual(export.viewport_from_parameters(parameters).coloring, 'linear')
+
+    def test_export(self):
+        report = self.exporter.export(self.viewport, self.path).result()
+        self.assertEqual(report.path, self.path)
+        self.assertEqual(report.resolution, (40,30))
+        self.assertEqual(report.bytes, os.path.getsize(self.path))
+        self.assertIn('image.png: 40x30', report.summary())
+        with Image.open(self.path) as image:
+            np.testing.assert_array_equal(np.asarray(image), self.viewport.img_rgb8())
+        # the file reproduces the exact view
+        viewport = export.viewport_from_parameters(export.read_parameters(self.path))
+        np.testing.assert_array_equal(viewport.img_rgb8(), self.viewport.img_rgb8())
+
+    def test_export_resolution(self):
+        report = self.exporter.export(self.viewport, self.path, resolution = (80,60)).result()
+        self.assertEqual(report.resolution, (80,60))
+        self.assertEqual(export.read_parameters(self.path)['resolution'], [80,60])
+        self.assertEqual(self.viewport.resolution, (40,30)) # exported viewport is a copy
+        with Image.open(self.path) as image:
+            self.assertEqual(image.size, (80,60))
+
+    def test_export_image(self):
+        image = self.viewport.img_rgb()
+        report = self.exporter.export(self.viewport, self.path, image = image).result()
+        self.assertEqual(report.render_time, 0)
+        with Image.open(self.path) as written:
+            np.testing.assert_array_equal(np.asarray(written), np.rint(image * 255))
+        with self.assertRaises(ValueError):
+            self.exporter.export(self.viewport, self.path, image = image[1:])
+        with self.assertRaises(ValueError):
+            self.exporter.export(self.viewport, self.path, resolution = (80,60), image = image)
+
+    def test_auto_iterations(self):
+        # parameters are taken after the render: resolved max_iterations reproduce it
+        self.viewport.auto_iterations = 'probe'
+        self.exporter.export(self.viewport, self.path).result()
+        viewport = export.viewport_from_parameters(export.read_parameters(self.path))
+        self.assertEqual(viewport.auto_iterations, 'off')
+        with Image.open(self.path) as image:
+            np.testing.assert_array_equal(np.asarray(image), viewport.img_rgb8())
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            self.exporter.export(self.viewport, self.path, cancel = cancel).result()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            self.exporter.export('viewport', self.path)
+        with self.assertRaises(TypeError):
+            self.exporter.export(self.viewport, 1)
+        plain = os.path.join(self.directory.name, 'plain.png')
+        Image.fromarray(np.zeros((2, 2, 3), dtype=np.uint8)).save(plain)
+        with self.assertRaises(ValueError):
+            export.read_parameters(plain)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,8 @@
 
 import unittest
 import sys
-sys.path.append('..')
-import complex_fractal as cplxf
+sys.path.append('../..')
+from fractal_display import complex_fractal as cplxf
 
 
 class TestFractal(unittest.TestCase):
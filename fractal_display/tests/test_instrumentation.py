@@ -0,0 +1,57 @@
+""" Test module for RenderStats class.
+"""
+
+import unittest
+import time
+import sys
+sys.path.append('../..')
+from fractal_display.instrumentation import RenderStats
+
+
+class TestRenderStats(unittest.TestCase):
+
+    def test_default(self):
+        stats = RenderStats(pixels = 12)
+        self.assertEqual(stats.pixels, 12)
+        self.assertEqual(stats.stages, {})
+        self.assertEqual(stats.total_time, 0)
+        self.assertIsNone(stats.iterations_per_second)
+        self.assertIsNone(stats.profile)
+
+    def test_stage(self):
+        stats = RenderStats()
+        with stats.stage('plane'):
+            time.sleep(0.01)
+        with stats.stage('iterations'):
+            pass
+        with stats.stage('plane'):
+            time.sleep(0.01)
+        self.assertEqual(list(stats.stages), ['plane', 'iterations'])
+        self.assertGreaterEqual(stats.stages['plane'], 0.02)
+        self.assertEqual(stats.total_time, sum(stats.stages.values()))
+
+    def test_stage_exception(self):
+        stats = RenderStats()
+        with self.assertRaises(ValueError):
+            with stats.stage('iterations'):
+                raise ValueError
+        self.assertIn('iterations', stats.stages)
+
+    def test_iterations_per_second(self):
+        stats = RenderStats()
+        stats.stages = {'plane': 1.0, 'iterations': 2.0}
+        stats.iterations = 1000
+        self.assertEqual(stats.iterations_per_second, 500)
+        stats.iterations = None
+        self.assertIsNone(stats.iterations_per_second)
+
+    def test_summary(self):
+        stats = RenderStats(pixels = 4)
+        stats.stages = {'iterations': 0.5}
+        stats.computed_points, stats.iterations, stats.skipped_pixels = 4, 2000000, 3
+        self.assertEqual(stats.summary(), '500 ms (iterations 500 ms) | 4 points, 2,000,000 iterations (4.0 M/s) | 3 skipped')
+        stats.stored_pixels = 1200
+        self.assertTrue(stats.summary().endswith(' | 3 skipped | 1,200 from store'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,11 @@
 """
 
 import unittest
+import threading
+import numpy as np # array()
 import sys
-sys.path.append('..')
-import complex_fractal as cplxf
+sys.path.append('../..')
+from fractal_display import complex_fractal as cplxf
 
 
 class TestJuliaSet(unittest.TestCase):
@@ -71,6 +73,31 @@ class TestJuliaSet(unittest.TestCase):
             fractal = cplxf.JuliaSet()
             escape_count = fractal.stability('string')
     
+    def test_escape_counts(self):
+        fractal = cplxf.JuliaSet(c = 0.25)
+        fractal.max_iterations = 100
+        points = np.array([0, 10, 0.53, 0.4+0.3j, -0.2-0.6j])
+        expected = [fractal.escape_count(point) for point in points]
+        self.assertEqual(fractal.escape_counts(points).tolist(), expected)
+        self.assertEqual(fractal.escape_counts(points.reshape(5,1)).shape, (5,1))
+        self.assertEqual(fractal.stabilities(points).tolist(), [fractal.stability(point) for point in points])
+
+    def test_escape_counts_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            fractal = cplxf.JuliaSet(c = 0.25)
+            fractal.escape_counts(np.zeros(4), cancel)
+
+    def test_distance_estimates(self):
+        fractal = cplxf.JuliaSet(c = 0, max_iterations = 100)
+        # with c = 0, the Julia set is the unit circle
+        counts, distances = fractal.distance_estimates(np.array([0, 0.5j, 2, -3]))
+        self.assertEqual(counts.tolist(), fractal.escape_counts(np.array([0, 0.5j, 2, -3])).tolist())
+        self.assertEqual(distances[:2].tolist(), [0, 0]) # do not escape
+        self.assertTrue(0.25 <= distances[2] <= 1)
+        self.assertTrue(0.5 <= distances[3] <= 2)
+
     def test_str(self):
         fractal = cplxf.JuliaSet()
         self.assertEqual(str(fractal), f'Julia_c{fractal.c}_maxIt{fractal.max_iterations}')
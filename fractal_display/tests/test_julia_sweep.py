@@ -0,0 +1,82 @@
+""" Test module for batched Julia sets rendering.
+"""
+
+import unittest
+import threading
+import numpy as np # array_equal()
+import sys
+sys.path.append('../..')
+from fractal_display import julia_sweep
+from fractal_display import backends
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+
+
+class TestJuliaSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.plane = cplxp.Plane(-1.6, 1.6, -1.2, 1.2, 12, 9)
+        self.c_values = np.array([[-0.75, 0.285+0.01j, -0.8+0.156j], [0.5, 1j, -2]])
+
+    def test_escape_counts(self):
+        # same result as one JuliaSet per c, whatever the chunking
+        expected = np.array([[cplxf.JuliaSet(c = complex(c), max_iterations = 30).escape_counts(self.plane.toMatrix()) for c in row] for row in self.c_values])
+        for memory_budget in (1, 10 ** 6):
+            counts = julia_sweep.julia_escape_counts(self.c_values, self.plane, 30, memory_budget)
+            self.assertEqual(counts.shape, (2, 3, 9, 12))
+            self.assertTrue(np.array_equal(counts, expected))
+        self.assertTrue(np.array_equal(julia_sweep.julia_stabilities(self.c_values, self.plane, 30), expected / 30))
+
+    def test_backends(self):
+        expected = julia_sweep.julia_escape_counts(self.c_values, self.plane, 30)
+        for backend in backends.available_backends():
+            with self.subTest(backend = backend):
+                self.assertTrue(np.array_equal(julia_sweep.julia_escape_counts(self.c_values, self.plane, 30, backend = backend), expected))
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            julia_sweep.julia_escape_counts(self.c_values, self.plane.toMatrix())
+        with self.assertRaises(ValueError):
+            julia_sweep.julia_escape_counts(self.c_values, self.plane, 0)
+        with self.assertRaises(ValueError):
+            julia_sweep.julia_escape_counts(self.c_values, self.plane, memory_budget = 0)
+        with self.assertRaises(ValueError):
+            julia_sweep.julia_escape_counts(self.c_values, self.plane, backend = 'backend_that_does_not_exist')
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            julia_sweep.julia_escape_counts(self.c_values, self.plane, cancel = cancel)
+
+    def test_atlas(self):
+        images = np.arange(2 * 3 * 2 * 2).reshape(2, 3, 2, 2)
+        result = julia_sweep.atlas(images, padding = 1, fill = -1)
+        self.assertEqual(result.shape, (5, 8))
+        self.assertTrue(np.array_equal(result[3:5, 6:8], images[1, 2]))
+        self.assertTrue(np.all(result[2] == -1))
+        # stack of 5 images laid out on 3 columns, trailing channels kept
+        stack = np.ones((5, 2, 2, 3))
+        result = julia_sweep.atlas(stack, columns = 3)
+        self.assertEqual(result.shape, (4, 6, 3))
+        self.assertTrue(np.all(result[2:, 4:] == 0))
+        self.assertEqual(result.sum(), 5 * 2 * 2 * 3)
+
+    def test_atlas_exceptions(self):
+        with self.assertRaises(ValueError):
+            julia_sweep.atlas(np.ones((2, 2, 2)))
+        with self.assertRaises(ValueError):
+            julia_sweep.atlas(np.ones((2, 2, 2, 2)), padding = -1)
+        with self.assertRaises(TypeError):
+            julia_sweep.atlas(np.ones((2, 2, 2)), columns = 1.5)
+
+    def test_julia_map(self):
+        c_plane = cplxp.Plane(-2, 0.5, -1.2, 1.2, 4, 3)
+        image = julia_sweep.julia_map(c_plane, self.plane, 30, padding = 2)
+        self.assertEqual(image.shape, (3 * 9 + 2 * 2, 4 * 12 + 3 * 2))
+        # top-left thumbnail is the Julia set of c = xmin + ymax*j
+        expected = cplxf.JuliaSet(c = -2+1.2j, max_iterations = 30).stabilities(self.plane.toMatrix())
+        self.assertTrue(np.array_equal(image[:9, :12], expected))
+
+if __name__ == '__main__':
+    unittest.main()
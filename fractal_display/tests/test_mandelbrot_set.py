@@ -2,9 +2,11 @@
 """
 
 import unittest
+import threading
+import numpy as np # array()
 import sys
-sys.path.append('..')
-import complex_fractal as cplxf
+sys.path.append('../..')
+from fractal_display import complex_fractal as cplxf
 
 
 class TestMandelbrotSet(unittest.TestCase):
@@ -60,6 +62,31 @@ class TestMandelbrotSet(unittest.TestCase):
             fractal = cplxf.MandelbrotSet()
             escape_count = fractal.stability('string')
     
+    def test_escape_counts(self):
+        fractal = cplxf.MandelbrotSet()
+        fractal.max_iterations = 100
+        points = np.array([0, 10, -1+0.3j, -0.75+0.1j, 0.3+0.5j])
+        expected = [fractal.escape_count(point) for point in points]
+        self.assertEqual(fractal.escape_counts(points).tolist(), expected)
+        self.assertEqual(fractal.escape_counts(points.reshape(5,1)).shape, (5,1))
+        self.assertEqual(fractal.stabilities(points).tolist(), [fractal.stability(point) for point in points])
+
+    def test_escape_counts_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            fractal = cplxf.MandelbrotSet()
+            fractal.escape_counts(np.zeros(4), cancel)
+
+    def test_distance_estimates(self):
+        fractal = cplxf.MandelbrotSet(max_iterations = 100)
+        # set is contained in the disk of radius 2 and contains [-2, 0.25]
+        counts, distances = fractal.distance_estimates(np.array([0, -1, 1, 3j]))
+        self.assertEqual(counts.tolist(), fractal.escape_counts(np.array([0, -1, 1, 3j])).tolist())
+        self.assertEqual(distances[:2].tolist(), [0, 0]) # inside the set
+        self.assertTrue(0 < distances[2] <= 0.75)
+        self.assertTrue(1 <= distances[3] <= 3)
+
     def test_str(self):
         fractal = cplxf.MandelbrotSet()
         self.assertEqual(str(fractal), f'Mandelbrot_maxIt{fractal.max_iterations}')
@@ -0,0 +1,85 @@
+""" Test module for MultiJuliaSet class.
+"""
+
+import unittest
+import threading
+import numpy as np # array()
+import sys
+sys.path.append('../..')
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+
+
+class TestMultiJuliaSet(unittest.TestCase):
+
+    def test_default(self):
+        fractal = cplxf.MultiJuliaSet()
+        self.assertEqual(fractal.c, -0.75)
+        self.assertEqual(fractal.degree, 3)
+        self.assertIsNone(fractal.coefficients)
+        self.assertEqual(fractal.max_iterations, 20)
+
+    def test_c_exceptions(self):
+        with self.assertRaises(TypeError):
+            fractal = cplxf.MultiJuliaSet(c = 'string')
+
+    def test_degree_and_coefficients(self):
+        fractal = cplxf.MultiJuliaSet(coefficients = (2, 0, 1j, 0))
+        self.assertEqual(fractal.degree, 3)
+        self.assertEqual(fractal.coefficients, (2, 0, 1j, 0))
+        # setting the degree goes back to p = z^d
+        fractal.degree = 4
+        self.assertIsNone(fractal.coefficients)
+
+    def test_degree_and_coefficients_exceptions(self):
+        with self.assertRaises(TypeError):
+            fractal = cplxf.MultiJuliaSet(degree = '3')
+        with self.assertRaises(ValueError):
+            fractal = cplxf.MultiJuliaSet(degree = 1)
+        with self.assertRaises(TypeError):
+            fractal = cplxf.MultiJuliaSet(coefficients = (1, 'a', 0))
+        with self.assertRaises(ValueError):
+            fractal = cplxf.MultiJuliaSet(coefficients = (1, 0)) # degree 1
+        with self.assertRaises(ValueError):
+            fractal = cplxf.MultiJuliaSet(coefficients = (0, 1, 0))
+
+    def test_escape_radius(self):
+        self.assertEqual(cplxf.MultiJuliaSet(c = 0, degree = 3).escape_radius, 2 ** 0.5)
+        self.assertEqual(cplxf.MultiJuliaSet(c = 3, degree = 3).escape_radius, 3)
+        self.assertEqual(cplxf.MultiJuliaSet(c = 3, degree = 2).escape_radius, 3) # JuliaSet keeps 2
+        self.assertEqual(cplxf.MultiJuliaSet(c = 1, coefficients = (2, 1, -1)).escape_radius, 2.5)
+
+    def test_escape_count(self):
+        fractal = cplxf.MultiJuliaSet(c = 0, degree = 3, max_iterations = 30)
+        # unit disk is the filled Julia set of z^3
+        self.assertEqual(fractal.escape_count(0.9j), 30)
+        self.assertEqual(fractal.escape_count(1.5), 0)
+        self.assertEqual(fractal.stability(0.9j), 1)
+        with self.assertRaises(TypeError):
+            fractal.escape_count('string')
+
+    def test_escape_counts(self):
+        # vectorized kernels give the scalar results, for z^d and for general polynomials
+        points = cplxp.Plane(-1.5, 1.5, -1.5, 1.5, 30, 20).toMatrix()
+        for fractal in (cplxf.MultiJuliaSet(c = 0.4+0.2j, degree = 3, max_iterations = 40),
+                cplxf.MultiJuliaSet(c = -0.5, degree = 6, max_iterations = 40),
+                cplxf.MultiJuliaSet(c = 0.3j, coefficients = (1, 0.5, -0.2, 0), max_iterations = 40)):
+            expected = [[fractal.escape_count(complex(point)) for point in row] for row in points]
+            self.assertEqual(fractal.escape_counts(points).tolist(), expected)
+        # degree 2 is the quadratic Julia set while |c| <= 2 (the escape radius is then 2 for both)
+        for c in (-0.8+0.156j, 2j):
+            self.assertTrue(np.array_equal(cplxf.MultiJuliaSet(c = c, degree = 2, max_iterations = 40).escape_counts(points),
+                cplxf.JuliaSet(c = c, max_iterations = 40).escape_counts(points)))
+
+    def test_escape_counts_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            cplxf.MultiJuliaSet().escape_counts(np.zeros(4), cancel)
+
+    def test_str(self):
+        self.assertEqual(str(cplxf.MultiJuliaSet(c = 1j, degree = 4)), 'MultiJulia_d4_c1j_maxIt20')
+        self.assertEqual(str(cplxf.MultiJuliaSet(c = 1j, coefficients = (1, 0, 2))), 'MultiJulia_p[(1+0j), 0j, (2+0j)]_c1j_maxIt20')
+
+if __name__ == '__main__':
+    unittest.main()
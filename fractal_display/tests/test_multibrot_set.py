@@ -0,0 +1,77 @@
+""" Test module for MultibrotSet class.
+"""
+
+import unittest
+import threading
+import numpy as np # array()
+import sys
+sys.path.append('../..')
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+
+
+class TestMultibrotSet(unittest.TestCase):
+
+    def test_default(self):
+        fractal = cplxf.MultibrotSet()
+        self.assertEqual(fractal.degree, 3)
+        self.assertEqual(fractal.max_iterations, 20)
+
+    def test_degree(self):
+        fractal = cplxf.MultibrotSet(degree = 5)
+        self.assertEqual(fractal.degree, 5)
+        self.assertEqual(fractal.escape_radius, 2 ** 0.25)
+        fractal.degree = 2
+        self.assertEqual(fractal.escape_radius, 2)
+
+    def test_degree_exceptions(self):
+        with self.assertRaises(TypeError):
+            fractal = cplxf.MultibrotSet(degree = 3.0)
+        with self.assertRaises(ValueError):
+            fractal = cplxf.MultibrotSet(degree = 1)
+
+    def test_max_iteration_exceptions(self):
+        with self.assertRaises(TypeError):
+            fractal = cplxf.MultibrotSet(max_iterations = 'string')
+        with self.assertRaises(ValueError):
+            fractal = cplxf.MultibrotSet(max_iterations = 0)
+
+    def test_escape_count(self):
+        fractal = cplxf.MultibrotSet(degree = 3, max_iterations = 50)
+        # point inside Multibrot set (convergent)
+        self.assertEqual(fractal.escape_count(0), 50)
+        self.assertEqual(fractal.escape_count(0.5j), 50)
+        # point outside Multibrot set (divergent)
+        self.assertEqual(fractal.escape_count(2), 0)
+        self.assertEqual(fractal.stability(2), 0)
+        with self.assertRaises(TypeError):
+            fractal.escape_count('string')
+
+    def test_escape_counts(self):
+        # vectorized kernel gives the scalar results
+        points = cplxp.Plane(-1.5, 1.5, -1.5, 1.5, 30, 20).toMatrix()
+        for degree in (2, 3, 4, 7):
+            fractal = cplxf.MultibrotSet(degree = degree, max_iterations = 40)
+            expected = [[fractal.escape_count(complex(point)) for point in row] for row in points]
+            self.assertEqual(fractal.escape_counts(points).tolist(), expected)
+            self.assertEqual(fractal.stabilities(points).tolist(), [[fractal.stability(complex(point)) for point in row] for row in points])
+        # degree 2 is the Mandelbrot set
+        self.assertTrue(np.array_equal(cplxf.MultibrotSet(degree = 2, max_iterations = 40).escape_counts(points),
+            cplxf.MandelbrotSet(max_iterations = 40).escape_counts(points)))
+
+    def test_escape_counts_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            cplxf.MultibrotSet().escape_counts(np.zeros(4), cancel)
+
+    def test_power(self):
+        for degree in range(1, 12):
+            self.assertAlmostEqual(cplxf._power(0.9+0.3j, degree), (0.9+0.3j) ** degree)
+
+    def test_str(self):
+        fractal = cplxf.MultibrotSet(degree = 4)
+        self.assertEqual(str(fractal), f'Multibrot_d4_maxIt{fractal.max_iterations}')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+""" Test module for NewtonFractal class.
+"""
+
+import unittest
+import threading
+import numpy as np # array()
+import sys
+sys.path.append('../..')
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+
+
+class TestNewtonFractal(unittest.TestCase):
+
+    def test_default(self):
+        fractal = cplxf.NewtonFractal()
+        self.assertEqual(fractal.coefficients, (1, 0, 0, -1))
+        self.assertEqual(fractal.max_iterations, 20)
+        self.assertEqual(fractal.tolerance, 1e-6)
+
+    def test_roots(self):
+        fractal = cplxf.NewtonFractal()
+        # cube roots of unity
+        expected = [np.exp(2j * np.pi * k / 3) for k in range(3)]
+        self.assertEqual(len(fractal.roots), 3)
+        for root in expected:
+            self.assertAlmostEqual(min(abs(fractal.roots - root)), 0, places = 12)
+        fractal.coefficients = (1, 0, -4)
+        self.assertEqual(sorted(fractal.roots.real.round(12)), [-2, 2])
+        # roots are read-only
+        fractal.roots[0] = 0
+        self.assertNotEqual(fractal.roots[0], 0)
+
+    def test_coefficients_exceptions(self):
+        with self.assertRaises(TypeError):
+            fractal = cplxf.NewtonFractal(coefficients = 'string')
+        with self.assertRaises(TypeError):
+            fractal = cplxf.NewtonFractal(coefficients = (1, 'a', 0))
+        with self.assertRaises(ValueError):
+            fractal = cplxf.NewtonFractal(coefficients = (1, -1))
+        with self.assertRaises(ValueError):
+            fractal = cplxf.NewtonFractal(coefficients = (0, 1, -1))
+
+    def test_max_iteration_exceptions(self):
+        with self.assertRaises(TypeError):
+            fractal = cplxf.NewtonFractal(max_iterations = 'string')
+        with self.assertRaises(ValueError):
+            fractal = cplxf.NewtonFractal(max_iterations = 0)
+
+    def test_tolerance_exceptions(self):
+        with self.assertRaises(TypeError):
+            fractal = cplxf.NewtonFractal(tolerance = 'string')
+        with self.assertRaises(ValueError):
+            fractal = cplxf.NewtonFractal(tolerance = 0)
+
+    def test_escape_count(self):
+        fractal = cplxf.NewtonFractal(max_iterations = 50)
+        roots = fractal.roots.tolist()
+        # root 1 is reached from the positive real axis
+        self.assertEqual(fractal.root_index(2), roots.index(min(roots, key = lambda root: abs(root - 1))))
+        self.assertEqual(fractal.escape_count(1), 0)
+        self.assertLess(fractal.escape_count(2), 10)
+        # null derivative: no convergence
+        self.assertEqual(fractal.root_index(0), -1)
+        self.assertEqual(fractal.escape_count(0), 50)
+        self.assertEqual(fractal.stability(0), 0)
+        with self.assertRaises(TypeError):
+            fractal.escape_count('string')
+
+    def test_stability(self):
+        fractal = cplxf.NewtonFractal(max_iterations = 50)
+        for z_0 in (2, -1+1j, -1-1j, 0.3+0.2j):
+            index, count = fractal.root_index(z_0), fractal.escape_count(z_0)
+            self.assertEqual(fractal.stability(z_0), (index + 1 - count / 50) / 3)
+            # each root has its own band of stabilities
+            self.assertTrue(index / 3 < fractal.stability(z_0) <= (index + 1) / 3)
+
+    def test_convergence(self):
+        # vectorized kernel gives the scalar results
+        points = cplxp.Plane(-2, 2, -1.5, 1.5, 40, 30).toMatrix()
+        for coefficients in ((1, 0, 0, -1), (1, 0, -2, 2), (1, -2j, 0.5, 0, 1), (1, 0, 0)):
+            fractal = cplxf.NewtonFractal(coefficients, max_iterations = 40)
+            indices, counts = fractal.convergence(points)
+            self.assertEqual(indices.shape, points.shape)
+            self.assertEqual(indices.tolist(), [[fractal.root_index(complex(point)) for point in row] for row in points])
+            self.assertEqual(counts.tolist(), [[fractal.escape_count(complex(point)) for point in row] for row in points])
+            self.assertTrue(np.array_equal(fractal.escape_counts(points), counts))
+            self.assertEqual(fractal.stabilities(points).tolist(), [[fractal.stability(complex(point)) for point in row] for row in points])
+
+    def test_convergence_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            cplxf.NewtonFractal().convergence(np.ones(4), cancel)
+
+    def test_str(self):
+        fractal = cplxf.NewtonFractal((1, 0, -1))
+        self.assertEqual(str(fractal), f'Newton_p[(1+0j), 0j, (-1+0j)]_maxIt{fractal.max_iterations}')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+""" Test module for RenderScheduler class.
+"""
+
+import unittest
+import concurrent.futures
+import threading
+import time
+import sys
+sys.path.append('../..')
+from fractal_display import complex_fractal as cplxf
+from fractal_display.scheduler import RenderScheduler
+
+
+class FakeLoop:
+    """Event loop with a manual clock, providing tkinter's after() and after_cancel()."""
+    def __init__(self):
+        self.now = 0
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = (self.now + delay, callback)
+        return self.next_id
+
+    def after_cancel(self, identifier):
+        del self.timers[identifier]
+
+    def advance(self, delay):
+        """Runs the callbacks due within delay milliseconds, in time order."""
+        end = self.now + delay
+        while True:
+            due = [(when, identifier) for identifier, (when, _) in self.timers.items() if when <= end]
+            if not due: break
+            when, identifier = min(due)
+            self.now = when
+            self.timers.pop(identifier)[1]()
+        self.now = end
+
+    def run_until(self, condition, timeout = 5.0):
+        """Advances the clock until condition() is true (jobs run in real threads)."""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline: raise TimeoutError
+            self.advance(5)
+            time.sleep(0.001)
+
+
+class TestRenderScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = FakeLoop()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = 2)
+        self.scheduler = RenderScheduler(self.loop.after, self.loop.after_cancel, delay = 100, poll_interval = 5, executor = self.executor)
+        self.started = []
+        self.results = []
+
+    def tearDown(self):
+        self.executor.shutdown(wait = True)
+
+    def job(self, value, release = None):
+        def run(cancel):
+            self.started.append(value)
+            while release is not None and not release.is_set():
+                if cancel.is_set(): raise cplxf.RenderCancelled()
+                time.sleep(0.001)
+            return value
+        return run
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            RenderScheduler(self.loop.after, self.loop.after_cancel, delay = 1.5)
+        with self.assertRaises(ValueError):
+            RenderScheduler(self.loop.after, self.loop.after_cancel, delay = -1)
+        with self.assertRaises(ValueError):
+            RenderScheduler(self.loop.after, self.loop.after_cancel, poll_interval = 0)
+        with self.assertRaises(TypeError):
+            self.scheduler.request('job', self.results.append)
+
+    def test_debounce(self):
+        # a burst of requests starts one render, of the last request, after the delay
+        for value in range(20):
+            self.scheduler.request(self.job(value), self.results.append)
+            self.loop.advance(30)
+        self.assertEqual(self.started, [])
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.assertEqual(self.started, [19])
+        self.assertEqual(self.results, [19])
+
+    def test_delay(self):
+        # delay 0 (Apply button): no debounce
+        self.scheduler.request(self.job(1), self.results.append, delay = 0)
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.assertEqual(self.results, [1])
+        self.assertLess(self.loop.now, self.scheduler.delay)
+
+    def test_supersede_running(self):
+        # a request cancels the running job, whose result is dropped
+        release = threading.Event()
+        self.scheduler.request(self.job('stale', release), self.results.append, delay = 0)
+        self.loop.run_until(lambda: self.started == ['stale'])
+        self.scheduler.request(self.job('fresh'), self.results.append)
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.assertEqual(self.started, ['stale', 'fresh'])
+        self.assertEqual(self.results, ['fresh'])
+
+    def test_one_job_at_a_time(self):
+        # a job ignoring cancellation delays the next one, and requests made meanwhile are coalesced
+        release = threading.Event()
+        def stubborn(cancel):
+            self.started.append('stubborn')
+            release.wait()
+            return 'stubborn'
+        self.scheduler.request(stubborn, self.results.append, delay = 0)
+        self.loop.run_until(lambda: self.started == ['stubborn'])
+        for value in range(5):
+            self.scheduler.request(self.job(value), self.results.append)
+            self.loop.advance(200)
+        self.assertEqual(self.started, ['stubborn'])
+        release.set()
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.assertEqual(self.started, ['stubborn', 4])
+        self.assertEqual(self.results, [4])
+
+    def test_error(self):
+        errors = []
+        def failing(cancel):
+            raise ValueError('failed')
+        self.scheduler.request(failing, self.results.append, errors.append, delay = 0)
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.assertEqual(self.results, [])
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_cancel(self):
+        release = threading.Event()
+        self.scheduler.request(self.job('running', release), self.results.append, delay = 0)
+        self.loop.run_until(lambda: self.started == ['running'])
+        self.scheduler.cancel()
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.scheduler.request(self.job('waiting'), self.results.append)
+        self.scheduler.cancel()
+        self.loop.advance(1000)
+        self.assertEqual(self.started, ['running'])
+        self.assertEqual(self.results, [])
+        self.assertEqual(self.loop.timers, {})
+
+    def test_progress(self):
+        # partial results reach the event loop while the job runs, all of them before the result
+        release = threading.Event()
+        progress = []
+        def streaming(cancel, report):
+            for value in range(3):
+                report(value)
+            release.wait()
+            report(3)
+            return 'done'
+        self.scheduler.request(streaming, self.results.append, delay = 0, on_progress = progress.append)
+        self.loop.run_until(lambda: sum(progress, []) == [0, 1, 2])
+        self.assertEqual(self.results, [])
+        release.set()
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.assertEqual(sum(progress, []), [0, 1, 2, 3])
+        self.assertEqual(self.results, ['done'])
+
+    def test_progress_superseded(self):
+        release = threading.Event()
+        progress = []
+        def streaming(cancel, report):
+            release.wait()
+            report('stale')
+            return 'stale'
+        self.scheduler.request(streaming, self.results.append, delay = 0, on_progress = progress.append)
+        self.loop.run_until(lambda: self.scheduler._running is not None)
+        self.scheduler.request(self.job('fresh'), self.results.append)
+        release.set()
+        self.loop.run_until(lambda: not self.scheduler.busy)
+        self.assertEqual(progress, [])
+        self.assertEqual(self.results, ['fresh'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+""" Test module for RenderServer class and request parsing.
+"""
+
+import unittest
+import asyncio
+import concurrent.futures
+import sys
+sys.path.append('../..')
+from fractal_display.tests import IsolatedCache
+from fractal_display import server
+from fractal_display import complex_fractal as cplxf
+
+
+def small_query(**params) -> dict:
+    query = {'width': ['8'], 'height': ['6'], 'max_iterations': ['5']}
+    query.update({name: [str(value)] for name, value in params.items()})
+    return query
+
+
+class TestRequestParsing(IsolatedCache, unittest.TestCase):
+
+    def test_render_default(self):
+        spec = server.spec_from_request('/render', {})
+        viewport = server.viewport_from_spec(spec)
+        self.assertIsInstance(viewport.fractal, cplxf.MandelbrotSet)
+        self.assertEqual(viewport.resolution, (720,540))
+        self.assertEqual(viewport.size, (4.0,3.0))
+        self.assertEqual(server.viewport_spec(viewport), spec)
+
+    def test_render_julia(self):
+        spec = server.spec_from_request('/render', small_query(fractal='julia', c='0.25+0.5j', zoom=2, x=0.5))
+        viewport = server.viewport_from_spec(spec)
+        self.assertIsInstance(viewport.fractal, cplxf.JuliaSet)
+        self.assertEqual(viewport.fractal.c, 0.25+0.5j)
+        self.assertEqual(viewport.zoom, 2.0)
+        self.assertEqual(viewport.offset, (0.5,0.0))
+
+    def test_tile(self):
+        spec = server.spec_from_request('/tile/1/0/1.png', {'tile_size': ['16']})
+        viewport = server.viewport_from_spec(spec)
+        self.assertEqual(viewport.resolution, (16,16))
+        self.assertEqual(viewport.zoom, 2.0)
+        # bottom-left quarter of the [-2,2]x[-2,2] world
+        self.assertEqual(viewport.offset, (-1.0,-1.0))
+
+    def test_exceptions(self):
+        with self.assertRaises(LookupError):
+            server.spec_from_request('/unknown', {})
+        with self.assertRaises(LookupError):
+            server.spec_from_request('/tile/1/0.png', {})
+        with self.assertRaises(ValueError):
+            server.spec_from_request('/tile/1/2/0.png', {})
+        with self.assertRaises(ValueError):
+            server.spec_from_request('/render', small_query(fractal='sierpinski'))
+        with self.assertRaises(ValueError):
+            server.spec_from_request('/render', small_query(max_iterations=0))
+        with self.assertRaises(ValueError):
+            server.spec_from_request('/render', small_query(colormap='colormap_that_does_not_exist'))
+
+
+class TestRenderServer(IsolatedCache, unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = server.RenderServer(executor = concurrent.futures.ThreadPoolExecutor(2))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_coalescing_and_cache(self):
+        spec = server.spec_from_request('/render', small_query())
+        images = await asyncio.gather(*(self.server.render(spec) for _ in range(5)))
+        self.assertEqual(len(set(images)), 1)
+        self.assertEqual(self.server.stats['renders'], 1)
+        self.assertEqual(self.server.stats['coalesced'], 4)
+        await self.server.render(spec)
+        self.assertEqual(self.server.stats['renders'], 1)
+        self.assertEqual(self.server.stats['cache_hits'], 1)
+
+    async def test_cache_eviction(self):
+        self.server.cache_bytes = 1 # nothing fits
+        spec = server.spec_from_request('/render', small_query())
+        await self.server.render(spec)
+        await self.server.render(spec)
+        self.assertEqual(self.server.stats['renders'], 2)
+
+    async def test_http(self):
+        listener = await self.server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GET /render?width=8&height=6 HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        writer.write(b'GET /nowhere HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n')
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK\r\n'))
+        self.assertIn(b'\x89PNG', response)
+        self.assertIn(b'HTTP/1.1 404 Not Found\r\n', response)
+
+if __name__ == '__main__':
+    unittest.main()
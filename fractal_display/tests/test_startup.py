@@ -0,0 +1,66 @@
+""" Test module for package startup time (imports measured with python -X importtime).
+"""
+
+import unittest
+import os
+import subprocess
+import tempfile
+import sys
+sys.path.append('../..')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # directory of fractal_display
+COMPUTE_MODULES = ('complex_fractal', 'complex_plane', 'backends', 'store', 'viewport', 'scheduler', 'display')
+IMPORT_BUDGET = 0.25 # seconds importing fractal_display.viewport may add to NumPy (about 0.4 with matplotlib)
+
+
+def import_times(code: str, environment: dict | None = None) -> dict[str, float]:
+    """Cumulative import times in seconds of the modules imported by given code, in a fresh interpreter."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd = ROOT, env = environment,
+        capture_output = True, text = True, check = True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line: continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+class TestStartup(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.environment = dict(os.environ, FRACTAL_DISPLAY_CACHE_DIR = self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_compute_modules(self):
+        for name in COMPUTE_MODULES:
+            with self.subTest(module = name):
+                times = import_times(f'import fractal_display.{name}', self.environment)
+                self.assertIn(f'fractal_display.{name}', times)
+                self.assertFalse([module for module in times if module.startswith(('matplotlib', 'asyncio'))])
+
+    def test_gui_module(self):
+        times = import_times('import fractal_display.gui', self.environment)
+        self.assertFalse([module for module in times if module.startswith('matplotlib')])
+
+    def test_budget(self):
+        times = min((import_times('import fractal_display.viewport', self.environment) for _ in range(3)),
+            key = lambda times: times['fractal_display.viewport'])
+        self.assertLess(times['fractal_display.viewport'] - times['numpy'], IMPORT_BUDGET)
+
+    def test_colormap_cache(self):
+        code = 'import fractal_display.viewport as vp; vp.Viewport(colormap = "plasma")'
+        times = import_times(code, self.environment) # no cache: names read from matplotlib, not written
+        self.assertIn('matplotlib', times)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'colormaps.json')))
+        import_times('import fractal_display.viewport as vp; vp.cache_colormap_names()', self.environment) # GUI start-up
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'colormaps.json')))
+        times = import_times(code, self.environment)
+        self.assertNotIn('matplotlib', times)
+        times = import_times(code + '; vp.Viewport(resolution = (4,3)).img_rgb8()', self.environment)
+        self.assertIn('matplotlib', times) # first colorization
+
+if __name__ == '__main__':
+    unittest.main()
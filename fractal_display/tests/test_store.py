@@ -0,0 +1,166 @@
+""" Test module for RenderStore class.
+"""
+
+import unittest
+import copy
+import json
+import os
+import tempfile
+from unittest import mock
+import numpy as np # array()
+import sys
+sys.path.append('../..')
+from fractal_display.tests import IsolatedCache
+from fractal_display import complex_fractal as cplxf
+from fractal_display import complex_plane as cplxp
+from fractal_display import store
+from fractal_display.store import RenderStore
+from fractal_display.viewport import Viewport
+
+
+class TestRenderStore(IsolatedCache, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = RenderStore(self.directory.name, min_seconds = 0)
+        self.fractal = cplxf.MandelbrotSet(max_iterations = 60)
+        self.plane = cplxp.Plane(-2, 1, -1.2, 1.2, 61, 145) # more rows than store.CHUNK_ROWS
+        self.counts = self.fractal.escape_counts(self.plane.toMatrix())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_default(self):
+        self.assertEqual(RenderStore().directory, os.path.join(self.cache.name, 'renders'))
+        self.assertEqual(len(self.store), 0)
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            RenderStore(directory = 1)
+        with self.assertRaises(TypeError):
+            RenderStore(self.directory.name, max_bytes = 1.5)
+        with self.assertRaises(ValueError):
+            RenderStore(self.directory.name, max_bytes = 0)
+        with self.assertRaises(ValueError):
+            RenderStore(self.directory.name, min_seconds = -1)
+        with self.assertRaises(ValueError):
+            self.store.save(self.fractal, self.plane, self.counts[1:])
+        with self.assertRaises(TypeError):
+            self.store.lookup(self.fractal, 'plane')
+
+    def test_fractal_key(self):
+        self.assertEqual(store.fractal_key(self.fractal), 'Mandelbrot')
+        self.assertEqual(store.fractal_key(cplxf.JuliaSet(c = 0.5j, max_iterations = 7)), 'Julia_c0.5j')
+
+    def test_round_trip(self):
+        self.store.save(self.fractal, self.plane, self.counts)
+        # another store on the same directory (new session) reads it back
+        counts = RenderStore(self.directory.name).lookup(cplxf.MandelbrotSet(max_iterations = 60), self.plane)
+        np.testing.assert_array_equal(counts, self.counts)
+        entry = self.store.entries()[0]
+        self.assertEqual(entry['max_iterations'], 60)
+        self.assertEqual(entry['resolution'], [61, 145])
+        self.assertEqual(len(entry['chunks']), 3)
+
+    def test_no_match(self):
+        self.store.save(self.fractal, self.plane, self.counts)
+        self.assertIsNone(self.store.lookup(cplxf.JuliaSet(max_iterations = 60), self.plane))
+        self.assertIsNone(self.store.lookup(cplxf.MandelbrotSet(max_iterations = 61), self.plane))
+        self.assertIsNone(self.store.lookup(self.fractal, cplxp.Plane(-2, 1, -1.2, 1.2, 60, 145))) # other pixels
+        self.assertIsNone(self.store.lookup(self.fractal, cplxp.Plane(-2.1, 1, -1.2, 1.2, 62, 145))) # outside
+
+    def test_fewer_iterations(self):
+        self.store.save(self.fractal, self.plane, self.counts)
+        fractal = cplxf.MandelbrotSet(max_iterations = 25)
+        np.testing.assert_array_equal(self.store.lookup(fractal, self.plane), fractal.escape_counts(self.plane.toMatrix()))
+
+    def test_complete(self):
+        # every point escaped: counts are valid for any number of iterations
+        plane = cplxp.Plane(1, 2, 1, 2, 10, 10)
+        self.store.save(self.fractal, plane, self.fractal.escape_counts(plane.toMatrix()))
+        self.assertIsNotNone(self.store.lookup(cplxf.MandelbrotSet(max_iterations = 1000), plane))
+
+    def test_sub_region_and_downsample(self):
+        self.store.save(self.fractal, self.plane, self.counts)
+        step_x, step_y = 3 / 60, 2.4 / 144
+        # sub-region: columns 10..40, rows 20..120 (row 0 is ymax)
+        sub = cplxp.Plane(-2 + 10 * step_x, -2 + 40 * step_x, 1.2 - 120 * step_y, 1.2 - 20 * step_y, 31, 101)
+        np.testing.assert_array_equal(self.store.lookup(self.fractal, sub), self.counts[20:121, 10:41])
+        # downsample by 2 and 4
+        down = cplxp.Plane(-2, 1, -1.2, 1.2, 31, 73)
+        np.testing.assert_array_equal(self.store.lookup(self.fractal, down), self.counts[::2, ::2])
+        down = cplxp.Plane(-2 + 2 * step_x, -2 + 58 * step_x, 1.2 - 140 * step_y, 1.2 - 4 * step_y, 15, 35)
+        np.testing.assert_array_equal(self.store.lookup(self.fractal, down), self.counts[4:141:4, 2:59:4])
+
+    def test_replace(self):
+        self.store.save(cplxf.MandelbrotSet(max_iterations = 30), self.plane, np.minimum(self.counts, 30))
+        self.store.save(self.fractal, self.plane, self.counts)
+        self.assertEqual([entry['max_iterations'] for entry in self.store.entries()], [60])
+        self.assertEqual(len([name for name in os.listdir(self.directory.name) if name.endswith('.bin')]), 1)
+
+    def test_eviction(self):
+        self.store.save(self.fractal, self.plane, self.counts)
+        size = self.store.entries()[0]['bytes']
+        self.store.max_bytes = size
+        julia = cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 60)
+        self.store.save(julia, self.plane, julia.escape_counts(self.plane.toMatrix()))
+        self.assertEqual([entry['fractal'] for entry in self.store.entries()], [store.fractal_key(julia)])
+
+    def test_access_times(self):
+        name = self.store.save(self.fractal, self.plane, self.counts)
+        path = os.path.join(self.directory.name, store.INDEX_NAME)
+        with open(path) as file:
+            saved = json.load(file)[name]['accessed']
+        # hits update access times in memory only, until the index is written again
+        self.assertIsNotNone(self.store.lookup(self.fractal, self.plane))
+        accessed = self.store.entries()[0]['accessed']
+        self.assertGreater(accessed, saved)
+        with open(path) as file:
+            self.assertEqual(json.load(file)[name]['accessed'], saved)
+        # another process writing the index does not lose them
+        julia = cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 60)
+        RenderStore(self.directory.name).save(julia, self.plane, julia.escape_counts(self.plane.toMatrix()))
+        self.assertEqual([entry['accessed'] for entry in self.store.entries() if entry['fractal'] == 'Mandelbrot'], [accessed])
+        self.store.clear()
+        self.store.save(self.fractal, self.plane, self.counts)
+        self.assertEqual(len(self.store), 1)
+        # lookups write the index once INDEX_WRITE_INTERVAL passed
+        with mock.patch.object(store, 'INDEX_WRITE_INTERVAL', 0):
+            self.store.lookup(self.fractal, self.plane)
+        with open(path) as file:
+            self.assertEqual(json.load(file)[name]['accessed'], self.store.entries()[0]['accessed'])
+
+    def test_missing_file(self):
+        self.store.save(self.fractal, self.plane, self.counts)
+        os.remove(os.path.join(self.directory.name, self.store.entries()[0]['file']))
+        self.assertIsNone(self.store.lookup(self.fractal, self.plane))
+        self.assertEqual(len(self.store), 0)
+
+    def test_clear(self):
+        self.store.save(self.fractal, self.plane, self.counts)
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.assertIsNone(self.store.lookup(self.fractal, self.plane))
+
+    def test_viewport(self):
+        viewport = Viewport(fractal = cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 50), resolution = (40,30), store = self.store)
+        image = viewport.img_grey()
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(viewport.stats.stored_pixels, 0)
+        # same view in a new viewport: read from the store, nothing computed
+        viewport = Viewport(fractal = cplxf.JuliaSet(c = -0.8+0.156j, max_iterations = 50), resolution = (40,30), store = self.store)
+        np.testing.assert_array_equal(viewport.img_grey(), image)
+        self.assertEqual(viewport.stats.stored_pixels, 1200)
+        self.assertEqual(viewport.stats.computed_points, 0)
+        self.assertIs(copy.deepcopy(viewport).store, self.store)
+        with self.assertRaises(TypeError):
+            viewport.store = 'store'
+
+    def test_viewport_min_seconds(self):
+        self.store.min_seconds = 60
+        Viewport(resolution = (40,30), store = self.store).img_grey()
+        self.assertEqual(len(self.store), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+""" Test module for tiles module (Tile, tile_grid and TileScheduler).
+"""
+
+import unittest
+import concurrent.futures
+import tempfile
+import threading
+from unittest import mock
+import numpy as np # array_equal()
+import sys
+sys.path.append('../..')
+from fractal_display.tests import IsolatedCache
+from fractal_display import complex_fractal as cplxf
+from fractal_display.tiles import Tile, TileScheduler, tile_grid
+from fractal_display.store import RenderStore
+from fractal_display.viewport import Viewport
+
+
+class TestTiles(IsolatedCache, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = 3)
+
+    def tearDown(self):
+        self.executor.shutdown(wait = True)
+
+    def test_tile(self):
+        tile = Tile(10, 20, 30, 60)
+        self.assertEqual(tile.shape, (20, 40))
+        self.assertEqual(tile.center, (40.0, 20.0))
+        self.assertEqual(np.zeros((50, 80))[tile.slices].shape, tile.shape)
+        self.assertEqual(tile, Tile(10, 20, 30, 60))
+        with self.assertRaises(ValueError):
+            Tile(10, 20, 10, 60)
+
+    def test_grid(self):
+        grid = tile_grid((100, 70), 32)
+        self.assertEqual(len(grid), 4 * 3)
+        self.assertEqual(grid[-1], Tile(64, 96, 70, 100))
+        coverage = np.zeros((70, 100), dtype=np.int64)
+        for tile in grid:
+            coverage[tile.slices] += 1
+        self.assertTrue(np.all(coverage == 1))
+        with self.assertRaises(ValueError):
+            tile_grid((100, 70), 0)
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            TileScheduler(tile_size = 1.5)
+        with self.assertRaises(ValueError):
+            TileScheduler(workers = 0)
+        with self.assertRaises(TypeError):
+            TileScheduler(focus = 3)
+
+    def test_center_out(self):
+        grid = tile_grid((90, 90), 10)
+        order = [tile for tile, _ in TileScheduler(workers = 1).run(grid, lambda tile: None, self.executor)]
+        self.assertEqual(order[0], Tile(40, 40, 50, 50))
+        distances = [(tile.center[0] - 45) ** 2 + (tile.center[1] - 45) ** 2 for tile in order]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(set(order), set(grid))
+
+    def test_focus(self):
+        grid = tile_grid((90, 90), 10)
+        scheduler = TileScheduler(workers = 1, focus = (0, 0))
+        order = []
+        for tile, _ in scheduler.run(grid, lambda tile: None, self.executor):
+            order.append(tile)
+            if len(order) == 3:
+                scheduler.focus = (89, 89) # cursor moved: queued tiles re-prioritized
+        self.assertEqual(order[0], Tile(0, 0, 10, 10))
+        self.assertEqual(order[3], Tile(80, 80, 90, 90))
+        self.assertEqual(len(order), len(grid))
+
+    def test_parallel(self):
+        grid = tile_grid((200, 150), 16)
+        consumers = set()
+        results = []
+        for tile, shape in TileScheduler(workers = 4).run(grid, lambda tile: tile.shape, self.executor):
+            consumers.add(threading.get_ident())
+            results.append((tile, shape))
+        self.assertEqual(sorted(tile.center for tile, _ in results), sorted(tile.center for tile in grid))
+        self.assertTrue(all(tile.shape == shape for tile, shape in results))
+        self.assertEqual(consumers, {threading.get_ident()}) # delivered in the calling thread
+
+    def test_drop(self):
+        scheduler = TileScheduler(workers = 1)
+        grid = tile_grid((100, 100), 10)
+        delivered = []
+        with self.assertRaises(cplxf.RenderCancelled):
+            for tile, _ in scheduler.run(grid, lambda tile: None, self.executor):
+                delivered.append(tile)
+                if len(delivered) == 5:
+                    self.assertEqual(scheduler.drop(), len(grid) - 5)
+        self.assertEqual(len(delivered), 5)
+        self.assertEqual(scheduler.pending, 0)
+
+    def test_drop_between_passes(self):
+        scheduler = TileScheduler(workers = 2)
+        grid = tile_grid((60, 60), 10)
+        self.assertEqual(len(list(scheduler.run(grid, lambda tile: None, self.executor))), len(grid))
+        scheduler.drop() # render dropped once its first pass is done
+        with self.assertRaises(cplxf.RenderCancelled):
+            list(scheduler.run(grid, lambda tile: None, self.executor))
+        scheduler.reset() # new render
+        self.assertEqual(len(list(scheduler.run(grid, lambda tile: None, self.executor))), len(grid))
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        def render(tile):
+            cancel.set()
+            return None
+        with self.assertRaises(cplxf.RenderCancelled):
+            list(TileScheduler(workers = 3).run(tile_grid((100, 100), 10), render, self.executor, cancel))
+
+    def test_error(self):
+        def render(tile):
+            if tile.top >= 50: raise ArithmeticError('failed')
+            return None
+        with self.assertRaises(ArithmeticError):
+            list(TileScheduler(workers = 3).run(tile_grid((100, 100), 10), render, self.executor))
+
+
+class TestTiledViewport(IsolatedCache, unittest.TestCase):
+
+    def test_same_image(self):
+        for fractal in (cplxf.MandelbrotSet(max_iterations = 60), cplxf.NewtonFractal()):
+            for antialiasing in (1, 3):
+                with self.subTest(fractal = str(fractal), antialiasing = antialiasing):
+                    viewport = Viewport(fractal = fractal, resolution = (130, 90), colormap = 'viridis', antialiasing = antialiasing)
+                    whole = viewport.img_rgb8()
+                    stats = viewport.stats
+                    tiles = TileScheduler(tile_size = 32)
+                    tiled = viewport.img_rgb8(tiles = tiles)
+                    self.assertTrue(np.array_equal(whole, tiled))
+                    self.assertEqual(viewport.stats.computed_points, stats.computed_points)
+                    self.assertEqual(viewport.stats.iterations, stats.iterations)
+                    self.assertIsNotNone(viewport.stats.first_tile)
+
+    def test_on_tile(self):
+        viewport = Viewport(resolution = (100, 60), antialiasing = 2)
+        image = np.zeros((60, 100))
+        delivered = []
+        def on_tile(tile, colors):
+            delivered.append(tile)
+            image[tile.slices] = colors
+        result = viewport.img_grey(tiles = TileScheduler(tile_size = 25, on_tile = on_tile))
+        self.assertTrue(np.array_equal(image, result)) # antialiased tiles delivered again
+        self.assertEqual(delivered[0], Tile(25, 25, 50, 50)) # center first (ties in row-major order)
+        self.assertGreater(len(delivered), len(tile_grid((100, 60), 25)))
+
+    def test_drop_between_passes(self):
+        # a drop while edges are detected (between the first and the antialiasing pass) stops the render
+        viewport = Viewport(resolution = (64, 48), antialiasing = 2)
+        tiles = TileScheduler(tile_size = 16)
+        edges = Viewport._edges
+        def dropping(values):
+            tiles.drop()
+            return edges(values)
+        with mock.patch.object(Viewport, '_edges', staticmethod(dropping)):
+            with self.assertRaises(cplxf.RenderCancelled):
+                viewport.img_grey(tiles = tiles)
+        self.assertTrue(np.array_equal(viewport.img_grey(tiles = tiles), viewport.img_grey())) # next render starts anew
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            viewport = Viewport(resolution = (80, 60), store = RenderStore(directory, min_seconds = 0.0))
+            first = viewport.img_grey(tiles = TileScheduler(tile_size = 32))
+            self.assertEqual(len(viewport.store), 1)
+            second = viewport.img_grey(tiles = TileScheduler(tile_size = 32))
+            self.assertEqual(viewport.stats.stored_pixels, 80 * 60)
+            self.assertEqual(viewport.stats.computed_points, 0)
+            self.assertTrue(np.array_equal(first, second))
+
+if __name__ == '__main__':
+    unittest.main()
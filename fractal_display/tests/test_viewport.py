@@ -2,13 +2,24 @@
 """
 
 import unittest
+import asyncio
+import concurrent.futures
+import threading
+import os
+import tempfile
+import time
+import numpy as np # array_equal()
 import sys
-sys.path.append('..')
-from viewport import Viewport
-import complex_fractal as cplxf
+sys.path.append('../..')
+from fractal_display.tests import IsolatedCache
+from unittest import mock
+from fractal_display import viewport as vp
+from fractal_display.viewport import Viewport, render_many, colormap_names, cache_colormap_names
+from fractal_display import complex_fractal as cplxf
+from fractal_display import backends
 
 
-class TestViewport (unittest.TestCase):
+class TestViewport(IsolatedCache, unittest.TestCase):
 
     def test_default(self):
         viewport = Viewport()
@@ -18,6 +29,10 @@ class TestViewport (unittest.TestCase):
         self.assertEqual(viewport.offset, (0.0,0.0))
         self.assertEqual(viewport.zoom, 1.0)
         self.assertEqual(viewport.colormap, 'binary')
+        self.assertEqual(viewport.antialiasing, 1)
+        self.assertEqual(viewport.auto_iterations, 'off')
+        self.assertEqual(viewport.exterior_distance, 0.0)
+        self.assertEqual(viewport.backend, 'numpy')
     
     def test_size(self):
         viewport = Viewport(size = (100,100))
@@ -70,6 +85,35 @@ class TestViewport (unittest.TestCase):
             viewport = Viewport(colormap = 2)
         with self.assertRaises(ValueError):
             viewport = Viewport(colormap = 'colormap_that_does_not_exist')
+
+    def test_colormap_names(self):
+        import matplotlib
+        self.assertIn('viridis', colormap_names())
+        self.assertIs(colormap_names(), colormap_names()) # cached
+        colormap = matplotlib.colors.ListedColormap([[0, 0, 0], [1, 1, 1]], name = 'test_registered')
+        matplotlib.colormaps.register(colormap)
+        try:
+            viewport = Viewport(colormap = 'test_registered', resolution = (4,3)) # unknown to the cache: names read again
+            self.assertIn('test_registered', colormap_names())
+            self.assertEqual(viewport.img_rgb8().shape, (3,4,3))
+        finally:
+            matplotlib.colormaps.unregister('test_registered')
+            colormap_names(refresh = True)
+
+    def test_colormap_cache(self):
+        path = os.path.join(self.cache.name, vp.COLORMAPS_FILE)
+        Viewport(colormap = 'viridis')
+        with self.assertRaises(ValueError):
+            Viewport(colormap = 'colormap_that_does_not_exist')
+        self.assertFalse(os.path.exists(path)) # viewports never write the cache
+        with mock.patch.object(vp, 'colormap_names', wraps = colormap_names) as names:
+            with self.assertRaises(ValueError):
+                Viewport(colormap = 'colormap_that_does_not_exist')
+            self.assertNotIn(mock.call(refresh = True), names.call_args_list) # miss remembered
+        self.assertEqual(cache_colormap_names(), colormap_names())
+        self.assertTrue(os.path.exists(path))
+        vp._colormap_names = None
+        self.assertEqual(colormap_names(), cache_colormap_names()) # read back from the file
     
     def test_offset(self):
         viewport = Viewport(offset = (-2,-3.5))
@@ -87,5 +131,282 @@ class TestViewport (unittest.TestCase):
         with self.assertRaises(TypeError):
             viewport = Viewport(offset = (1,'string'))
 
+    def test_plane(self):
+        viewport = Viewport(size = (4,2), resolution = (40,20), offset = (1,-1), zoom = 2)
+        plane = viewport.plane()
+        self.assertEqual((plane.xmin, plane.xmax, plane.ymin, plane.ymax), (0,2,-1.5,-0.5))
+        self.assertEqual((plane.xpoints, plane.ypoints), (40,20))
+
+    def test_img_grey(self):
+        for fractal in (cplxf.MandelbrotSet(max_iterations = 30), cplxf.JuliaSet(c = 0.285+0.01j, max_iterations = 30)):
+            viewport = Viewport(fractal = fractal, resolution = (48,36))
+            expected = np.vectorize(fractal.stability)(viewport.plane().toMatrix())
+            self.assertTrue(np.array_equal(viewport.img_grey(), expected))
+
+    def test_img_rgb(self):
+        viewport = Viewport(resolution = (48,36), colormap = 'plasma')
+        image = viewport.img_rgb()
+        self.assertEqual(image.shape, (36,48,3))
+        self.assertTrue(((image >= 0) & (image <= 1)).all())
+
+    def test_multibrot_render(self):
+        for fractal in (cplxf.MultibrotSet(degree = 4, max_iterations = 30), cplxf.MultiJuliaSet(c = 0.5j, degree = 3, max_iterations = 30)):
+            viewport = Viewport(fractal = fractal, resolution = (32,24))
+            self.assertTrue(np.array_equal(viewport.img_grey(), fractal.stabilities(viewport.plane().toMatrix())))
+
+    def test_newton_render(self):
+        fractal = cplxf.NewtonFractal(max_iterations = 30)
+        viewport = Viewport(fractal = fractal, resolution = (32,24), colormap = 'hsv')
+        self.assertTrue(np.array_equal(viewport.img_grey(), fractal.stabilities(viewport.plane().toMatrix())))
+        self.assertIsNone(viewport.stats.iterations)
+        self.assertEqual(viewport.img_rgb().shape, (24,32,3))
+        # refine mode does not decode stabilities as escape counts
+        viewport.auto_iterations = 'refine'
+        image = viewport.img_grey()
+        resolved = cplxf.NewtonFractal(max_iterations = viewport.resolved_max_iterations)
+        self.assertTrue(np.array_equal(image, resolved.stabilities(viewport.plane().toMatrix())))
+
+    def test_antialiasing(self):
+        viewport = Viewport(antialiasing = 4)
+        self.assertEqual(viewport.antialiasing, 4)
+        viewport.antialiasing = 1
+        self.assertEqual(viewport.antialiasing, 1)
+
+    def test_antialiasing_exceptions(self):
+        with self.assertRaises(TypeError):
+            viewport = Viewport(antialiasing = 2.0)
+        with self.assertRaises(ValueError):
+            viewport = Viewport(antialiasing = 0)
+
+    def test_antialiased_render(self):
+        settings = dict(fractal = cplxf.MandelbrotSet(max_iterations = 50), offset = (-0.75,0.1), zoom = 4, colormap = 'viridis')
+        plain = Viewport(resolution = (60,45), **settings)
+        image = plain.img_rgb()
+        self.assertEqual(plain.refined_pixels, 0)
+        smooth = Viewport(resolution = (60,45), antialiasing = 4, **settings)
+        antialiased = smooth.img_rgb()
+        self.assertGreater(smooth.refined_pixels, 0)
+        self.assertLess(smooth.refined_pixels, 60 * 45)
+        # pixels in flat areas are untouched
+        flat = np.all(antialiased == image, axis=2)
+        self.assertLessEqual(np.count_nonzero(~flat), smooth.refined_pixels)
+        # closer to a brute force 8x8 supersampled render than the plain image
+        reference = Viewport(resolution = (480,360), **settings).img_rgb().reshape(45,8,60,8,3).mean(axis=(1,3))
+        self.assertLess(np.abs(antialiased - reference).mean(), np.abs(image - reference).mean())
+
+    def test_antialiased_flat_view(self):
+        viewport = Viewport(resolution = (16,12), offset = (-0.1,0), zoom = 20, antialiasing = 3)
+        self.assertTrue(np.all(viewport.img_grey() == 1))
+        self.assertEqual(viewport.refined_pixels, 0)
+
+    def test_auto_iterations(self):
+        viewport = Viewport(auto_iterations = 'probe')
+        self.assertEqual(viewport.auto_iterations, 'probe')
+        viewport.auto_iterations = 'refine'
+        self.assertEqual(viewport.auto_iterations, 'refine')
+
+    def test_auto_iterations_exceptions(self):
+        with self.assertRaises(TypeError):
+            viewport = Viewport(auto_iterations = True)
+        with self.assertRaises(ValueError):
+            viewport = Viewport(auto_iterations = 'on')
+
+    def test_estimate_max_iterations(self):
+        fractal = cplxf.MandelbrotSet(max_iterations = 30)
+        # flat views need the minimum
+        viewport = Viewport(fractal = fractal, resolution = (64,48), offset = (-0.1,0), zoom = 20)
+        self.assertEqual(viewport.estimate_max_iterations(), 20)
+        # boundary views need more, and deeper zooms even more
+        viewport = Viewport(fractal = fractal, resolution = (64,48))
+        shallow = viewport.estimate_max_iterations()
+        viewport.offset, viewport.zoom = (-0.7435669,0.1314023), 1000
+        deep = viewport.estimate_max_iterations()
+        self.assertGreater(shallow, 30)
+        self.assertGreater(deep, shallow)
+        self.assertEqual(fractal.max_iterations, 30) # estimation alone changes nothing
+
+    def test_auto_iterations_render(self):
+        fractal = cplxf.MandelbrotSet(max_iterations = 30)
+        viewport = Viewport(fractal = fractal, resolution = (64,48), auto_iterations = 'probe')
+        self.assertIsNone(viewport.resolved_max_iterations)
+        image = viewport.img_grey()
+        self.assertEqual(viewport.resolved_max_iterations, viewport.estimate_max_iterations())
+        resolved = cplxf.MandelbrotSet(max_iterations = viewport.resolved_max_iterations)
+        self.assertTrue(np.array_equal(image, Viewport(fractal = resolved, resolution = (64,48)).img_grey()))
+
+    def test_auto_iterations_refine(self):
+        fractal = cplxf.MandelbrotSet(max_iterations = 30)
+        viewport = Viewport(fractal = fractal, resolution = (64,48), offset = (-1.25,0.05), zoom = 50, auto_iterations = 'refine')
+        image = viewport.img_grey()
+        self.assertGreaterEqual(viewport.resolved_max_iterations, viewport.estimate_max_iterations())
+        # refining iterates again only non escaped pixels, with the same result as a direct render
+        resolved = cplxf.MandelbrotSet(max_iterations = viewport.resolved_max_iterations)
+        self.assertTrue(np.array_equal(image, Viewport(fractal = resolved, resolution = (64,48), offset = (-1.25,0.05), zoom = 50).img_grey()))
+        # each render estimates again, instead of refining from the number of the previous one
+        viewport.img_grey()
+        self.assertEqual(viewport.resolved_max_iterations, int(resolved.max_iterations))
+
+    def test_auto_iterations_shared_fractal(self):
+        # automatic iterations never change the fractal, which other viewports may share
+        fractal = cplxf.MandelbrotSet(max_iterations = 30)
+        for mode in ('probe', 'refine'):
+            with self.subTest(mode = mode):
+                Viewport(fractal = fractal, resolution = (64,48), auto_iterations = mode).img_grey()
+                Viewport(resolution = (64,48), offset = (-1.25,0.05), zoom = 50, auto_iterations = mode).img_grey()
+                self.assertEqual(fractal.max_iterations, 30)
+                self.assertEqual(Viewport().fractal.max_iterations, 20)
+                self.assertIsNot(Viewport().fractal, Viewport().fractal)
+        viewport = Viewport(fractal = fractal, resolution = (64,48), auto_iterations = 'probe')
+        viewport.img_grey()
+        viewport.auto_iterations = 'off'
+        viewport.img_grey()
+        self.assertIsNone(viewport.resolved_max_iterations)
+
+    def test_exterior_distance(self):
+        viewport = Viewport(exterior_distance = 2)
+        self.assertEqual(viewport.exterior_distance, 2)
+        viewport.exterior_distance = 0.5
+        self.assertEqual(viewport.exterior_distance, 0.5)
+
+    def test_exterior_distance_exceptions(self):
+        with self.assertRaises(TypeError):
+            viewport = Viewport(exterior_distance = '2')
+        with self.assertRaises(ValueError):
+            viewport = Viewport(exterior_distance = -1)
+
+    def test_img_distance(self):
+        viewport = Viewport(fractal = cplxf.MandelbrotSet(max_iterations = 50), resolution = (40,30))
+        distances = viewport.img_distance()
+        self.assertEqual(distances.shape, (30,40))
+        self.assertTrue(np.all(distances[viewport.img_grey() == 1] == 0))
+        self.assertTrue(np.all(distances[viewport.img_grey() < 1] > 0))
+
+    def test_distance_filled_render(self):
+        for fractal in (cplxf.MandelbrotSet(max_iterations = 100), cplxf.JuliaSet(c = 0.285+0.01j, max_iterations = 100)):
+            plain = Viewport(fractal = fractal, resolution = (96,72)).img_grey()
+            viewport = Viewport(fractal = fractal, resolution = (96,72), exterior_distance = 2)
+            image = viewport.img_grey()
+            self.assertGreater(viewport.skipped_pixels, 96 * 72 // 4)
+            near = image > 0
+            # pixels close to the set are rendered as usual, others are outside the set
+            self.assertTrue(np.array_equal(image[near], plain[near]))
+            self.assertTrue(np.all(plain[~near] < 1))
+            viewport.exterior_distance = 0
+            self.assertTrue(np.array_equal(viewport.img_grey(), plain))
+            self.assertEqual(viewport.skipped_pixels, 0)
+
+    def test_backend(self):
+        viewport = Viewport(backend = 'python')
+        self.assertEqual(viewport.backend, 'python')
+        viewport.backend = 'auto'
+        self.assertEqual(viewport.backend, 'auto')
+
+    def test_backend_exceptions(self):
+        with self.assertRaises(TypeError):
+            viewport = Viewport(backend = None)
+        with self.assertRaises(ValueError):
+            viewport = Viewport(backend = 'backend_that_does_not_exist')
+
+    def test_backend_render(self):
+        # all backends render the same image, including antialiasing and refining paths
+        fractal = cplxf.MandelbrotSet(max_iterations = 30)
+        settings = dict(fractal = fractal, resolution = (32,24), offset = (-0.75,0.1), zoom = 4, antialiasing = 2, auto_iterations = 'refine')
+        reference = Viewport(**settings).img_grey()
+        for backend in backends.available_backends():
+            with self.subTest(backend = backend):
+                fractal.max_iterations = 30
+                self.assertTrue(np.array_equal(Viewport(backend = backend, **settings).img_grey(), reference))
+
+    def test_stats(self):
+        fractal = cplxf.MandelbrotSet(max_iterations = 30)
+        viewport = Viewport(fractal = fractal, resolution = (40,30))
+        self.assertIsNone(viewport.stats)
+        viewport.img_rgb()
+        stats = viewport.stats
+        self.assertEqual(list(stats.stages), ['plane', 'iterations', 'colorize'])
+        self.assertEqual((stats.pixels, stats.computed_points), (1200, 1200))
+        counts = fractal.escape_counts(viewport.plane().toMatrix())
+        self.assertEqual(stats.iterations, int(np.minimum(counts + 1, 30).sum()))
+        viewport.antialiasing = 2
+        viewport.img_grey()
+        self.assertIn('antialiasing', viewport.stats.stages)
+        self.assertEqual(viewport.stats.refined_pixels, viewport.refined_pixels)
+        self.assertEqual(viewport.stats.computed_points, 1200 + 4 * viewport.refined_pixels)
+
+    def test_on_render(self):
+        received = []
+        viewport = Viewport(resolution = (8,6))
+        viewport.on_render = received.append
+        viewport.img_grey()
+        self.assertEqual(received, [viewport.stats])
+        with self.assertRaises(TypeError):
+            viewport.on_render = 'not callable'
+
+    def test_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'render.prof')
+            viewport = Viewport(resolution = (8,6))
+            viewport.profile = path
+            viewport.img_grey()
+            self.assertTrue(os.path.exists(path))
+            self.assertIsNotNone(viewport.stats.profile)
+            self.assertIsNone(viewport.profile) # single render
+            viewport.img_grey()
+            self.assertIsNone(viewport.stats.profile)
+        with self.assertRaises(TypeError):
+            viewport.profile = 1
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(cplxf.RenderCancelled):
+            Viewport(resolution = (48,36)).img_grey(cancel)
+
+
+class TestViewportAsync(IsolatedCache, unittest.IsolatedAsyncioTestCase):
+
+    async def test_img_async(self):
+        viewport = Viewport(resolution = (48,36), colormap = 'viridis')
+        self.assertTrue(np.array_equal(await viewport.img_grey_async(), viewport.img_grey()))
+        self.assertTrue(np.array_equal(await viewport.img_rgb_async(), viewport.img_rgb()))
+
+    async def test_snapshot(self):
+        viewport = Viewport(resolution = (48,36))
+        expected = viewport.img_grey()
+        task = asyncio.ensure_future(viewport.img_grey_async())
+        viewport.zoom = 10
+        self.assertTrue(np.array_equal(await task, expected))
+
+    async def test_cancel_async(self):
+        # single thread: the next render only starts once the cancelled worker has stopped
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+        self.addCleanup(executor.shutdown, wait = False)
+        with mock.patch.object(vp, '_executor', executor):
+            slow = Viewport(fractal = cplxf.MandelbrotSet(max_iterations = 100000), resolution = (400,300))
+            task = asyncio.ensure_future(slow.img_grey_async())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            start = time.perf_counter()
+            await asyncio.wait_for(Viewport(resolution = (8,6)).img_grey_async(), timeout = 5)
+            self.assertLess(time.perf_counter() - start, 5)
+            self.assertIsNone(slow.stats) # cancelled: no measurements copied back
+
+    async def test_stats_async(self):
+        viewport = Viewport(resolution = (48,36), antialiasing = 2, auto_iterations = 'probe')
+        await viewport.img_grey_async()
+        self.assertEqual(viewport.stats.pixels, 48 * 36)
+        self.assertGreater(viewport.refined_pixels, 0)
+        self.assertEqual(viewport.resolved_max_iterations, viewport.estimate_max_iterations())
+
+    async def test_render_many(self):
+        viewports = [Viewport(resolution = (16,12), zoom = zoom) for zoom in (1, 2, 4, 8)]
+        images = await render_many(viewports, max_concurrency = 2, grey = True)
+        for viewport, image in zip(viewports, images):
+            self.assertTrue(np.array_equal(image, viewport.img_grey()))
+        with self.assertRaises(ValueError):
+            await render_many(viewports, max_concurrency = 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
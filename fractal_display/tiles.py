@@ -0,0 +1,281 @@
+"""tiles module. Renders images tile by tile, in order of priority.
+
+Rendering rows in order shows the part of the image the user looks at (its center,
+or the region under the cursor) last. Here the image is cut into tiles rendered by
+several threads, always picking the queued tile closest to a focus point, and each
+tile is delivered as soon as it is finished.
+
+Classes
+    Tile
+    TileScheduler
+Functions
+    tile_grid(tuple[int,int], int): list[Tile]
+"""
+
+import concurrent.futures
+import heapq
+import itertools
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from . import complex_fractal as cplxf
+
+
+TILE_SIZE = 128 # pixels along each side: per-tile NumPy overheads stay small next to the iterations
+
+
+class Tile:
+    """Tile class.
+
+    Rectangle of pixels of an image (rows top:bottom, columns left:right).
+
+    Attributes
+        top, left, bottom, right: int
+            Bounds of the tile (bottom and right excluded).
+        slices: tuple[slice, slice]
+            Index of the tile in an image array (read-only).
+        shape: tuple[int, int]
+            Height and width of the tile (read-only).
+        center: tuple[float, float]
+            Position (x, y) of the center of the tile in pixels (read-only).
+    """
+    def __init__(self, top: int, left: int, bottom: int, right: int):
+        if not (0 <= top < bottom and 0 <= left < right): raise ValueError("Tile bounds must delimit a non empty rectangle.")
+        self.top = top
+        self.left = left
+        self.bottom = bottom
+        self.right = right
+
+    @property
+    def slices(self) -> tuple[slice, slice]:
+        """Index of the tile in an image array."""
+        return (slice(self.top, self.bottom), slice(self.left, self.right))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Height and width of the tile."""
+        return (self.bottom - self.top, self.right - self.left)
+
+    @property
+    def center(self) -> tuple[float, float]:
+        """Position (x, y) of the center of the tile in pixels."""
+        return ((self.left + self.right) / 2, (self.top + self.bottom) / 2)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Tile) and (self.top, self.left, self.bottom, self.right) == (other.top, other.left, other.bottom, other.right)
+
+    def __hash__(self) -> int:
+        return hash((self.top, self.left, self.bottom, self.right))
+
+    def __repr__(self) -> str:
+        return f'Tile(top={self.top}, left={self.left}, bottom={self.bottom}, right={self.right})'
+
+def tile_grid(resolution: tuple[int, int], tile_size: int = TILE_SIZE) -> list[Tile]:
+    """Tiles covering an image, in row-major order (tiles of the last row and column may be smaller).
+
+    Parameters
+        resolution: (width, height) of the image in pixels.
+        tile_size: width and height of the tiles in pixels.
+    """
+    if not isinstance(tile_size, int): raise TypeError("Given tile_size must be int.")
+    if not (tile_size > 0): raise ValueError("Given tile_size must be positive non zero.")
+    width, height = resolution
+    return [Tile(top, left, min(top + tile_size, height), min(left + tile_size, width))
+        for top in range(0, height, tile_size) for left in range(0, width, tile_size)]
+
+
+class TileScheduler:
+    """TileScheduler class.
+
+    Runs the tiles of one render over several threads, by priority: the queued tile whose
+    center is closest to the focus point always starts first (center-out by default).
+    The focus can move while tiles are rendered (e.g. following the cursor), which
+    re-prioritizes the queued tiles; drop() discards them all, and stops the render even if
+    it runs several passes over tiles (run() calls) until reset() starts a new render.
+    Results are delivered in the thread calling run(), which renders tiles as well, so
+    a render never waits for a free thread of the executor (even when it runs inside it).
+
+    Attributes
+        tile_size: int
+            Width and height of the tiles in pixels.
+        focus: tuple[float, float] | None
+            Position (x, y) in pixels of the point of interest (None: center of the image).
+        workers: int
+            Number of threads rendering tiles, the calling thread included.
+        on_tile: Callable[[Tile, np.ndarray], None] | None
+            Function called with each finished tile and its image (set by the caller, used by Viewport).
+        pending: int
+            Number of queued tiles (read-only).
+    Methods
+        run(list[Tile], Callable[[Tile], object], concurrent.futures.Executor, threading.Event | None): Iterator[tuple[Tile, object]]
+            Renders tiles by priority, yielding them as they are finished.
+        drop(): int
+            Discards the queued tiles and stops the render.
+        reset(): None
+            Starts a new render, forgetting a previous drop().
+    """
+    def __init__(self,
+            tile_size: int = TILE_SIZE,
+            focus: tuple[float, float] | None = None,
+            workers: int | None = None,
+            on_tile: Callable | None = None
+            ):
+        self._lock = threading.Lock()
+        self._heap = [] # (priority, sequence, tile) of queued tiles
+        self._resolution = None # (width, height) of the image of the running render
+        self._dropped = False
+        self.tile_size = tile_size
+        self.focus = focus
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.on_tile = on_tile
+
+    @property
+    def tile_size(self) -> int:
+        """Width and height of the tiles in pixels. Must be positive non zero."""
+        return self._tile_size
+    @tile_size.setter
+    def tile_size(self, tile_size: int) -> None:
+        if not isinstance(tile_size, int): raise TypeError("Attribute 'tile_size' must be int.")
+        if not (tile_size > 0): raise ValueError("Attribute 'tile_size' must be positive non zero.")
+        self._tile_size = tile_size
+
+    @property
+    def focus(self) -> tuple[float, float] | None:
+        """Position (x, y) in pixels of the point of interest, None for the center of the image.
+        Setting it re-prioritizes the queued tiles."""
+        return self._focus
+    @focus.setter
+    def focus(self, focus: tuple[float, float] | None) -> None:
+        if focus is not None:
+            if not (isinstance(focus, tuple) and len(focus) == 2): raise TypeError("Attribute 'focus' must be a tuple (x, y) or None.")
+            focus = (float(focus[0]), float(focus[1]))
+        with self._lock:
+            self._focus = focus
+            self._heap = [(self._priority(tile), sequence, tile) for _, sequence, tile in self._heap]
+            heapq.heapify(self._heap)
+
+    @property
+    def workers(self) -> int:
+        """Number of threads rendering tiles, the calling thread included. Must be positive non zero."""
+        return self._workers
+    @workers.setter
+    def workers(self, workers: int) -> None:
+        if not isinstance(workers, int): raise TypeError("Attribute 'workers' must be int.")
+        if not (workers > 0): raise ValueError("Attribute 'workers' must be positive non zero.")
+        self._workers = workers
+
+    @property
+    def pending(self) -> int:
+        """Number of queued tiles."""
+        with self._lock:
+            return len(self._heap)
+
+    def _priority(self, tile: Tile) -> float:
+        """Squared distance from the center of a tile to the focus (called with the lock held)."""
+        if self._focus is not None:
+            x, y = self._focus
+        elif self._resolution is not None:
+            x, y = self._resolution[0] / 2, self._resolution[1] / 2
+        else:
+            return 0.0
+        center = tile.center
+        return (center[0] - x) ** 2 + (center[1] - y) ** 2
+
+    def _pop(self) -> Tile | None:
+        """Queued tile of highest priority, None if there is none."""
+        with self._lock:
+            if not self._heap: return None
+            return heapq.heappop(self._heap)[2]
+
+    def drop(self) -> int:
+        """Discards the queued tiles: the running render stops with RenderCancelled once the
+        tiles already started are delivered. Later passes of the same render (run() calls
+        before reset()) stop at once, so a drop between two passes is not lost.
+
+        Return
+            Number of discarded tiles.
+        """
+        with self._lock:
+            dropped = len(self._heap)
+            self._heap = []
+            self._dropped = True
+        return dropped
+
+    def reset(self) -> None:
+        """Starts a new render: forgets a previous drop() (called by Viewport when a render starts)."""
+        with self._lock:
+            self._heap = []
+            self._dropped = False
+
+    def run(self,
+            tiles: list[Tile],
+            render: Callable[[Tile], object],
+            executor: concurrent.futures.Executor,
+            cancel: threading.Event | None = None
+            ) -> Iterator[tuple[Tile, object]]:
+        """Renders tiles by priority, yielding them as they are finished.
+
+        Parameters
+            tiles: tiles to render (see tile_grid()).
+            render: function rendering one tile (called in worker threads and in the calling thread).
+            executor: executor running workers - 1 additional threads.
+            cancel: optional event, the render stops with complex_fractal.RenderCancelled once it is set.
+        Return
+            Iterator of (tile, render(tile)) in order of completion, in the calling thread.
+            Workers are stopped when the iterator ends or is closed.
+            Raises complex_fractal.RenderCancelled if drop() was called since reset().
+        """
+        width = max((tile.right for tile in tiles), default = 0)
+        height = max((tile.bottom for tile in tiles), default = 0)
+        sequence = itertools.count()
+        with self._lock:
+            if self._dropped: raise cplxf.RenderCancelled()
+            self._resolution = (width, height)
+            self._heap = [(self._priority(tile), next(sequence), tile) for tile in tiles]
+            heapq.heapify(self._heap)
+        results = queue.SimpleQueue()
+        running = [0] # tiles taken by workers and not delivered yet
+        stop = threading.Event() # set when the iterator ends: workers stop taking tiles
+
+        def work():
+            while not stop.is_set():
+                with self._lock:
+                    if not self._heap: return
+                    tile = heapq.heappop(self._heap)[2]
+                    running[0] += 1
+                try:
+                    results.put((tile, render(tile), None))
+                except BaseException as error: # delivered to the calling thread
+                    results.put((tile, None, error))
+                    return
+
+        futures = [executor.submit(work) for _ in range(min(self.workers, len(tiles)) - 1)]
+        try:
+            while True:
+                cplxf._check_cancel(cancel)
+                try:
+                    tile, result, error = results.get_nowait()
+                except queue.Empty:
+                    tile = self._pop()
+                    if tile is not None:
+                        result, error = render(tile), None
+                    else:
+                        with self._lock:
+                            if running[0] == 0: break
+                        tile, result, error = results.get() # tiles of workers still running
+                        with self._lock:
+                            running[0] -= 1
+                else:
+                    with self._lock:
+                        running[0] -= 1
+                if error is not None: raise error
+                yield tile, result
+            if self._dropped: raise cplxf.RenderCancelled()
+        finally:
+            stop.set()
+            with self._lock:
+                self._heap = [] # tiles of this pass only: a drop() is kept for the next passes
+            for future in futures:
+                future.cancel() # workers not started yet
+            concurrent.futures.wait(futures) # workers still rendering a tile must not outlive the render
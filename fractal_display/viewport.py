@@ -2,13 +2,144 @@
 
 Classes
     Viewport
+Functions
+    colormap_names(bool): tuple[str, ...]
+    cache_colormap_names(): tuple[str, ...]
+    shared_executor(): concurrent.futures.ThreadPoolExecutor
+    render_many(list[Viewport], int, bool): list[np.ndarray[np.float64]]
 """
 
+import concurrent.futures
+import copy
+import functools
+import importlib.util
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Coroutine
 import numpy as np # np arrays
-import matplotlib.cm as mplcm # get_cmap()
-import matplotlib.pyplot as plt # colormaps()
 from . import complex_fractal as cplxf
 from . import complex_plane as cplxp
+from .instrumentation import RenderStats
+from . import backends
+from .store import RenderStore, counts_dtype
+from .tiles import TileScheduler, tile_grid
+from .coloring import CountHistogram
+
+
+AUTO_ITERATIONS_MODES = ('off', 'probe', 'refine')
+COLORING_MODES = ('linear', 'histogram')
+MIN_AUTO_ITERATIONS = 20
+MAX_AUTO_ITERATIONS = 2 ** 16
+PROBE_WIDTH = 128 # pixels along X axis of the low resolution probe
+LATE_ESCAPE_TOLERANCE = 0.005 # fraction of pixels allowed to escape in the last quarter of iterations
+COLORMAPS_FILE = 'colormaps.json' # colormap names cache, in backends.cache_directory()
+
+_colormap_names = None
+_colormap_misses = set() # names checked against matplotlib and not found, since the last refresh
+
+def _matplotlib_key() -> str:
+    """Identifies the installed matplotlib (path and modification time of the package) without importing it."""
+    spec = importlib.util.find_spec('matplotlib')
+    return f'{spec.origin}|{os.stat(spec.origin).st_mtime_ns}'
+
+def colormap_names(refresh: bool = False) -> tuple[str, ...]:
+    """Names of the matplotlib colormaps (in the order of matplotlib.pyplot.colormaps()).
+
+    Importing matplotlib takes longer than importing NumPy and the whole package, so the names
+    are kept in memory, and read from COLORMAPS_FILE when cache_colormap_names() wrote it for the
+    installed matplotlib: checking colormap names then does not import matplotlib, which is only
+    loaded by the first colorization. This function never writes the file.
+
+    Parameters
+        refresh: reads the names from matplotlib again (colormaps registered since the first call).
+    """
+    global _colormap_names
+    if _colormap_names is not None and not refresh:
+        return _colormap_names
+    if not refresh:
+        try:
+            with open(os.path.join(backends.cache_directory(), COLORMAPS_FILE)) as file:
+                cache = json.load(file)
+            if cache.get('matplotlib') == _matplotlib_key():
+                _colormap_names = tuple(cache['colormaps'])
+                return _colormap_names
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    import matplotlib # imported here for names unknown to the cache only
+    _colormap_names = tuple(matplotlib.colormaps)
+    _colormap_misses.clear()
+    return _colormap_names
+
+def cache_colormap_names() -> tuple[str, ...]:
+    """Reads the colormap names from matplotlib and writes them to COLORMAPS_FILE, in
+    backends.cache_directory(), for colormap_names() of later processes (called by the GUI at start-up).
+
+    Return
+        Names of the matplotlib colormaps.
+    """
+    names = colormap_names(refresh = True)
+    path = os.path.join(backends.cache_directory(), COLORMAPS_FILE)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({'matplotlib': _matplotlib_key(), 'colormaps': names}, file)
+    except OSError:
+        pass # read-only home: matplotlib is imported to check names next time
+    return names
+
+def _known_colormap(name: str) -> bool:
+    """True if name is a matplotlib colormap.
+
+    Names missing from colormap_names() are checked against matplotlib once (colormaps registered
+    since), then remembered as unknown until the next colormap_names(refresh=True).
+    """
+    if name in colormap_names(): return True
+    if name in _colormap_misses: return False
+    if name in colormap_names(refresh = True): return True
+    _colormap_misses.add(name)
+    return False
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def shared_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Executor shared by all asynchronous renders (one thread per CPU).
+    
+    Threads are enough because NumPy kernels spend most of their time outside the GIL.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers = os.cpu_count() or 1,
+                thread_name_prefix = 'fractal_render'
+            )
+        return _executor
+
+async def render_many(viewports: list['Viewport'], max_concurrency: int | None = None, grey: bool = False) -> list[np.ndarray[np.float64]]:
+    """Renders several viewports concurrently.
+    
+    Parameters
+        viewports: viewports to render.
+        max_concurrency: maximum number of renders running at the same time (None: no limit
+            other than the shared executor size).
+        grey: renders img_grey() instead of img_rgb().
+    Return
+        Images in the order of given viewports.
+    """
+    import asyncio # already loaded by the running event loop: not imported with the module
+    if max_concurrency is not None and not (max_concurrency > 0): raise ValueError("'max_concurrency' must be positive non zero.")
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+    async def render(viewport: Viewport) -> np.ndarray[np.float64]:
+        if semaphore is None:
+            return await (viewport.img_grey_async() if grey else viewport.img_rgb_async())
+        async with semaphore:
+            return await (viewport.img_grey_async() if grey else viewport.img_rgb_async())
+
+    return await asyncio.gather(*(render(viewport) for viewport in viewports))
 
 
 class Viewport:
@@ -21,7 +152,7 @@ class Viewport:
     
     Attributes
         fractal: complex_fractal.Fractal
-            Fractal to be drawn.
+            Fractal to be drawn (default: a new MandelbrotSet).
         size: tuple[float,float]
             Size of the observed plane.
         resolution: tuple[int,int]
@@ -32,26 +163,82 @@ class Viewport:
             Zoom value.
         colormap: str
             Name of matplotlib colormap used to colorize RGB image.
+        antialiasing: int
+            Size n of the n x n sample grid used on edge pixels (1: no antialiasing).
+        auto_iterations: str
+            Automatic choice of the number of iterations before rendering ('off', 'probe' or 'refine').
+        resolved_max_iterations: int | None
+            Number of iterations chosen by the last render with automatic iterations (read only).
+        exterior_distance: float
+            Distance to the set (in pixels) beyond which pixels are drawn as exterior without iterating them (0: disabled).
+        backend: str
+            Name of the compute backend (see backends module), or 'auto'.
+        store: store.RenderStore | None
+            Persistent store serving renders computed before, and keeping expensive ones.
+        coloring: str
+            Mapping of escape counts to colors ('linear' or 'histogram' equalization).
+        refined_pixels: int
+            Number of pixels supersampled by the last render (read only).
+        skipped_pixels: int
+            Number of pixels filled without iterating them by the last render (read only).
+        stats: instrumentation.RenderStats | None
+            Measurements of the last render (read only).
+        on_render: Callable[[instrumentation.RenderStats], None] | None
+            Function called with the measurements of each render.
+        profile: str | None
+            File receiving cProfile statistics of the next render.
     Methods
+        plane(): complex_plane.Plane
+            Complex plane observed through the viewport.
+        estimate_max_iterations(): int
+            Smallest number of iterations resolving the boundary, from a low resolution probe.
         img_grey(): np.ndarray[np.float64]
             Generates normalized grey scale image of viewport.
         img_rgb(): np.ndarray[np.float64]
             Generates normalized RGB image of viewport.
+        img_rgb8(): np.ndarray[np.uint8]
+            Generates 8-bit RGB image of viewport (for image files).
+        img_distance(): np.ndarray[np.float64]
+            Lower bound of the distance to the set of each pixel.
+        img_grey_async(): np.ndarray[np.float64]
+            Coroutine computing img_grey() in the shared executor.
+        img_rgb_async(): np.ndarray[np.float64]
+            Coroutine computing img_rgb() in the shared executor.
     """
     def __init__(self,
-            fractal: cplxf.Fractal = cplxf.MandelbrotSet(),
+            fractal: cplxf.Fractal | None = None,
             size: tuple[float,float] = (4,3),
             resolution: tuple[int,int] = (720,540),
             offset: tuple[float,float] = (0.0,0.0),
             zoom: float = 1.0,
-            colormap: str = 'binary'
+            colormap: str = 'binary',
+            antialiasing: int = 1,
+            auto_iterations: str = 'off',
+            exterior_distance: float = 0.0,
+            backend: str = 'numpy',
+            store: RenderStore | None = None,
+            coloring: str = 'linear'
             ):
-        self.fractal = fractal
+        self.fractal = fractal if fractal is not None else cplxf.MandelbrotSet()
         self.size = size
         self.resolution = resolution
         self.offset = offset
         self.zoom = zoom
         self.colormap = colormap
+        self.antialiasing = antialiasing
+        self.auto_iterations = auto_iterations
+        self.exterior_distance = exterior_distance
+        self.backend = backend
+        self.store = store
+        self.coloring = coloring
+        self._refined_pixels = 0
+        self._skipped_pixels = 0
+        self._resolved_max_iterations = None
+        self._render_fractal = self.fractal # fractal of the running render (see _render_stages())
+        self._stats = None
+        self.on_render = None
+        # FRACTAL_DISPLAY_PROFILE=<file> profiles the first render of each viewport without code edits
+        self.profile = os.environ.get('FRACTAL_DISPLAY_PROFILE') or None
     
     @property
     def fractal(self) -> cplxf.Fractal:
@@ -133,46 +320,607 @@ class Viewport:
     @colormap.setter
     def colormap(self, colormap) -> None:
         if not isinstance(colormap, str): raise TypeError("Attribute 'colormap' must be str.")
-        if not (colormap in plt.colormaps()): raise ValueError("Unknown matplotlib colormap.")
+        if not _known_colormap(colormap): raise ValueError("Unknown matplotlib colormap.")
         self._colormap = colormap
 
-    def img_grey(self) -> np.ndarray[np.float64]:
-        """Generates normalized grey scale image of viewport.
-        
-        Return
-            Numpy array of normalized floats (1 channel).
+    @property
+    def antialiasing(self) -> int:
+        """Size n of the n x n sample grid used to supersample edge pixels.
+        Only pixels whose value differs from one of their 8 neighbours are supersampled.
+        1 disables antialiasing.
+        """
+        return self._antialiasing
+    @antialiasing.setter
+    def antialiasing(self, antialiasing: int) -> None:
+        if not isinstance(antialiasing, int): raise TypeError("Attribute 'antialiasing' must be int.")
+        if not (antialiasing > 0): raise ValueError("Attribute 'antialiasing' must be positive non zero.")
+        self._antialiasing = antialiasing
+
+    @property
+    def auto_iterations(self) -> str:
+        """Automatic choice of the number of iterations, applied by img_grey()/img_rgb().
+        'off': fractal.max_iterations is used as is.
+        'probe': the render uses the number of iterations given by estimate_max_iterations().
+        'refine': same as 'probe', then the number of iterations is doubled as long as the
+            full resolution render shows pixels escaping late (only non escaped pixels are iterated again).
+            Newton fractals, whose stabilities are not escape counts, are rendered as with 'probe'.
+        Auto modes require a fractal with a 'max_iterations' attribute. They render a copy of the
+        fractal, which is left unchanged: the chosen number is kept in resolved_max_iterations.
         """
-        plane = cplxp.Plane(
+        return self._auto_iterations
+    @auto_iterations.setter
+    def auto_iterations(self, auto_iterations: str) -> None:
+        if not isinstance(auto_iterations, str): raise TypeError("Attribute 'auto_iterations' must be str.")
+        if not (auto_iterations in AUTO_ITERATIONS_MODES): raise ValueError(f"Attribute 'auto_iterations' must be one of {AUTO_ITERATIONS_MODES}.")
+        self._auto_iterations = auto_iterations
+
+    @property
+    def exterior_distance(self) -> float:
+        """Distance to the set, in pixels, beyond which pixels are drawn with the exterior color (stability 0).
+        When positive, the distance estimated for a computed pixel proves that every pixel in a disk
+        around it is outside the set: the disk is filled without iterating its pixels.
+        Points are computed coarse to fine, so that far from the set most pixels are skipped.
+        0 disables distance-guided rendering. Requires a fractal providing distance_estimates().
+        """
+        return self._exterior_distance
+    @exterior_distance.setter
+    def exterior_distance(self, exterior_distance: float) -> None:
+        if not isinstance(exterior_distance, float | int): raise TypeError("Attribute 'exterior_distance' must be float.")
+        if not (exterior_distance >= 0): raise ValueError("Attribute 'exterior_distance' must be positive.")
+        self._exterior_distance = exterior_distance
+
+    @property
+    def backend(self) -> str:
+        """Name of the compute backend computing escape counts and stabilities (see backends module).
+        'auto' selects the fastest backend of the machine.
+        Distance estimation (exterior_distance > 0) always uses the NumPy kernels of the fractal.
+        """
+        return self._backend
+    @backend.setter
+    def backend(self, backend: str) -> None:
+        if not isinstance(backend, str): raise TypeError("Attribute 'backend' must be str.")
+        if not (backend == 'auto' or backend in backends.available_backends()): raise ValueError(f"Unknown or unavailable backend '{backend}'.")
+        self._backend = backend
+
+    @property
+    def store(self) -> RenderStore | None:
+        """Persistent store of escape counts (None: no store).
+        Renders of the same fractal over the same pixels (or a sub-region or downsample of
+        a stored render) are read from the store instead of being computed. Computed renders
+        taking at least store.min_seconds are saved in it.
+        The store is not used with 'refine' auto iterations, distance-guided rendering
+        and Newton fractals. Antialiasing samples are always computed.
+        """
+        return self._store
+    @store.setter
+    def store(self, store: RenderStore | None) -> None:
+        if not (store is None or isinstance(store, RenderStore)): raise TypeError("Attribute 'store' must be a RenderStore or None.")
+        self._store = store
+
+    @property
+    def coloring(self) -> str:
+        """Mapping of escape counts to the values given to the colormap.
+        'linear': escape count / max_iterations (complex_fractal.Fractal.stability()).
+        'histogram': histogram equalization, colors spread evenly over the pixels whatever
+            max_iterations (see coloring.CountHistogram). Newton fractals are always linear.
+        Must be one of COLORING_MODES.
+        """
+        return self._coloring
+    @coloring.setter
+    def coloring(self, coloring: str) -> None:
+        if not isinstance(coloring, str): raise TypeError("Attribute 'coloring' must be str.")
+        if not (coloring in COLORING_MODES): raise ValueError(f"Attribute 'coloring' must be one of {COLORING_MODES}.")
+        self._coloring = coloring
+
+    @property
+    def resolved_max_iterations(self) -> int | None:
+        """Number of iterations used by the last img_grey()/img_rgb() call with automatic iterations
+        (None before it, or if auto_iterations was 'off')."""
+        return self._resolved_max_iterations
+
+    @property
+    def skipped_pixels(self) -> int:
+        """Number of pixels filled without being iterated by the last img_grey()/img_rgb() call."""
+        return self._skipped_pixels
+
+    @property
+    def stats(self) -> RenderStats | None:
+        """Measurements of the last img_grey()/img_rgb() call (None before the first render)."""
+        return self._stats
+
+    @property
+    def on_render(self) -> Callable[[RenderStats], None] | None:
+        """Function called with the measurements of each render, from the rendering thread."""
+        return self._on_render
+    @on_render.setter
+    def on_render(self, on_render: Callable[[RenderStats], None] | None) -> None:
+        if not (on_render is None or callable(on_render)): raise TypeError("Attribute 'on_render' must be callable or None.")
+        self._on_render = on_render
+
+    @property
+    def profile(self) -> str | None:
+        """File receiving cProfile statistics of the next render (None: no profiling).
+        Reset to None once the render is done; statistics are also available in stats.profile.
+        """
+        return self._profile
+    @profile.setter
+    def profile(self, profile: str | None) -> None:
+        if not (profile is None or isinstance(profile, str)): raise TypeError("Attribute 'profile' must be str or None.")
+        self._profile = profile
+
+    @property
+    def refined_pixels(self) -> int:
+        """Number of pixels supersampled by the last img_grey()/img_rgb() call."""
+        return self._refined_pixels
+
+    def plane(self) -> cplxp.Plane:
+        """Complex plane observed through the viewport."""
+        return cplxp.Plane(
             xmin = self.offset[0] - (self.size[0] / 2) / self.zoom,
             xmax = self.offset[0] + (self.size[0] / 2) / self.zoom,
             ymin = self.offset[1] - (self.size[1] / 2) / self.zoom,
             ymax = self.offset[1] + (self.size[1] / 2) / self.zoom,
             xpoints = self.resolution[0],
             ypoints = self.resolution[1]
-        ).toMatrix()
-        image = np.empty(shape = plane.shape, dtype = np.float64)
-        for idx, point in np.ndenumerate(plane):
-            stability = self.fractal.stability(point)
-            image[idx[0], idx[1]] = stability
-        return image
+        )
+
+    def estimate_max_iterations(self, cancel: threading.Event | None = None) -> int:
+        """Smallest number of iterations resolving the boundary of the fractal in the viewport.
+        
+        A low resolution probe of the viewport is rendered with a number of iterations
+        growing with zoom, doubled until few pixels escape in the last quarter of iterations.
+        The escape count histogram of the probe then gives the count below which almost all
+        escaping pixels escape, and a safety margin is added for details thinner than probe pixels.
+        
+        Parameters
+            cancel: optional event stopping the computation.
+        Return
+            Number of iterations between MIN_AUTO_ITERATIONS and MAX_AUTO_ITERATIONS.
+        """
+        if not hasattr(self.fractal, 'max_iterations'): raise TypeError("Fractal must have a 'max_iterations' attribute.")
+        plane = self.plane()
+        plane.xpoints = min(PROBE_WIDTH, self.resolution[0])
+        plane.ypoints = max(1, round(self.resolution[1] * plane.xpoints / self.resolution[0]))
+        probe = plane.toMatrix()
+        fractal = copy.copy(self.fractal)
+        backend = backends.get_backend(self.backend)
+        # deeper zooms need more iterations: start from a ceiling growing with the zoom depth
+        ceiling = int(min(MAX_AUTO_ITERATIONS, 128 * (1 + np.log2(max(self.zoom, 1.0)))))
+        while True:
+            fractal.max_iterations = ceiling
+            counts = backend.escape_counts(fractal, probe, cancel)
+            if self._resolved(counts, ceiling) or ceiling >= MAX_AUTO_ITERATIONS: break
+            ceiling = min(2 * ceiling, MAX_AUTO_ITERATIONS)
+        histogram = np.bincount(counts.ravel(), minlength=ceiling + 1)[:ceiling] # escaped pixels only
+        escaped = histogram.sum()
+        if escaped == 0: return MIN_AUTO_ITERATIONS # uniform image: any number of iterations gives the same render
+        cumulative = np.cumsum(histogram)
+        boundary = int(np.searchsorted(cumulative, (1 - LATE_ESCAPE_TOLERANCE) * escaped)) + 1
+        return int(np.clip(1.5 * boundary, MIN_AUTO_ITERATIONS, ceiling))
+
+    @staticmethod
+    def _resolved(counts: np.ndarray, max_iterations: int) -> bool:
+        """True if few pixels escape in the last quarter of iterations."""
+        late = np.count_nonzero((counts >= 0.75 * max_iterations) & (counts < max_iterations))
+        return late <= LATE_ESCAPE_TOLERANCE * counts.size
+
+    def img_grey(self, cancel: threading.Event | None = None, tiles: TileScheduler | None = None) -> np.ndarray[np.float64]:
+        """Generates normalized grey scale image of viewport.
+        
+        Parameters
+            cancel: optional event, computation stops with complex_fractal.RenderCancelled once it is set.
+            tiles: optional tile scheduler, rendering the image by tiles in order of priority (see _render_tiles()).
+        Return
+            Numpy array of normalized floats (1 channel).
+        """
+        return self._render(lambda stabilities: stabilities, cancel, tiles)
     
-    def img_rgb(self) -> np.ndarray[np.float64]:
+    def img_rgb(self, cancel: threading.Event | None = None, tiles: TileScheduler | None = None) -> np.ndarray[np.float64]:
         """Generates normalized RGB image of viewport.
         
+        Parameters
+            cancel: optional event, computation stops with complex_fractal.RenderCancelled once it is set.
+            tiles: optional tile scheduler, rendering the image by tiles in order of priority (see _render_tiles()).
         Return
             Numpy array of normalized floats (3 channels).
         """
-        plane = cplxp.Plane(
-            xmin = self.offset[0] - (self.size[0] / 2) / self.zoom,
-            xmax = self.offset[0] + (self.size[0] / 2) / self.zoom,
-            ymin = self.offset[1] - (self.size[1] / 2) / self.zoom,
-            ymax = self.offset[1] + (self.size[1] / 2) / self.zoom,
-            xpoints = self.resolution[0],
-            ypoints = self.resolution[1]
-        ).toMatrix()
-        image = np.empty(shape = plane.shape + (3,), dtype = np.float64)
-        colormap = mplcm.get_cmap(self.colormap)
-        for idx, point in np.ndenumerate(plane):
-            stability = self.fractal.stability(point)
-            image[idx[0], idx[1]] = colormap(stability)[:-1]
-        return image
\ No newline at end of file
+        import matplotlib # imported by the first colorization only (see colormap_names())
+        colormap = matplotlib.colormaps[self.colormap]
+        return self._render(lambda stabilities: colormap(stabilities)[..., :3], cancel, tiles)
+
+    def img_rgb8(self, cancel: threading.Event | None = None, tiles: TileScheduler | None = None) -> np.ndarray[np.uint8]:
+        """Generates 8-bit RGB image of viewport.
+        
+        Colors are looked up as bytes in the colormap table, without going through
+        floating point RGB images (8 times smaller than img_rgb() results).
+        
+        Parameters
+            cancel: optional event, computation stops with complex_fractal.RenderCancelled once it is set.
+            tiles: optional tile scheduler, rendering the image by tiles in order of priority (see _render_tiles()).
+        Return
+            Numpy array of uint8 (3 channels).
+        """
+        import matplotlib # imported by the first colorization only (see colormap_names())
+        colormap = matplotlib.colormaps[self.colormap]
+        return self._render(lambda stabilities: colormap(stabilities, bytes=True)[..., :3], cancel, tiles)
+
+    def _render(self, colorize, cancel: threading.Event | None, tiles: TileScheduler | None = None) -> np.ndarray[np.float64]:
+        """Image of viewport, measured in self.stats and profiled if self.profile is set."""
+        self._stats = RenderStats(pixels = self.resolution[0] * self.resolution[1])
+        if tiles is not None: tiles.reset() # drops from now on stop every pass of this render
+        if self.profile is None:
+            image = self._render_stages(colorize, cancel, tiles)
+        else:
+            import cProfile, pstats # profiled renders only
+            profiler = cProfile.Profile()
+            try:
+                image = profiler.runcall(self._render_stages, colorize, cancel, tiles)
+            finally:
+                profiler.dump_stats(self.profile)
+                self._stats.profile = pstats.Stats(profiler)
+                self.profile = None # one render only
+        self._resolved_max_iterations = self._render_fractal.max_iterations if self.auto_iterations != 'off' else None
+        if self.on_render is not None:
+            self.on_render(self._stats)
+        return image
+
+    def _render_stages(self, colorize, cancel: threading.Event | None, tiles: TileScheduler | None = None) -> np.ndarray[np.float64]:
+        """Image of viewport, with edge-adaptive supersampling if antialiasing > 1.
+        
+        One sample is computed per pixel first. Pixels whose stability differs from one of
+        their neighbours are then sampled again on a n x n grid covering the pixel, and the
+        colorized samples are averaged (averaging colors, not stabilities, avoids colors
+        that do not belong to the gradient of non linear colormaps).
+        
+        Parameters
+            colorize: function mapping an array of stabilities to image values.
+            cancel: optional event stopping the computation.
+            tiles: optional tile scheduler (see _render_tiles()).
+        """
+        stats = self._stats
+        with stats.stage('plane'):
+            plane = self.plane()
+            matrix = plane.toMatrix()
+        # automatic iterations apply to a copy: the fractal may be shared with other viewports
+        self._render_fractal = self.fractal
+        if self.auto_iterations != 'off':
+            with stats.stage('auto_iterations'):
+                self._render_fractal = copy.copy(self.fractal)
+                self._render_fractal.max_iterations = self.estimate_max_iterations(cancel)
+        # iterations are recovered from stabilities, which Newton fractals encode with their root
+        if not hasattr(self._render_fractal, 'max_iterations') or isinstance(self._render_fractal, cplxf.NewtonFractal): stats.iterations = None
+        backend = backends.get_backend(self.backend)
+        self._skipped_pixels = 0
+        if tiles is not None:
+            return self._render_tiles(colorize, backend, plane, matrix, tiles, cancel)
+        with stats.stage('iterations'):
+            if self.exterior_distance > 0:
+                stabilities = self._distance_filled_stabilities(plane, matrix, cancel)
+            elif self.auto_iterations == 'refine' and not isinstance(self._render_fractal, cplxf.NewtonFractal):
+                stabilities = self._refined_stabilities(backend, matrix, cancel)
+            elif self.store is not None and not isinstance(self._render_fractal, cplxf.NewtonFractal):
+                stabilities = self._stored_stabilities(backend, plane, matrix, cancel)
+            else:
+                stabilities = backend.stabilities(self._render_fractal, matrix, cancel)
+                self._count_iterations(stabilities)
+        stats.skipped_pixels = self._skipped_pixels
+        with stats.stage('colorize'):
+            if self._equalized():
+                colorize = self._equalizing(colorize, CountHistogram(self._render_fractal.max_iterations).add(self._counts(stabilities)))
+            image = colorize(stabilities)
+        self._refined_pixels = 0
+        if self.antialiasing == 1: return image
+        with stats.stage('antialiasing'):
+            edges = self._edges(stabilities)
+            self._refined_pixels = stats.refined_pixels = int(edges.sum())
+            if self._refined_pixels == 0: return image
+            samples = backend.stabilities(self._render_fractal, self._subsamples(plane, edges), cancel)
+            self._count_iterations(samples)
+            colors = colorize(samples).mean(axis=1)
+            image[edges] = np.rint(colors) if image.dtype.kind == 'u' else colors
+        return image
+
+    def _render_tiles(self,
+            colorize,
+            backend: backends.Backend,
+            plane: cplxp.Plane,
+            matrix: np.ndarray[np.complex128],
+            tiles: TileScheduler,
+            cancel: threading.Event | None
+            ) -> np.ndarray[np.float64]:
+        """Image of viewport rendered tile by tile, in order of priority (see tiles.TileScheduler).
+        
+        Tiles are computed by several threads, the tiles closest to tiles.focus first, and each
+        colorized tile is passed to tiles.on_tile (in the rendering thread) as soon as it is
+        finished. Pixels are computed as in whole renders, so the image is the same: stabilities
+        of a point do not depend on the other points, and antialiasing edges are detected once
+        all tiles are known, then supersampled by a second pass over the tiles holding edges
+        (tiles are delivered again once antialiased). With auto_iterations 'refine', the probe
+        estimate is used as is: refining tiles apart would give them different iterations.
+        The 'iterations' stage includes the colorization of tiles.
+        Besides the image, only the escape counts of the tiles are kept for the passes following
+        the first one (store, histogram coloring, edges), in the smallest integer type holding
+        them (store.counts_dtype(): 2 bytes per pixel below 65536 iterations, against 8 for
+        stabilities). Newton fractals, whose stabilities are not escape counts, keep stabilities
+        for antialiasing edges only.
+        With histogram coloring, each worker counts the escape counts of its tiles and their
+        histograms are merged as tiles arrive: tiles are delivered colored with the histogram
+        of the tiles finished so far, then all tiles are colored again (and delivered again)
+        from their counts with the histogram of the whole image, in a 'colorize' stage.
+        """
+        stats = self._stats
+        fractal = self._render_fractal
+        counted = hasattr(fractal, 'max_iterations') and not isinstance(fractal, cplxf.NewtonFractal)
+        eligible = self.exterior_distance == 0 and counted
+        counts = self.store.lookup(fractal, plane) if self.store is not None and eligible else None
+        stored = counts is not None
+        stabilities = None # Newton fractals with antialiasing only
+        if stored:
+            stats.stored_pixels = counts.size
+            counts = counts.astype(counts_dtype(fractal.max_iterations))
+        elif counted:
+            counts = np.empty(matrix.shape, dtype=counts_dtype(fractal.max_iterations))
+        else:
+            counts = None
+            if self.antialiasing > 1: stabilities = np.empty(matrix.shape, dtype=np.float64)
+        histogram = CountHistogram(fractal.max_iterations) if self._equalized() else None
+
+        def render(tile):
+            worker = self._tile_worker()
+            if stored:
+                tile_counts = counts[tile.slices]
+            elif self.exterior_distance > 0:
+                values = worker._distance_filled_stabilities(plane, matrix[tile.slices], cancel)
+                worker._stats.skipped_pixels = worker._skipped_pixels
+                tile_counts = self._counts(values) if counted else None
+            elif counted:
+                tile_counts = backend.escape_counts(fractal, matrix[tile.slices], cancel)
+                worker._count_iterations(counts = tile_counts)
+            else:
+                values = backend.stabilities(fractal, matrix[tile.slices], cancel)
+                worker._count_iterations(values)
+                tile_counts = None
+            if tile_counts is not None:
+                counts[tile.slices] = tile_counts # tiles never overlap: threads write apart
+                values = tile_counts / fractal.max_iterations
+            elif stabilities is not None:
+                stabilities[tile.slices] = values
+            if histogram is None: return colorize(values), None, worker._stats
+            return None, CountHistogram(fractal.max_iterations).add(tile_counts), worker._stats
+
+        grid = tile_grid(self.resolution, tiles.tile_size)
+        image = None
+        previous = stats.total_time
+        start = time.perf_counter()
+        with stats.stage('iterations'):
+            for tile, (colors, tile_histogram, tile_stats) in tiles.run(grid, render, shared_executor(), cancel):
+                if tile_histogram is not None: # colored with the tiles finished so far
+                    colors = colorize(histogram.merge(tile_histogram).equalize(counts[tile.slices]))
+                if image is None:
+                    image = np.empty(matrix.shape + colors.shape[2:], dtype=colors.dtype)
+                    stats.first_tile = previous + time.perf_counter() - start
+                image[tile.slices] = colors
+                self._merge_stats(tile_stats)
+                if tiles.on_tile is not None: tiles.on_tile(tile, colors)
+        self._skipped_pixels = stats.skipped_pixels
+        if self.store is not None and eligible and not stored and stats.stages['iterations'] >= self.store.min_seconds:
+            self.store.save(fractal, plane, counts)
+        if histogram is not None:
+            with stats.stage('colorize'):
+                histogram.lookup_table() # computed once, before workers share it
+                for tile, colors in tiles.run(grid, lambda tile: colorize(histogram.equalize(counts[tile.slices])), shared_executor(), cancel):
+                    image[tile.slices] = colors
+                    if tiles.on_tile is not None: tiles.on_tile(tile, colors)
+                colorize = self._equalizing(colorize, histogram) # antialiasing samples
+        self._refined_pixels = 0
+        if self.antialiasing == 1: return image
+        with stats.stage('antialiasing'):
+            edges = self._edges(counts if counts is not None else stabilities)
+            self._refined_pixels = stats.refined_pixels = int(edges.sum())
+            if self._refined_pixels == 0: return image
+
+            def refine(tile):
+                worker = self._tile_worker()
+                samples = backend.stabilities(self._render_fractal, self._subsamples(plane, edges[tile.slices], (tile.top, tile.left)), cancel)
+                worker._count_iterations(samples)
+                return colorize(samples).mean(axis=1), worker._stats
+
+            for tile, (colors, tile_stats) in tiles.run([tile for tile in grid if edges[tile.slices].any()], refine, shared_executor(), cancel):
+                part = image[tile.slices]
+                part[edges[tile.slices]] = np.rint(colors) if image.dtype.kind == 'u' else colors
+                self._merge_stats(tile_stats)
+                if tiles.on_tile is not None: tiles.on_tile(tile, part.copy())
+        return image
+
+    def _equalized(self) -> bool:
+        """True if the render uses histogram coloring (fractals with escape counts only)."""
+        return self.coloring == 'histogram' and hasattr(self._render_fractal, 'max_iterations') and not isinstance(self._render_fractal, cplxf.NewtonFractal)
+
+    def _counts(self, stabilities: np.ndarray[np.float64]) -> np.ndarray[np.int64]:
+        """Escape counts of stabilities (stability = count / max_iterations)."""
+        return np.rint(stabilities * self._render_fractal.max_iterations).astype(np.int64)
+
+    def _equalizing(self, colorize, histogram: CountHistogram):
+        """Function applying colorize to the histogram equalized values of stabilities."""
+        return lambda stabilities: colorize(histogram.equalize(self._counts(stabilities)))
+
+    def _tile_worker(self) -> 'Viewport':
+        """Shallow copy of viewport with its own RenderStats, computing one tile in a worker thread."""
+        worker = copy.copy(self)
+        worker._stats = RenderStats()
+        worker._stats.iterations = None if self._stats.iterations is None else 0
+        return worker
+
+    def _merge_stats(self, tile_stats: RenderStats) -> None:
+        """Adds the measurements of a tile to self.stats."""
+        stats = self._stats
+        stats.computed_points += tile_stats.computed_points
+        if stats.iterations is not None: stats.iterations += tile_stats.iterations
+        stats.skipped_pixels += tile_stats.skipped_pixels
+
+    def _count_iterations(self, stabilities: np.ndarray[np.float64] | None = None, counts: np.ndarray[np.int64] | None = None) -> None:
+        """Adds computed points and their orbit iterations to self.stats.
+        
+        A point escaping with count k was iterated k+1 times, a point not escaping max_iterations times.
+        """
+        stats = self._stats
+        points = stabilities if counts is None else counts
+        stats.computed_points += points.size
+        if stats.iterations is None: return
+        max_iterations = self._render_fractal.max_iterations
+        if counts is None: counts = np.rint(stabilities * max_iterations)
+        stats.iterations += int(np.minimum(counts + 1, max_iterations).sum())
+
+    def _refined_stabilities(self, backend: backends.Backend, matrix: np.ndarray[np.complex128], cancel: threading.Event | None) -> np.ndarray[np.float64]:
+        """Stabilities of the full resolution render, doubling max_iterations while pixels escape late.
+        
+        Escape counts lower than max_iterations do not depend on max_iterations,
+        so only the pixels that did not escape are iterated again.
+        """
+        counts = backend.escape_counts(self._render_fractal, matrix, cancel)
+        self._count_iterations(counts = counts)
+        while not self._resolved(counts, self._render_fractal.max_iterations) and self._render_fractal.max_iterations < MAX_AUTO_ITERATIONS:
+            interior = counts == self._render_fractal.max_iterations
+            self._render_fractal.max_iterations = min(2 * self._render_fractal.max_iterations, MAX_AUTO_ITERATIONS)
+            counts[interior] = backend.escape_counts(self._render_fractal, matrix[interior], cancel)
+            self._count_iterations(counts = counts[interior])
+        return counts / self._render_fractal.max_iterations
+
+    def _stored_stabilities(self, backend: backends.Backend, plane: cplxp.Plane, matrix: np.ndarray[np.complex128], cancel: threading.Event | None) -> np.ndarray[np.float64]:
+        """Stabilities read from the store, or computed and saved in it if they took at least store.min_seconds."""
+        counts = self.store.lookup(self._render_fractal, plane)
+        if counts is not None:
+            self._stats.stored_pixels = counts.size
+            return counts / self._render_fractal.max_iterations
+        start = time.perf_counter()
+        counts = backend.escape_counts(self._render_fractal, matrix, cancel)
+        self._count_iterations(counts = counts)
+        if time.perf_counter() - start >= self.store.min_seconds:
+            self.store.save(self._render_fractal, plane, counts)
+        return counts / self._render_fractal.max_iterations
+
+    def _distance_filled_stabilities(self, plane: cplxp.Plane, matrix: np.ndarray[np.complex128], cancel: threading.Event | None) -> np.ndarray[np.float64]:
+        """Stabilities where pixels farther than exterior_distance from the set are 0, most of them not iterated.
+        
+        Pixels are computed on lattices of decreasing step (16, 8, 4, 2 then 1 pixel).
+        A computed pixel whose distance to the set is at least d proves that all pixels closer
+        than d - exterior_distance are farther than exterior_distance from the set: they are
+        filled with 0 and never computed.
+        Skipping pays off when pixels far from the set escape late (deep zooms, views next to
+        small copies of the set): pixels escaping in a few iterations are cheap anyway, while
+        the computed escaping pixels are iterated a second time to get their derivative.
+        """
+        height, width = matrix.shape
+        # largest distance between neighbouring pixels, so that disks in pixel units stay inside true disks
+        pixel = max((plane.xmax - plane.xmin) / max(plane.xpoints - 1, 1), (plane.ymax - plane.ymin) / max(plane.ypoints - 1, 1))
+        stabilities = np.zeros(matrix.shape, dtype=np.float64)
+        known = np.zeros(matrix.shape, dtype=np.bool_)
+        skipped = 0
+        step = 16
+        while step >= 1:
+            lattice = np.zeros(matrix.shape, dtype=np.bool_)
+            lattice[::step, ::step] = True
+            rows, columns = np.nonzero(lattice & ~known)
+            step //= 2
+            if rows.size == 0: continue
+            counts, distances = self._render_fractal.distance_estimates(matrix[rows, columns], cancel)
+            self._count_iterations(counts = counts)
+            self._stats.iterations += int(np.sum(counts[counts < self._render_fractal.max_iterations] + 1)) # derivative pass
+            radii = distances / pixel
+            stabilities[rows, columns] = np.where(radii > self.exterior_distance, 0.0, counts / self._render_fractal.max_iterations)
+            known[rows, columns] = True
+            fill = (radii - self.exterior_distance).astype(np.int64) # integer radii keep disks inside true disks
+            for row, column, reach in zip(rows[fill >= 1], columns[fill >= 1], fill[fill >= 1]):
+                top, bottom = max(row - reach, 0), min(row + reach + 1, height)
+                left, right = max(column - reach, 0), min(column + reach + 1, width)
+                disk = self._disk(reach)[top - row + reach:bottom - row + reach, left - column + reach:right - column + reach]
+                disk = disk & ~known[top:bottom, left:right]
+                known[top:bottom, left:right] |= disk # stabilities already 0
+                skipped += int(np.count_nonzero(disk))
+        self._skipped_pixels = skipped
+        return stabilities
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _disk(radius: int) -> np.ndarray[np.bool_]:
+        """Mask of pixels within given radius of the center of a (2 radius + 1)^2 square."""
+        offsets = np.arange(-radius, radius + 1)
+        return offsets[:, np.newaxis] ** 2 + offsets[np.newaxis, :] ** 2 <= radius ** 2
+
+    @staticmethod
+    def _edges(values: np.ndarray) -> np.ndarray[np.bool_]:
+        """Mask of pixels whose value differs from at least one of their 8 neighbours."""
+        height, width = values.shape
+        padded = np.pad(values, 1, mode='edge')
+        edges = np.zeros(values.shape, dtype=np.bool_)
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == dy == 0: continue
+                edges |= padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] != values
+        return edges
+
+    def _subsamples(self, plane: cplxp.Plane, mask: np.ndarray[np.bool_], origin: tuple[int, int] = (0, 0)) -> np.ndarray[np.complex128]:
+        """Points of the n x n sample grid of each masked pixel.
+        
+        Parameters
+            plane: complex plane of the image.
+            mask: pixels to sample, of the whole image or of a tile.
+            origin: (row, column) of the first pixel of mask in the image.
+        Return
+            Array of shape (number of masked pixels, n*n).
+        """
+        n = self.antialiasing
+        # pixel footprint: distance between two neighbouring points of the plane
+        step_x = (plane.xmax - plane.xmin) / max(plane.xpoints - 1, 1)
+        step_y = (plane.ymax - plane.ymin) / max(plane.ypoints - 1, 1)
+        grid = (np.arange(n) + 0.5) / n - 0.5
+        offsets = (grid[np.newaxis, :] * step_x + grid[:, np.newaxis] * step_y * 1j).ravel()
+        rows, columns = np.nonzero(mask)
+        rows, columns = rows + origin[0], columns + origin[1]
+        centers = plane.xmin + columns * step_x + (plane.ymax - rows * step_y) * 1j
+        return centers[:, np.newaxis] + offsets[np.newaxis, :]
+
+    def img_distance(self, cancel: threading.Event | None = None) -> np.ndarray[np.float64]:
+        """Lower bound of the distance to the set of each pixel, in complex plane units.
+        
+        Parameters
+            cancel: optional event, computation stops with complex_fractal.RenderCancelled once it is set.
+        Return
+            Numpy array of floats (0 for pixels that did not escape).
+        """
+        return self.fractal.distance_estimates(self.plane().toMatrix(), cancel)[1]
+
+    def img_grey_async(self) -> Coroutine[None, None, np.ndarray[np.float64]]:
+        """Coroutine computing img_grey() in the shared executor.
+        
+        The viewport is copied when called (not when awaited), so it can be modified while the render runs.
+        Once the render is done, stats, refined_pixels, skipped_pixels and resolved_max_iterations
+        of the viewport are the ones of the copy. Cancelling the awaiting task stops the iterations of the worker.
+        """
+        return self._run_async(copy.deepcopy(self), 'img_grey')
+
+    def img_rgb_async(self) -> Coroutine[None, None, np.ndarray[np.float64]]:
+        """Coroutine computing img_rgb() in the shared executor.
+        
+        The viewport is copied when called (not when awaited), so it can be modified while the render runs.
+        Once the render is done, stats, refined_pixels, skipped_pixels and resolved_max_iterations
+        of the viewport are the ones of the copy. Cancelling the awaiting task stops the iterations of the worker.
+        """
+        return self._run_async(copy.deepcopy(self), 'img_rgb')
+
+    async def _run_async(self, render: 'Viewport', method: str) -> np.ndarray[np.float64]:
+        """Image given by method of render (a copy of viewport) in the shared executor, its measurements copied back."""
+        import asyncio # already loaded by the running event loop
+        cancel = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(shared_executor(), getattr(render, method), cancel)
+        try:
+            image = await future
+        except asyncio.CancelledError:
+            cancel.set() # the thread cannot be interrupted, so tell the kernel to stop iterating
+            raise
+        # the render is done: copied in the event loop thread, never while the worker writes them
+        self._stats = render._stats
+        self._refined_pixels = render._refined_pixels
+        self._skipped_pixels = render._skipped_pixels
+        self._resolved_max_iterations = render._resolved_max_iterations
+        return image
@@ -5,8 +5,9 @@ This is an example of fractal display program launching.
 from fractal_display.gui import GUI
 
 
-window = GUI()
-window.title('Fractal display example') 
-window.geometry("1000x600")
+if __name__ == '__main__': # process pools of compute backends import this module in their workers
+    window = GUI()
+    window.title('Fractal display example') 
+    window.geometry("1000x600")
 
-window.mainloop()
+    window.mainloop()